@@ -6,20 +6,43 @@ Core Package for Beichtsthul Modern
 """
 
 from .antwort_generator import AntwortGenerator
+from .keyword_matcher import KeywordMatcher
+from .beicht_analyse import BeichtAnalyse, BeichtAnalysator
 from .karma_rechner import KarmaRechner
+from .beicht_historie import BeichtHistorie
 from .datei_manager import DateiManager
+from .json_strom_leser import JsonStromLeser
+from .statistik_aggregator import StatistikAggregator
 from .statistik_manager import StatistikManager
+from .zeit_rollups import ZeitRollups
+from .verteilung import KarmaVerteilung, QuantilSkizze, Histogramm
 from .constants import *
 
 __all__ = [
     "AntwortGenerator",
+    "KeywordMatcher",
+    "BeichtAnalyse",
+    "BeichtAnalysator",
     "KarmaRechner",
+    "BeichtHistorie",
     "DateiManager",
+    "JsonStromLeser",
+    "StatistikAggregator",
     "StatistikManager",
+    "ZeitRollups",
+    "KarmaVerteilung",
+    "QuantilSkizze",
+    "Histogramm",
     "APP_NAME",
     "APP_VERSION",
     "APP_AUTHOR",
     "DATA_FILE_NAME",
+    "DATA_STORAGE_MODE",
+    "FRAME_CACHE_BUDGET_MB",
+    "LOTTIE_MAX_RENDER_FPS",
+    "SPRITE_SHEET_SIZES",
+    "SPRITE_SHEET_DPRS",
+    "MONK_ANIMATIONS",
     "COLOR_PRIMARY_BG",
     "COLOR_SECONDARY_BG",
     "COLOR_SURFACE_BG",
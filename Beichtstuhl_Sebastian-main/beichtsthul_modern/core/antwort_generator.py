@@ -1,8 +1,14 @@
 import random
+import weakref
+
+from .keyword_matcher import KeywordMatcher
+from .beicht_analyse import BeichtAnalyse
 
 """Generiert sarkastische Antworten basierend auf Sünden-Kategorien"""
 class AntwortGenerator:
 
+    # Ab dieser Keyword-Anzahl nutzt kategorisiere_batch den Automaten pro Text
+    BATCH_SPALTEN_LIMIT = 128
 
     def __init__(self):
         self.antworten = {
@@ -55,6 +61,20 @@ class AntwortGenerator:
             "faul": ["faul", "netflix", "nichts getan", "prokrastination", "aufgeschoben", "rumgelegen"],
             "neid": ["neidisch", "beneid", "gönne nicht", "unfair", "warum haben die"]
         }
+        # BeichtAnalysatoren, die baue_keyword_matcher() mit neu aufbaut
+        self.analysatoren = weakref.WeakSet()
+        self.baue_keyword_matcher()
+
+        # Easter Eggs in Prioritätsreihenfolge
+        self.easter_egg_keywords = {
+            "tiere": ["katze", "hund", "tier"],
+            "mutter": ["mutter", "mama"]
+        }
+        self.easter_egg_antworten = {
+            "tiere": ("Tiere sind unschuldig! Du hingegen... NICHT", "schockiert"),
+            "mutter": ("Deine Mutter ist enttäuscht. Sehr enttäuscht.", "urteilend"),
+            "roman": ("SO viel Text für SO wenig Moral? Beeindruckend! ", "lachend")
+        }
         self.schulden_mapping = {
             "lügen": 2,
             "geld": 1,
@@ -77,18 +97,58 @@ class AntwortGenerator:
         return self.schulden_mapping.get(kategorie, 0)
 
 
+    """Baut den Keyword-Automaten neu auf (nach Änderungen an self.keywords aufrufen)"""
+    def baue_keyword_matcher(self):
+
+        self.keyword_matcher = KeywordMatcher(self.keywords)
+        for analysator in list(self.analysatoren):
+            analysator.baue_matcher()
+        # Kategorie-Codes der Batch-API sind Indizes in diese Liste
+        self.kategorie_liste = tuple(self.keywords) + (() if "standard" in self.keywords else ("standard",))
+
     """Bestimmt die Kategorie einer Sünde basierend auf Keywords"""
     def kategorisiere_suende(self, text):
 
+        if isinstance(text, BeichtAnalyse):
+            return text.kategorie
+
+        # Ein Durchlauf über den Text; die erste Kategorie in Tabellenreihenfolge gewinnt
+        return self.keyword_matcher.erste_kategorie(text)
+
+    """Liefert alle Keyword-Treffer mit Offsets (bezogen auf text.lower())"""
+    def finde_keywords(self, text):
 
-        """macht alle char in der Eingabe klein"""
-        text_lower = text.lower()
+        return self.keyword_matcher.finde_alle(text)
 
-        for kategorie, wörter in self.keywords.items():
-            for wort in wörter:
-                if wort in text_lower:
-                    return kategorie
-        return "standard"
+    """Kategorisiert eine ganze Spalte von Beichten auf einmal"""
+    def kategorisiere_batch(self, texte):
+
+        """
+        Args:
+            texte: Iterable von Texten oder eine TextSpalte
+
+        Returns:
+            np.ndarray: Kategorie-Codes (Indizes in self.kategorie_liste), identisch zu kategorisiere_suende
+        """
+        import numpy as np
+        from .text_spalte import TextSpalte
+
+        spalte = texte if isinstance(texte, TextSpalte) else TextSpalte(texte)
+        codes = np.full(len(spalte), self.kategorie_liste.index("standard"), dtype=np.int64)
+
+        if sum(map(len, self.keywords.values())) > self.BATCH_SPALTEN_LIMIT:
+            # Große Keyword-Packs: ein Automaten-Durchlauf pro Text ist günstiger
+            # als eine Suche pro Keyword über die ganze Spalte
+            index = {k: i for i, k in enumerate(self.kategorie_liste)}
+            for zeile, text in enumerate(spalte.texte):
+                codes[zeile] = index[self.keyword_matcher.erste_kategorie(text)]
+            return codes
+
+        # Rückwärts über die Kategorien, damit die erste Kategorie gewinnt
+        for code in reversed(range(len(self.keywords))):
+            wörter = [wort.lower() for wort in self.keywords[self.kategorie_liste[code]]]
+            codes[spalte.maske_mit([wort for wort in wörter if wort])] = code
+        return codes
 
     """Gibt eine zufällige Antwort für die Kategorie zurück"""
     def get_antwort(self, kategorie):
@@ -99,13 +159,19 @@ class AntwortGenerator:
     """Prüft auf spezielle Easter Eggs und gibt entsprechende Antworten"""
     def prüfe_easter_eggs(self, text):
 
-        text_lower = text.lower()
-
-        if any(wort in text_lower for wort in ["katze", "hund", "tier"]):
-            return "Tiere sind unschuldig! Du hingegen... NICHT", "schockiert"
-        elif "mutter" in text_lower or "mama" in text_lower:
-            return "Deine Mutter ist enttäuscht. Sehr enttäuscht.", "urteilend"
-        elif len(text) > 200:
-            return "SO viel Text für SO wenig Moral? Beeindruckend! ", "lachend"
-
-        return None, None
\ No newline at end of file
+        if isinstance(text, BeichtAnalyse):
+            # Treffer stammen bereits aus dem gemeinsamen Analyse-Durchlauf
+            if text.easter_egg_treffer:
+                return self.easter_egg_antworten[text.easter_egg_treffer[0]]
+            laenge = text.laenge
+        else:
+            text_lower = text.lower()
+            for gruppe, wörter in self.easter_egg_keywords.items():
+                if any(wort in text_lower for wort in wörter):
+                    return self.easter_egg_antworten[gruppe]
+            laenge = len(text)
+
+        if laenge > 200:
+            return self.easter_egg_antworten["roman"]
+
+        return None, None
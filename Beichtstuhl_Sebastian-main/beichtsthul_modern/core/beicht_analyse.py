@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Confession Analysis for Beichtsthul Modern
+Normalises and scans a confession exactly once and produces an immutable
+BeichtAnalyse that the AntwortGenerator and the KarmaRechner consume.
+"""
+
+from collections import namedtuple
+
+from .keyword_matcher import KeywordMatcher, Treffer
+
+
+# Unveränderliches Ergebnis der Analyse einer Beichte
+BeichtAnalyse = namedtuple("BeichtAnalyse", [
+    "text",                 # Originaltext
+    "laenge",               # len(text)
+    "ist_caps",             # text.isupper()
+    "kategorie",            # erste Kategorie in Tabellenreihenfolge oder "standard"
+    "kategorie_treffer",    # tuple[Treffer] aller Kategorie-Keywords
+    "easter_egg_treffer",   # tuple[str] gefundener Easter-Egg-Gruppen in Prioritätsreihenfolge
+    "straf_treffer",        # tuple[str] gefundener schlimmer Wörter in Textreihenfolge
+])
+
+
+# Gruppen-Schlüssel im kombinierten Automaten
+_KATEGORIE = "kategorie"
+_EASTER_EGG = "easter_egg"
+_STRAFE = "strafe"
+
+
+class BeichtAnalysator:
+    """Analysiert Beichten in einem einzigen Durchlauf über den Text"""
+
+    def __init__(self, antwort_generator, karma_rechner):
+        """
+        Baut einen gemeinsamen Automaten aus allen Keyword-Tabellen
+
+        Args:
+            antwort_generator: Liefert keywords und easter_egg_keywords
+            karma_rechner: Liefert schlimme_wörter
+        """
+        self.antwort_generator = antwort_generator
+        self.karma_rechner = karma_rechner
+        self.baue_matcher()
+        # AntwortGenerator.baue_keyword_matcher() baut diesen Automaten mit neu auf
+        antwort_generator.analysatoren.add(self)
+
+    def baue_matcher(self):
+        """Baut den Automaten aus den aktuellen Keyword-Tabellen neu auf"""
+        antwort_generator = self.antwort_generator
+        self.kategorien = list(antwort_generator.keywords.keys())
+        self.easter_eggs = list(antwort_generator.easter_egg_keywords.keys())
+        self._kategorie_rang = {k: i for i, k in enumerate(self.kategorien)}
+        self._easter_egg_rang = {k: i for i, k in enumerate(self.easter_eggs)}
+
+        tabelle = {}
+        for kategorie, wörter in antwort_generator.keywords.items():
+            tabelle[(_KATEGORIE, kategorie)] = wörter
+        for gruppe, wörter in antwort_generator.easter_egg_keywords.items():
+            tabelle[(_EASTER_EGG, gruppe)] = wörter
+        tabelle[(_STRAFE, None)] = self.karma_rechner.schlimme_wörter
+        self.matcher = KeywordMatcher(tabelle)
+
+    def analysiere(self, text):
+        """
+        Analysiert eine Beichte
+
+        Args:
+            text: Der Beichttext
+
+        Returns:
+            BeichtAnalyse: Das unveränderliche Analyseergebnis
+        """
+        kategorie_treffer = []
+        easter_eggs = set()
+        straf_treffer = []
+
+        for treffer in self.matcher.finde_alle(text):
+            gruppe, name = treffer.kategorie
+            if gruppe == _KATEGORIE:
+                kategorie_treffer.append(Treffer(treffer.start, treffer.ende, treffer.wort, name))
+            elif gruppe == _EASTER_EGG:
+                easter_eggs.add(name)
+            elif treffer.wort not in straf_treffer:
+                straf_treffer.append(treffer.wort)
+
+        if kategorie_treffer:
+            kategorie = min((t.kategorie for t in kategorie_treffer), key=self._kategorie_rang.__getitem__)
+        else:
+            kategorie = "standard"
+
+        return BeichtAnalyse(
+            text=text,
+            laenge=len(text),
+            ist_caps=text.isupper(),
+            kategorie=kategorie,
+            kategorie_treffer=tuple(kategorie_treffer),
+            easter_egg_treffer=tuple(sorted(easter_eggs, key=self._easter_egg_rang.__getitem__)),
+            straf_treffer=tuple(straf_treffer),
+        )
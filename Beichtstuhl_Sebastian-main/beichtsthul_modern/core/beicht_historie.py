@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lazy Confession History for Beichtsthul Modern
+A list-like view of the confession history that keeps only a bounded
+window of recent entries in memory. Older entries are read page by page
+from the storage backend when statistics or history views need them.
+"""
+
+import threading
+
+
+class BeichtHistorie:
+    """Append-only Historie mit begrenztem Fenster im Speicher"""
+
+    def __init__(self, quelle, anzahl, fenster=200, seitengroesse=500, generation=0):
+        """
+        Args:
+            quelle: Speicher-Backend mit lese_eintraege(start, stop)
+            anzahl: Anzahl bereits gespeicherter Einträge
+            fenster: Anzahl neuester Einträge, die im Speicher gehalten werden
+            seitengroesse: Einträge pro Lesezugriff beim Iterieren
+            generation: Zähler von DateiManager.neue_historie(); ein Wechsel
+                sagt dem Speicher-Backend, dass die alte Historie ersetzt ist
+        """
+        self._quelle = quelle
+        self.generation = generation
+        self._anzahl = anzahl
+        # Nur bereits gespeicherte Einträge dürfen aus dem Fenster fallen
+        self._persistiert = anzahl
+        self.fenster = fenster
+        self.seitengroesse = seitengroesse
+        # Einträge ab Position _fenster_start liegen im Speicher
+        self._fenster_start = anzahl
+        self._fenster = []
+        # Der Speicher-Thread liest, während der UI-Thread anhängt
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._anzahl
+
+    def __bool__(self):
+        return self._anzahl > 0
+
+    def append(self, eintrag):
+        """Hängt einen Eintrag an (Persistieren übernimmt der DateiManager)"""
+        with self._lock:
+            self._fenster.append(eintrag)
+            self._anzahl += 1
+            if len(self._fenster) > 2 * self.fenster:
+                self._kuerze_fenster()
+
+    def markiere_persistiert(self, anzahl):
+        """Meldet, dass die ersten anzahl Einträge gespeichert sind (aus dem Speicher-Thread)"""
+        self._persistiert = max(self._persistiert, anzahl)
+
+    def _kuerze_fenster(self):
+        """Verwirft alte Fenster-Einträge, aber nie ungespeicherte"""
+        grenze = min(self._anzahl - self.fenster, self._persistiert)
+        if grenze > self._fenster_start:
+            del self._fenster[:grenze - self._fenster_start]
+            self._fenster_start = grenze
+
+    def _lese(self, start, stop):
+        """Liest den Bereich [start, stop) aus Quelle und Fenster"""
+        with self._lock:
+            fenster_start = self._fenster_start
+            aus_fenster = self._fenster[max(start, fenster_start) - fenster_start:
+                                        max(stop, fenster_start) - fenster_start]
+        if start >= fenster_start:
+            return aus_fenster
+        # Was vor dem Fenster liegt, ist gespeichert und bleibt es
+        return self._quelle.lese_eintraege(start, min(stop, fenster_start)) + aus_fenster
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, schritt = index.indices(self._anzahl)
+            if schritt != 1:
+                return self._lese(0, self._anzahl)[index]
+            return self._lese(start, max(start, stop))
+        if index < 0:
+            index += self._anzahl
+        if not 0 <= index < self._anzahl:
+            raise IndexError("Historien-Index außerhalb des Bereichs")
+        return self._lese(index, index + 1)[0]
+
+    def __iter__(self):
+        for seite in self.seiten():
+            yield from seite
+
+    def seiten(self, seitengroesse=None, start=0, stop=None):
+        """
+        Liefert die Historie seitenweise
+
+        Args:
+            seitengroesse: Einträge pro Seite (Standard: self.seitengroesse)
+            start: Erste Position
+            stop: Position hinter der letzten Seite (Standard: Ende)
+
+        Yields:
+            list: Einträge einer Seite
+        """
+        seitengroesse = seitengroesse or self.seitengroesse
+        stop = self._anzahl if stop is None else min(stop, self._anzahl)
+        position = start
+        while position < stop:
+            ende = min(position + seitengroesse, stop)
+            yield self._lese(position, ende)
+            position = ende
+
+    def letzte(self, anzahl):
+        """Die letzten Einträge, älteste zuerst"""
+        return self._lese(max(0, self._anzahl - anzahl), self._anzahl)
+
+    def ansicht(self, anzahl):
+        """Unveränderliche Sicht auf die ersten anzahl Einträge (ohne sie zu laden)"""
+        return HistorienAnsicht(self, anzahl)
+
+
+class HistorienAnsicht:
+    """Präfix-Sicht einer BeichtHistorie; wird vom Hintergrund-Speichern genutzt"""
+
+    def __init__(self, historie, anzahl):
+        self._historie = historie
+        self._anzahl = anzahl
+        self.generation = historie.generation
+
+    def __len__(self):
+        return self._anzahl
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, schritt = index.indices(self._anzahl)
+            return self._historie[start:stop:schritt]
+        if index < 0:
+            index += self._anzahl
+        if not 0 <= index < self._anzahl:
+            raise IndexError("Historien-Index außerhalb des Bereichs")
+        return self._historie[index]
+
+    def __iter__(self):
+        for seite in self._historie.seiten(stop=self._anzahl):
+            yield from seite
@@ -14,6 +14,23 @@ APP_AUTHOR = "Beichtsthul Developers"
 # File Paths
 DATA_FILE_NAME = "beichtstuh_daten_.json"
 
+# Storage mode of the DateiManager ("json" or "journal")
+DATA_STORAGE_MODE = "journal"
+
+# Memory budget of the Lottie frame cache (one 280x280 frame at DPR 1 is ~306 KB,
+# so a 90-frame monk animation takes ~28 MB, and ~113 MB at DPR 2). Must hold at
+# least the animation on screen, or its missing frames are rasterised every loop
+FRAME_CACHE_BUDGET_MB = 128
+
+# Upper limit for Lottie redraws per second, e.g. 15 on low-power kiosks
+# (0 = each animation's own frame rate; playback speed is not affected)
+LOTTIE_MAX_RENDER_FPS = 0
+
+# Sizes and device pixel ratios pre-rendered into sprite sheets by
+# compile_animations.py (other sizes are scaled from the closest one)
+SPRITE_SHEET_SIZES = ((280, 280),)
+SPRITE_SHEET_DPRS = (1.0, 2.0)
+
 # Cyberpunk Neon Color Scheme Constants
 # Base Background: Near Black
 COLOR_PRIMARY_BG = "#0d0f1a"
@@ -105,9 +122,18 @@ ANIMATION_WINDOW_EXIT = 200
 ANIMATION_BUTTON_HOVER = 150
 ANIMATION_BUTTON_PRESS = 100
 ANIMATION_TEXT_FOCUS = 200
-ANIMATION_MONK_EMOTION = 300
+ANIMATION_MONK_EMOTION = 150
 ANIMATION_KARMA_CHANGE = 500
 
+# Monk animation per emotion (files in assets/animations)
+MONK_ANIMATIONS = {
+    "neutral": "monk_idle.json",
+    "urteilend": "monk_sad.json",
+    "genervt": "monk_angry.json",
+    "lachend": "monk_laughing.json",
+    "schockiert": "monk_shocked.json"
+}
+
 # Emotion Mapping
 EMOTION_MAPPING = {
     "lügen": "urteilend",
@@ -3,30 +3,71 @@ import os
 import json
 from collections import defaultdict
 
+from .beicht_historie import BeichtHistorie
+from .journal_speicher import JournalSpeicher
+from .sqlite_speicher import SQLiteSpeicher
+from .sichere_datei import schreibe_atomar, sichere_defekte_datei
+
 class DateiManager:
 
-    def __init__(self, dateiname="beichtstuh_daten_.json"):
+    # Unterstützte Speicher-Modi
+    MODUS_JSON = "json"
+    MODUS_JOURNAL = "journal"
+    MODUS_SQLITE = "sqlite"
+
+    def __init__(self, dateiname="beichtstuh_daten_.json", modus=MODUS_JSON, kompaktierung_ab=1000):
+        """
+        Args:
+            dateiname: Pfad der Datendatei
+            modus: "json" schreibt bei jedem Speichern die ganze Datei neu,
+                "journal" hängt pro Beichte einen Datensatz an und kompaktiert periodisch,
+                "sqlite" speichert jede Beichte als Zeile einer SQLite-Datenbank (dateiname = .db)
+            kompaktierung_ab: Journal-Zeilen bis zur Kompaktierung (nur Modus "journal")
+        """
         self.dateiname = dateiname
+        self.modus = modus
+        self._statistik = None
+        # Wird von neue_historie() hochgezählt; die Backends erkennen daran einen Reset
+        self._generation = 0
+        if modus == self.MODUS_JOURNAL:
+            self.speicher = JournalSpeicher(dateiname, kompaktierung_ab)
+        elif modus == self.MODUS_SQLITE:
+            self.speicher = SQLiteSpeicher(dateiname)
+        elif modus == self.MODUS_JSON:
+            self.speicher = None
+        else:
+            raise ValueError(f"Unbekannter Speicher-Modus: {modus}")
 
-    def speichere_daten(self, karma_schulden, beicht_historie, suenden_kategorien):
+    def speichere_daten(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        """
+        Args:
+            statistik: Optionaler Zustand des StatistikAggregator (als_dict()), wird mitgespeichert
+        """
+        if self.speicher is not None:
+            return self.speicher.speichere_daten(karma_schulden, beicht_historie, suenden_kategorien, statistik)
         try:
             daten = {
                 "karma_schulden": karma_schulden,
                 "beicht_historie": beicht_historie,
                 "suenden_kategorien": dict(suenden_kategorien)
             }
-            with open(self.dateiname, "w", encoding="utf-8") as f:
-                json.dump(daten, f, ensure_ascii=False, indent=2)
+            if statistik is not None:
+                daten["statistik"] = statistik
+            # Temp-Datei + fsync + rename: ein Absturz hinterlässt nie eine halbe Datei
+            schreibe_atomar(self.dateiname, json.dumps(daten, ensure_ascii=False, indent=2))
             return True
         except Exception as e:
             print(f"Fehler beim Speichern: {e}")
             return False
 
     def lade_daten(self):  # ← Richtig eingerückt!
+        if self.speicher is not None:
+            return self.speicher.lade_daten()
         try:
             if os.path.exists(self.dateiname):
                 with open(self.dateiname, "r", encoding="utf-8") as f:
                     daten = json.load(f)
+                self._statistik = daten.get("statistik")
                 return (
                     daten.get("karma_schulden", 0),
                     daten.get("beicht_historie", []),
@@ -34,4 +75,57 @@ class DateiManager:
                 )
         except Exception as e:
             print(f"Fehler beim Laden: {e}")
-        return 0, [], defaultdict(int)
\ No newline at end of file
+            # Unlesbare Datei aufheben statt sie beim nächsten Speichern zu überschreiben
+            gesichert = sichere_defekte_datei(self.dateiname)
+            if gesichert:
+                print(f"Unlesbare Datendatei gesichert als: {gesichert}")
+        return 0, [], defaultdict(int)
+
+    def lade_historie(self, fenster=200):
+        """
+        Lädt nur die Summen; die Historie wird bei Bedarf seitenweise nachgeladen
+
+        Im Modus "json" gibt es keinen wahlfreien Zugriff, dort wird wie
+        bei lade_daten die ganze Liste geladen.
+
+        Args:
+            fenster: Anzahl neuester Einträge, die im Speicher bleiben
+
+        Returns:
+            tuple: (karma_schulden, beicht_historie, suenden_kategorien)
+        """
+        if self.speicher is None:
+            return self.lade_daten()
+        karma_schulden, anzahl, suenden_kategorien = self.speicher.lade_zusammenfassung()
+        historie = BeichtHistorie(self.speicher, anzahl, fenster, generation=self._generation)
+        return karma_schulden, historie, suenden_kategorien
+
+    def neue_historie(self, fenster=200):
+        """Leere Historie passend zum Speicher-Modus (z.B. nach einem Reset)"""
+        if self.speicher is None:
+            return []
+        self._generation += 1
+        return BeichtHistorie(self.speicher, 0, fenster, generation=self._generation)
+
+    def kompaktiere(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        """Führt das Journal in einen neuen Snapshot zusammen (in den anderen Modi ein normales Speichern)"""
+        if not hasattr(self.speicher, "kompaktiere"):
+            return self.speichere_daten(karma_schulden, beicht_historie, suenden_kategorien, statistik)
+        try:
+            self.speicher.kompaktiere(karma_schulden, beicht_historie, suenden_kategorien, statistik)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Kompaktieren: {e}")
+            return False
+
+    @property
+    def statistik(self):
+        """Beim Laden gefundener Zustand des StatistikAggregator (dict) oder None"""
+        if self.speicher is None:
+            return self._statistik
+        return self.speicher.statistik
+
+    @property
+    def bericht(self):
+        """Wiederherstellungsbericht des letzten Ladens (nur Modus "journal", sonst None)"""
+        return getattr(self.speicher, "bericht", None)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Journal Storage for Beichtsthul Modern
+Append-only storage backend for the DateiManager. Every confession is
+appended as one compact, CRC32-framed JSON line to a journal next to the
+data file; the data file itself stays a snapshot in the legacy JSON format
+and is only rewritten (atomically) on compaction.
+
+The snapshot is written with one history entry per line and the running
+totals on the first line, so a launch only has to read that header line
+and the (bounded) journal. A sidecar offset index (<dateiname>.idx),
+written alongside every snapshot, lets entries be read by position via mmap.
+"""
+
+import os
+import json
+import threading
+from array import array
+from collections import defaultdict
+
+from .beicht_historie import BeichtHistorie
+from .json_strom_leser import JsonStromLeser
+from .snapshot_index import SnapshotIndex, schreibe_index
+from .sichere_datei import (
+    schreibe_atomar, schreibe_temporaer, ersetze_atomar,
+    haenge_datensaetze_an, scanne_datensaetze, sichere_defekte_datei,
+    Wiederherstellungsbericht
+)
+
+
+# Kompakte JSON-Ausgabe für Journal-Zeilen
+_JOURNAL_SEPARATOREN = (",", ":")
+
+# Ende der Kopfzeile eines zeilenweisen Snapshots
+_KOPF_ENDE = ',"beicht_historie":['
+_SNAPSHOT_ENDE = b"]}\n"
+
+
+def _snapshot_teile(karma_schulden, beicht_historie, suenden_kategorien, statistik, offsets):
+    """
+    Erzeugt den Snapshot zeilenweise (gültiges Legacy-JSON, ein Eintrag pro Zeile)
+
+    Args:
+        statistik: Zustand des StatistikAggregator (dict) oder None
+        offsets: array("Q"), das die Byte-Offsets der Einträge für den Index aufnimmt
+    """
+    anzahl = len(beicht_historie)
+    kopf = {
+        "karma_schulden": karma_schulden,
+        "suenden_kategorien": dict(suenden_kategorien),
+        "anzahl": anzahl
+    }
+    if statistik is not None:
+        kopf["statistik"] = statistik
+    kopf = json.dumps(kopf, ensure_ascii=False, separators=_JOURNAL_SEPARATOREN)
+    zeile = (kopf[:-1] + _KOPF_ENDE + "\n").encode("utf-8")
+    position = len(zeile)
+    yield zeile
+    for nummer, eintrag in enumerate(beicht_historie):
+        trenner = ",\n" if nummer < anzahl - 1 else "\n"
+        zeile = (json.dumps(eintrag, ensure_ascii=False, separators=_JOURNAL_SEPARATOREN) + trenner).encode("utf-8")
+        offsets.append(position)
+        position += len(zeile)
+        yield zeile
+    offsets.append(position)
+    yield _SNAPSHOT_ENDE
+
+
+class _StromHistorie:
+    """Legacy-Snapshot plus Journal-Einträge als iterierbare Historie bekannter Länge"""
+
+    def __init__(self, leser, snapshot_laenge, journal_eintraege):
+        self._leser = leser
+        self._snapshot_laenge = snapshot_laenge
+        self._journal_eintraege = journal_eintraege
+
+    def __len__(self):
+        return self._snapshot_laenge + len(self._journal_eintraege)
+
+    def __iter__(self):
+        yield from self._leser
+        yield from self._journal_eintraege
+
+
+class JournalSpeicher:
+    """Snapshot (Legacy-JSON) plus Append-only-Journal"""
+
+    def __init__(self, dateiname, kompaktierung_ab=1000):
+        """
+        Args:
+            dateiname: Pfad der Snapshot-Datei (Legacy-Format)
+            kompaktierung_ab: Anzahl Journal-Zeilen, ab der kompaktiert wird
+        """
+        self.dateiname = dateiname
+        self.journal_dateiname = dateiname + ".journal"
+        self.index_dateiname = dateiname + ".idx"
+        self.kompaktierung_ab = kompaktierung_ab
+        # Anzahl persistierter Historien-Einträge; None = Zustand auf der Platte unbekannt
+        self._persistiert = None
+        # Generation der zuletzt gespeicherten BeichtHistorie (siehe DateiManager.neue_historie)
+        self._generation = 0
+        self._letzte_summen = None
+        self._journal_zeilen = 0
+        # Einträge im Snapshot bzw. nur im Journal (höchstens kompaktierung_ab viele)
+        self._snapshot_laenge = 0
+        self._journal_eintraege = []
+        # SnapshotIndex, wird beim ersten Lesezugriff geöffnet
+        self._index = None
+        # Schützt den Lese-Zustand; Speichern läuft im Hintergrund-Thread
+        self._lock = threading.Lock()
+        # Zustand des StatistikAggregator im Snapshot (None = unbekannt, neu aufbauen)
+        self.statistik = None
+        # Ergebnis des letzten Wiederherstellungs-Scans in lade_daten
+        self.bericht = Wiederherstellungsbericht(0, [])
+
+    def speichere_daten(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        """
+        Persistiert den Zustand; neue Einträge am Ende der Historie werden angehängt
+
+        Args:
+            statistik: Optionaler Zustand des StatistikAggregator (dict); landet im nächsten Snapshot
+
+        Returns:
+            bool: True bei Erfolg
+        """
+        try:
+            anzahl = len(beicht_historie)
+            summen = (karma_schulden, dict(suenden_kategorien))
+            generation = getattr(beicht_historie, "generation", self._generation)
+
+            if self._persistiert is None or anzahl < self._persistiert or generation != self._generation:
+                # Unbekannter Zustand oder Reset (auch wenn die neue Historie schon
+                # wieder so lang ist wie die alte): vollständiger Snapshot
+                self.kompaktiere(karma_schulden, beicht_historie, suenden_kategorien, statistik)
+                return True
+
+            if anzahl == self._persistiert and summen == self._letzte_summen:
+                return True
+
+            neue_eintraege = [beicht_historie[position] for position in range(self._persistiert, anzahl)]
+            zeilen = [
+                {"n": position, "e": eintrag}
+                for position, eintrag in enumerate(neue_eintraege, start=self._persistiert)
+            ]
+            if not zeilen:
+                zeilen.append({"n": anzahl})
+            # Laufende Summen stehen im letzten Datensatz des Blocks
+            zeilen[-1]["k"] = karma_schulden
+            zeilen[-1]["c"] = summen[1]
+
+            self._haenge_an(zeilen)
+            with self._lock:
+                self._journal_eintraege.extend(neue_eintraege)
+                self._persistiert = anzahl
+            self._letzte_summen = summen
+
+            if self._journal_zeilen >= self.kompaktierung_ab:
+                self.kompaktiere(karma_schulden, beicht_historie, suenden_kategorien, statistik)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern: {e}")
+            return False
+
+    def _haenge_an(self, datensaetze):
+        """Hängt Datensätze als CRC32-gerahmte JSON-Zeilen an das Journal an"""
+        haenge_datensaetze_an(self.journal_dateiname, [
+            json.dumps(datensatz, ensure_ascii=False, separators=_JOURNAL_SEPARATOREN)
+            for datensatz in datensaetze
+        ])
+        self._journal_zeilen += len(datensaetze)
+
+    def kompaktiere(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        """Schreibt einen vollständigen Snapshot und leert das Journal"""
+        # Der neue Snapshot wird gestreamt; eine BeichtHistorie liest dabei noch aus dem alten
+        offsets = array("Q")
+        temp_pfad = schreibe_temporaer(
+            self.dateiname, _snapshot_teile(karma_schulden, beicht_historie, suenden_kategorien, statistik, offsets), binaer=True
+        )
+        with self._lock:
+            # Ein gemappter Snapshot lässt sich nicht überall ersetzen
+            self._schliesse_index()
+            ersetze_atomar(temp_pfad, self.dateiname)
+            try:
+                schreibe_index(self.index_dateiname, os.stat(self.dateiname), offsets)
+            except OSError as e:
+                # Ohne Index wird er beim nächsten Lesen aus dem Snapshot neu aufgebaut
+                print(f"Fehler beim Schreiben des Index: {e}")
+            self._persistiert = len(beicht_historie)
+            self._generation = getattr(beicht_historie, "generation", self._generation)
+            self._snapshot_laenge = self._persistiert
+            self._journal_eintraege = []
+        # Erst nach dem Snapshot leeren; übrig gebliebene Zeilen werden beim Laden über "n" übersprungen
+        schreibe_atomar(self.journal_dateiname, "")
+        self._letzte_summen = (karma_schulden, dict(suenden_kategorien))
+        self.statistik = statistik
+        self._journal_zeilen = 0
+
+    def _lese_kopf(self):
+        """
+        Liest die Kopfzeile eines zeilenweisen Snapshots
+
+        Returns:
+            dict: Kopf mit karma_schulden, suenden_kategorien und anzahl;
+                None, wenn der Snapshot fehlt oder im alten Format vorliegt
+        """
+        if not os.path.exists(self.dateiname):
+            return {"karma_schulden": 0, "suenden_kategorien": {}, "anzahl": 0}
+        with open(self.dateiname, "rb") as f:
+            zeile = f.readline()
+        ende = (_KOPF_ENDE + "\n").encode("utf-8")
+        if not zeile.endswith(ende):
+            return None
+        try:
+            kopf = json.loads(zeile[:-len(ende)] + b"}")
+            kopf["anzahl"]
+            return kopf
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _wende_journal_an(self, snapshot_laenge, karma_schulden, suenden_kategorien, statistik=None):
+        """
+        Wendet die Journal-Datensätze auf den Snapshot-Zustand an
+
+        Die Statistik steht nur im Snapshot (self.statistik); Einträge aus dem
+        Journal holt StatistikAggregator.lade nach.
+
+        Returns:
+            tuple: (journal_eintraege, karma_schulden, suenden_kategorien, verworfen, luecke)
+        """
+        nutzlasten, bericht = scanne_datensaetze(self.journal_dateiname)
+        verworfen = list(bericht.verworfen)
+        journal_eintraege = []
+        luecke = False
+
+        for nutzdaten in nutzlasten:
+            try:
+                datensatz = json.loads(nutzdaten)
+                position = datensatz["n"]
+            except (ValueError, KeyError, TypeError):
+                verworfen.append((None, "ungültiger Datensatz"))
+                continue
+            if position < snapshot_laenge:
+                continue
+            if "e" in datensatz:
+                naechste = snapshot_laenge + len(journal_eintraege)
+                if position < naechste:
+                    continue
+                if position > naechste:
+                    # Vorherige Datensätze fehlen; die intakten Einträge trotzdem retten
+                    luecke = True
+                journal_eintraege.append(datensatz["e"])
+            if "k" in datensatz:
+                karma_schulden = datensatz["k"]
+                suenden_kategorien = datensatz.get("c", suenden_kategorien)
+
+        self.bericht = Wiederherstellungsbericht(bericht.gelesen, verworfen)
+        self.statistik = statistik
+        self._journal_zeilen = len(nutzlasten)
+        return journal_eintraege, karma_schulden, suenden_kategorien, verworfen, luecke
+
+    def _uebernehme_zustand(self, snapshot_laenge, journal_eintraege, karma_schulden, suenden_kategorien):
+        """Setzt den persistierten Zustand nach dem Laden"""
+        with self._lock:
+            self._snapshot_laenge = snapshot_laenge
+            self._journal_eintraege = journal_eintraege
+            self._persistiert = snapshot_laenge + len(journal_eintraege)
+            self._schliesse_index()
+        self._letzte_summen = (karma_schulden, dict(suenden_kategorien))
+
+    def lade_daten(self):
+        """
+        Baut den Zustand aus Snapshot und Journal auf
+
+        Jeder intakte Journal-Datensatz wird übernommen; was verworfen wurde,
+        steht danach in self.bericht. Nach Verlusten (oder bei einem Snapshot
+        im alten Format) wird sofort kompaktiert, damit die Dateien wieder
+        konsistent und zeilenweise lesbar sind.
+
+        Returns:
+            tuple: (karma_schulden, beicht_historie, suenden_kategorien)
+        """
+        karma_schulden, beicht_historie, suenden_kategorien = 0, [], {}
+        statistik = None
+        altes_format = False
+        try:
+            if os.path.exists(self.dateiname):
+                altes_format = self._lese_kopf() is None
+                with open(self.dateiname, "r", encoding="utf-8") as f:
+                    daten = json.load(f)
+                karma_schulden = daten.get("karma_schulden", 0)
+                beicht_historie = daten.get("beicht_historie", [])
+                suenden_kategorien = daten.get("suenden_kategorien", {})
+                statistik = daten.get("statistik")
+        except Exception as e:
+            print(f"Fehler beim Laden: {e}")
+            karma_schulden, beicht_historie, suenden_kategorien = 0, [], {}
+            altes_format = False
+            gesichert = sichere_defekte_datei(self.dateiname)
+            if gesichert:
+                print(f"Unlesbarer Snapshot gesichert als: {gesichert}")
+
+        snapshot_laenge = len(beicht_historie)
+        journal_eintraege, karma_schulden, suenden_kategorien, verworfen, luecke = \
+            self._wende_journal_an(snapshot_laenge, karma_schulden, suenden_kategorien, statistik)
+        beicht_historie.extend(journal_eintraege)
+        suenden_kategorien = defaultdict(int, suenden_kategorien)
+        self._uebernehme_zustand(snapshot_laenge, journal_eintraege, karma_schulden, suenden_kategorien)
+
+        if verworfen or luecke:
+            print(f"Warnung: {len(verworfen)} beschädigte Journal-Datensätze verworfen, "
+                  f"{len(beicht_historie)} Beichten wiederhergestellt")
+        if verworfen or luecke or altes_format:
+            try:
+                self.kompaktiere(karma_schulden, beicht_historie, suenden_kategorien, self.statistik)
+            except Exception as e:
+                print(f"Fehler beim Kompaktieren: {e}")
+
+        return karma_schulden, beicht_historie, suenden_kategorien
+
+    def lade_zusammenfassung(self):
+        """
+        Lädt nur die laufenden Summen und die Anzahl der Beichten
+
+        Gelesen werden die Kopfzeile des Snapshots und das Journal; ein
+        Snapshot im alten Format wird dabei einmalig vollständig geladen
+        und umgeschrieben.
+
+        Returns:
+            tuple: (karma_schulden, anzahl, suenden_kategorien)
+        """
+        try:
+            kopf = self._lese_kopf()
+        except OSError as e:
+            print(f"Fehler beim Laden: {e}")
+            kopf = None
+        if kopf is None:
+            try:
+                return self._migriere_legacy_snapshot()
+            except (OSError, ValueError) as e:
+                print(f"Fehler beim Streamen des Snapshots: {e}")
+            # Unlesbar: lade_daten sichert die Datei und baut aus dem Journal auf
+            karma_schulden, beicht_historie, suenden_kategorien = self.lade_daten()
+            return karma_schulden, len(beicht_historie), suenden_kategorien
+
+        snapshot_laenge = kopf["anzahl"]
+        journal_eintraege, karma_schulden, suenden_kategorien, verworfen, luecke = self._wende_journal_an(
+            snapshot_laenge, kopf.get("karma_schulden", 0), kopf.get("suenden_kategorien", {}), kopf.get("statistik")
+        )
+        suenden_kategorien = defaultdict(int, suenden_kategorien)
+        self._uebernehme_zustand(snapshot_laenge, journal_eintraege, karma_schulden, suenden_kategorien)
+        anzahl = self._persistiert
+
+        if verworfen or luecke:
+            print(f"Warnung: {len(verworfen)} beschädigte Journal-Datensätze verworfen, "
+                  f"{anzahl} Beichten wiederhergestellt")
+            try:
+                self.kompaktiere(karma_schulden, BeichtHistorie(self, anzahl), suenden_kategorien, self.statistik)
+            except Exception as e:
+                print(f"Fehler beim Kompaktieren: {e}")
+
+        return karma_schulden, anzahl, suenden_kategorien
+
+    def _migriere_legacy_snapshot(self):
+        """Schreibt einen Snapshot im alten Format gestreamt ins Zeilenformat um"""
+        leser = JsonStromLeser(self.dateiname)
+        karma_schulden, snapshot_laenge, suenden_kategorien = leser.zusammenfassung()
+        journal_eintraege, karma_schulden, suenden_kategorien, _, _ = \
+            self._wende_journal_an(snapshot_laenge, karma_schulden, suenden_kategorien)
+        suenden_kategorien = defaultdict(int, suenden_kategorien)
+        self.kompaktiere(
+            karma_schulden, _StromHistorie(leser, snapshot_laenge, journal_eintraege), suenden_kategorien, self.statistik
+        )
+        return karma_schulden, self._persistiert, suenden_kategorien
+
+    def lese_eintraege(self, start, stop):
+        """
+        Liest die persistierten Einträge [start, stop)
+
+        Returns:
+            list: Historien-Einträge
+        """
+        with self._lock:
+            stop = min(stop, self._snapshot_laenge + len(self._journal_eintraege))
+            eintraege = []
+            if start < self._snapshot_laenge:
+                eintraege = self._lese_snapshot(start, min(stop, self._snapshot_laenge))
+            if stop > self._snapshot_laenge:
+                eintraege.extend(self._journal_eintraege[
+                    max(start, self._snapshot_laenge) - self._snapshot_laenge:stop - self._snapshot_laenge
+                ])
+            return eintraege
+
+    def _lese_snapshot(self, start, stop):
+        """Liest Snapshot-Einträge über den Offset-Index (Lock muss gehalten werden)"""
+        if self._index is None:
+            self._index = SnapshotIndex(self.dateiname, self.index_dateiname, self._snapshot_laenge)
+        return self._index.lese(start, stop)
+
+    def _schliesse_index(self):
+        """Gibt das Mapping des Snapshots frei (Lock muss gehalten werden)"""
+        if self._index is not None:
+            self._index.schliesse()
+            self._index = None
+
+    def schliesse(self):
+        """Gibt offene Dateien frei"""
+        with self._lock:
+            self._schliesse_index()
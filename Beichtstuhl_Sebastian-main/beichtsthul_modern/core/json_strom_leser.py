@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Streaming Reader for the legacy beichtstuh_daten_.json format
+Walks the data file chunk by chunk with json.JSONDecoder.raw_decode and
+yields the beicht_historie entries one at a time, so migration, statistics
+and export need constant memory regardless of the file size.
+"""
+
+import json
+
+
+_LEERZEICHEN = " \t\n\r"
+
+# Länge des größten einzelnen JSON-Werts (Zeichen), bevor die Datei als defekt gilt
+MAX_WERTGROESSE = 16 << 20
+
+
+def suenden_text(eintrag):
+    """Text einer Beichte; MainWindow schreibt "suende", ältere Daten "sünde" """
+    return eintrag.get("suende", eintrag.get("sünde", ""))
+
+
+def normalisiere_eintrag(eintrag):
+    """Sorgt dafür, dass ein Historien-Eintrag den Schlüssel "suende" hat"""
+    if isinstance(eintrag, dict) and "suende" not in eintrag and "sünde" in eintrag:
+        eintrag = dict(eintrag)
+        eintrag["suende"] = eintrag["sünde"]
+    return eintrag
+
+
+class JsonStromLeser:
+    """Inkrementeller Leser für {"karma_schulden", "beicht_historie", "suenden_kategorien"}"""
+
+    def __init__(self, dateiname, puffergroesse=1 << 16, max_wertgroesse=MAX_WERTGROESSE):
+        """
+        Args:
+            dateiname: Pfad der Legacy-JSON-Datei
+            puffergroesse: Zeichen pro Lesezugriff
+            max_wertgroesse: Zeichen, die ein einzelner Wert höchstens belegen darf;
+                darüber wird ValueError ausgelöst, statt den Puffer weiter zu vergrößern
+        """
+        self.dateiname = dateiname
+        self.puffergroesse = puffergroesse
+        self.max_wertgroesse = max_wertgroesse
+        self._decoder = json.JSONDecoder()
+
+    def __iter__(self):
+        return self.eintraege()
+
+    def eintraege(self):
+        """
+        Liefert die Einträge von beicht_historie einzeln
+
+        Yields:
+            dict: Historien-Eintrag (mit Schlüssel "suende")
+        """
+        for art, *werte in self._ereignisse():
+            if art == "eintrag":
+                yield normalisiere_eintrag(werte[0])
+
+    def zusammenfassung(self):
+        """
+        Liest die Summen in einem Durchlauf, ohne die Historie zu behalten
+
+        Returns:
+            tuple: (karma_schulden, anzahl, suenden_kategorien)
+        """
+        anzahl = 0
+        werte = {}
+        for art, *daten in self._ereignisse():
+            if art == "eintrag":
+                anzahl += 1
+            else:
+                werte[daten[0]] = daten[1]
+        return werte.get("karma_schulden", 0), anzahl, werte.get("suenden_kategorien", {})
+
+    def _ereignisse(self):
+        """
+        Zerlegt das Dokument in ("eintrag", wert) und ("wert", schluessel, wert)
+
+        Raises:
+            ValueError: Wenn die Datei kein gültiges JSON-Objekt enthält
+        """
+        with open(self.dateiname, "r", encoding="utf-8") as f:
+            puffer = _Puffer(f, self.puffergroesse, self._decoder, self.max_wertgroesse)
+            puffer.erwarte("{")
+            if puffer.naechstes_zeichen() == "}":
+                return
+            while True:
+                schluessel = puffer.dekodiere()
+                if not isinstance(schluessel, str):
+                    raise ValueError("Schlüssel erwartet")
+                puffer.erwarte(":")
+                if schluessel == "beicht_historie" and puffer.naechstes_zeichen() == "[":
+                    puffer.erwarte("[")
+                    if puffer.naechstes_zeichen() == "]":
+                        puffer.erwarte("]")
+                    else:
+                        while True:
+                            yield ("eintrag", puffer.dekodiere())
+                            if puffer.erwarte(",]") == "]":
+                                break
+                else:
+                    yield ("wert", schluessel, puffer.dekodiere())
+                if puffer.erwarte(",}") == "}":
+                    return
+
+
+class _Puffer:
+    """Gleitender Textpuffer über einer Datei"""
+
+    def __init__(self, datei, puffergroesse, decoder, max_wertgroesse):
+        self._datei = datei
+        self._groesse = puffergroesse
+        self._decoder = decoder
+        self._max_wertgroesse = max_wertgroesse
+        self._text = ""
+        self._position = 0
+        self._ende = False
+
+    def _lade_nach(self):
+        """Verwirft Gelesenes und hängt den nächsten Block an; False am Dateiende"""
+        if self._ende:
+            return False
+        block = self._datei.read(self._groesse)
+        if not block:
+            self._ende = True
+            return False
+        self._text = self._text[self._position:] + block
+        self._position = 0
+        return True
+
+    def naechstes_zeichen(self):
+        """Nächstes Zeichen nach Leerraum (ohne es zu verbrauchen); "" am Ende"""
+        while True:
+            text, position = self._text, self._position
+            while position < len(text) and text[position] in _LEERZEICHEN:
+                position += 1
+            self._position = position
+            if position < len(text):
+                return text[position]
+            if not self._lade_nach():
+                return ""
+
+    def erwarte(self, erlaubt):
+        """Verbraucht eines der erlaubten Zeichen und gibt es zurück"""
+        zeichen = self.naechstes_zeichen()
+        if not zeichen or zeichen not in erlaubt:
+            raise ValueError(f"Erwartet {erlaubt!r}, gefunden {zeichen!r}")
+        self._position += 1
+        return zeichen
+
+    def dekodiere(self):
+        """Dekodiert den nächsten JSON-Wert; unvollständige Werte laden nach"""
+        self.naechstes_zeichen()
+        while True:
+            try:
+                wert, ende = self._decoder.raw_decode(self._text, self._position)
+            except json.JSONDecodeError:
+                if self._lade_nach_fuer_wert():
+                    continue
+                raise
+            # Eine Zahl am Pufferende kann im nächsten Block weitergehen
+            if ende == len(self._text) and self._lade_nach_fuer_wert():
+                continue
+            self._position = ende
+            return wert
+
+    def _lade_nach_fuer_wert(self):
+        """Wie _lade_nach, aber ein einzelner Wert darf den Puffer nicht unbegrenzt wachsen lassen"""
+        if len(self._text) - self._position > self._max_wertgroesse:
+            raise ValueError(f"JSON-Wert länger als {self._max_wertgroesse} Zeichen, Datei defekt")
+        return self._lade_nach()
@@ -1,4 +1,12 @@
 
+from collections import namedtuple
+
+from .beicht_analyse import BeichtAnalyse
+
+
+# Textabhängige Merkmale einer ganzen Spalte von Beichten (NumPy-Arrays)
+KarmaMerkmale = namedtuple("KarmaMerkmale", ["laenge", "schlimm", "caps"])
+
 """Berechnet Karma-Schulden basierend auf Sünden"""
 class KarmaRechner:
 
@@ -18,20 +26,73 @@ class KarmaRechner:
     """Berechnet die Karma-Schulden für eine Sünde"""
     def berechne_karma_schulden(self, kategorie, text):
 
+        if isinstance(text, BeichtAnalyse):
+            # Länge, schlimme Wörter und CAPS wurden bereits in einem Durchlauf ermittelt
+            laenge = text.laenge
+            hat_schlimme_wörter = bool(text.straf_treffer)
+            ist_caps = text.ist_caps
+        else:
+            text_lower = text.lower()
+            laenge = len(text)
+            hat_schlimme_wörter = any(wort in text_lower for wort in self.schlimme_wörter)
+            ist_caps = text.isupper()
+
         punkte = self.base_punkte.get(kategorie, 7)
 
         # Bonus für längere Beichten
-        if len(text) > 100:
+        if laenge > 100:
             punkte += 5
 
         # Bonus für besonders schlimme Wörter
-        for wort in self.schlimme_wörter:
-            if wort in text.lower():
-                punkte += 10
-                break
+        if hat_schlimme_wörter:
+            punkte += 10
 
         # Bonus für CAPS (Schreien)
-        if text.isupper() and len(text) > 10:
+        if ist_caps and laenge > 10:
             punkte += 3
 
-        return punkte
\ No newline at end of file
+        return punkte
+
+    """Extrahiert die textabhängigen Merkmale für berechne_batch (einmal pro Historie)"""
+    def extrahiere_merkmale(self, texte):
+
+        from .text_spalte import TextSpalte
+
+        spalte = texte if isinstance(texte, TextSpalte) else TextSpalte(texte)
+        return KarmaMerkmale(
+            laenge=spalte.laengen,
+            schlimm=spalte.maske_mit(self.schlimme_wörter),
+            caps=spalte.ist_caps()
+        )
+
+    """Berechnet die Karma-Schulden für eine ganze Spalte von Beichten"""
+    def berechne_batch(self, kategorien, texte, kategorie_liste=None):
+
+        """
+        Args:
+            kategorien: Kategorie-Codes (mit kategorie_liste) oder Kategorie-Namen
+            texte: Iterable von Texten, TextSpalte oder KarmaMerkmale aus extrahiere_merkmale
+            kategorie_liste: Namen zu den Codes, z. B. AntwortGenerator.kategorie_liste
+
+        Returns:
+            np.ndarray: Karma-Schulden pro Beichte (int64), identisch zu berechne_karma_schulden
+        """
+        import numpy as np
+
+        merkmale = texte if isinstance(texte, KarmaMerkmale) else self.extrahiere_merkmale(texte)
+
+        if kategorie_liste is None:
+            kategorie_liste, codes = np.unique(np.asarray(list(kategorien), dtype=str), return_inverse=True)
+        else:
+            codes = np.asarray(kategorien, dtype=np.int64)
+        basis = np.array([self.base_punkte.get(k, 7) for k in kategorie_liste], dtype=np.int64)
+
+        laenge = merkmale.laenge
+        punkte = basis[codes.reshape(-1)] if len(basis) else np.zeros(len(laenge), dtype=np.int64)
+
+        # Gleiche Regeln wie berechne_karma_schulden, spaltenweise
+        punkte += 5 * (laenge > 100)
+        punkte += 10 * merkmale.schlimm
+        punkte += 3 * (merkmale.caps & (laenge > 10))
+
+        return punkte
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Keyword Matcher for Beichtsthul Modern
+Aho-Corasick automaton over the keyword table of the AntwortGenerator.
+The automaton is built once and finds every keyword hit in a single pass.
+"""
+
+from collections import deque, namedtuple
+
+
+# Ein Treffer im (kleingeschriebenen) Text: [start, ende) plus Keyword und Kategorie
+Treffer = namedtuple("Treffer", ["start", "ende", "wort", "kategorie"])
+
+
+class KeywordMatcher:
+    """Findet alle Keywords aller Kategorien in einem Durchlauf über den Text"""
+
+    def __init__(self, keywords):
+        """
+        Baut den Automaten aus einer Keyword-Tabelle
+
+        Args:
+            keywords: Mapping Kategorie -> Liste von Keywords (Reihenfolge = Priorität)
+        """
+        self.kategorien = list(keywords.keys())
+        # Zustand 0 ist die Wurzel; jede Liste ist pro Zustand indiziert
+        self._goto = [{}]
+        self._fail = [0]
+        self._ausgaben = [[]]
+
+        for kategorie_index, kategorie in enumerate(self.kategorien):
+            for wort in keywords[kategorie]:
+                wort = wort.lower()
+                if wort:
+                    self._einfuegen(wort, kategorie_index)
+
+        self._baue_fail_links()
+
+    def _einfuegen(self, wort, kategorie_index):
+        """Fügt ein Keyword in den Trie ein"""
+        zustand = 0
+        for zeichen in wort:
+            naechster = self._goto[zustand].get(zeichen)
+            if naechster is None:
+                naechster = len(self._goto)
+                self._goto[zustand][zeichen] = naechster
+                self._goto.append({})
+                self._fail.append(0)
+                self._ausgaben.append([])
+            zustand = naechster
+        self._ausgaben[zustand].append((wort, kategorie_index))
+
+    def _baue_fail_links(self):
+        """Berechnet die Fail-Links per Breitensuche und vererbt die Ausgaben"""
+        warteschlange = deque(self._goto[0].values())
+        while warteschlange:
+            zustand = warteschlange.popleft()
+            for zeichen, kind in self._goto[zustand].items():
+                warteschlange.append(kind)
+                fail = self._fail[zustand]
+                while fail and zeichen not in self._goto[fail]:
+                    fail = self._fail[fail]
+                ziel = self._goto[fail].get(zeichen, 0)
+                self._fail[kind] = ziel if ziel != kind else 0
+                self._ausgaben[kind] = self._ausgaben[kind] + self._ausgaben[self._fail[kind]]
+
+    def _scan(self, text_lower):
+        """Liefert (ende, wort, kategorie_index) für jeden Treffer im Text"""
+        goto = self._goto
+        fail = self._fail
+        ausgaben = self._ausgaben
+        zustand = 0
+        for position, zeichen in enumerate(text_lower):
+            while zustand and zeichen not in goto[zustand]:
+                zustand = fail[zustand]
+            zustand = goto[zustand].get(zeichen, 0)
+            for wort, kategorie_index in ausgaben[zustand]:
+                yield position + 1, wort, kategorie_index
+
+    def finde_alle(self, text):
+        """
+        Findet alle Keyword-Treffer im Text
+
+        Args:
+            text: Der zu durchsuchende Text
+
+        Returns:
+            list: Treffer sortiert nach Endposition; Offsets beziehen sich auf text.lower()
+        """
+        return [
+            Treffer(ende - len(wort), ende, wort, self.kategorien[kategorie_index])
+            for ende, wort, kategorie_index in self._scan(text.lower())
+        ]
+
+    def erste_kategorie(self, text, standard="standard"):
+        """
+        Bestimmt die Kategorie mit der höchsten Priorität, die im Text vorkommt
+
+        Args:
+            text: Der zu durchsuchende Text
+            standard: Rückgabewert, wenn kein Keyword gefunden wird
+
+        Returns:
+            str: Die erste passende Kategorie in Tabellenreihenfolge
+        """
+        beste = None
+        for _, _, kategorie_index in self._scan(text.lower()):
+            if beste is None or kategorie_index < beste:
+                beste = kategorie_index
+                if beste == 0:
+                    break
+        return standard if beste is None else self.kategorien[beste]
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Crash-safe File Helpers for Beichtsthul Modern
+Atomic snapshot writes (temp file + fsync + rename) and CRC32-framed
+records for append-only files, plus a recovery scan that salvages every
+intact record and reports what had to be dropped.
+"""
+
+import os
+import zlib
+import tempfile
+from collections import namedtuple
+
+
+# Ergebnis eines Wiederherstellungs-Scans
+Wiederherstellungsbericht = namedtuple("Wiederherstellungsbericht", [
+    "gelesen",      # Anzahl intakter Datensätze
+    "verworfen",    # list[(zeilennummer, grund)] verworfener Zeilen
+])
+
+
+def schreibe_atomar(dateiname, text, binaer=False):
+    """
+    Schreibt eine Datei so, dass sie nach einem Absturz entweder alt oder neu ist
+
+    Args:
+        dateiname: Zielpfad
+        text: Vollständiger Dateiinhalt oder iterierbare Textstücke (werden gestreamt)
+        binaer: True, wenn text aus bytes besteht
+    """
+    ersetze_atomar(schreibe_temporaer(dateiname, text, binaer), dateiname)
+
+
+def schreibe_temporaer(dateiname, text, binaer=False):
+    """
+    Schreibt den Inhalt in eine fsynchronisierte Temp-Datei neben dateiname
+
+    Returns:
+        str: Pfad der Temp-Datei; mit ersetze_atomar an ihren Platz bringen
+    """
+    verzeichnis = os.path.dirname(os.path.abspath(dateiname))
+    fd, temp_pfad = tempfile.mkstemp(prefix=".tmp-", dir=verzeichnis)
+    try:
+        with (os.fdopen(fd, "wb") if binaer else os.fdopen(fd, "w", encoding="utf-8")) as f:
+            if isinstance(text, (str, bytes)):
+                f.write(text)
+            else:
+                f.writelines(text)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        verwerfe_temporaer(temp_pfad)
+        raise
+    return temp_pfad
+
+
+def ersetze_atomar(temp_pfad, dateiname):
+    """Ersetzt dateiname atomar durch die Temp-Datei"""
+    try:
+        os.replace(temp_pfad, dateiname)
+    except BaseException:
+        verwerfe_temporaer(temp_pfad)
+        raise
+    _fsync_verzeichnis(os.path.dirname(os.path.abspath(dateiname)))
+
+
+def verwerfe_temporaer(temp_pfad):
+    """Löscht eine nicht mehr benötigte Temp-Datei"""
+    try:
+        os.remove(temp_pfad)
+    except OSError:
+        pass
+
+
+def sichere_defekte_datei(dateiname):
+    """
+    Benennt eine unlesbare Datei um, damit das nächste Speichern sie nicht überschreibt
+
+    Returns:
+        str: Neuer Pfad oder None, wenn das Umbenennen fehlschlug
+    """
+    ziel = f"{dateiname}.defekt"
+    nummer = 1
+    while os.path.exists(ziel):
+        nummer += 1
+        ziel = f"{dateiname}.defekt{nummer}"
+    try:
+        os.replace(dateiname, ziel)
+        return ziel
+    except OSError:
+        return None
+
+
+def _fsync_verzeichnis(verzeichnis):
+    """Macht das Umbenennen dauerhaft (nicht auf allen Plattformen möglich)"""
+    try:
+        fd = os.open(verzeichnis, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def rahme_datensatz(nutzdaten):
+    """
+    Versieht eine einzeilige Nutzlast mit CRC32-Prüfsumme
+
+    Args:
+        nutzdaten: Datensatz als Text ohne Zeilenumbruch
+
+    Returns:
+        str: "<crc32 hex> <nutzdaten>\\n"
+    """
+    return f"{zlib.crc32(nutzdaten.encode('utf-8')):08x} {nutzdaten}\n"
+
+
+def haenge_datensaetze_an(dateiname, nutzdaten_liste):
+    """Hängt gerahmte Datensätze an und wartet, bis sie auf der Platte sind"""
+    text = "".join(rahme_datensatz(nutzdaten) for nutzdaten in nutzdaten_liste)
+    with open(dateiname, "a", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def scanne_datensaetze(dateiname, legacy_praefix="{"):
+    """
+    Liest alle intakten Datensätze einer gerahmten Datei
+
+    Ungerahmte Zeilen, die mit legacy_praefix beginnen (Journal-Format vor
+    der Prüfsumme), werden ungeprüft übernommen.
+
+    Args:
+        dateiname: Zu prüfende Datei
+
+    Returns:
+        tuple: (list[str] Nutzlasten, Wiederherstellungsbericht)
+    """
+    nutzlasten = []
+    verworfen = []
+    if not os.path.exists(dateiname):
+        return nutzlasten, Wiederherstellungsbericht(0, verworfen)
+
+    with open(dateiname, "rb") as f:
+        inhalt = f.read()
+
+    zeilen = inhalt.split(b"\n")
+    # Nach dem letzten Zeilenumbruch steht nur bei abgebrochenem Schreiben noch etwas
+    letzte_unvollstaendig = zeilen[-1] != b""
+    if not letzte_unvollstaendig:
+        zeilen.pop()
+
+    crc32 = zlib.crc32
+    for nummer, zeile in enumerate(zeilen, start=1):
+        if not zeile:
+            continue
+        if letzte_unvollstaendig and nummer == len(zeilen):
+            verworfen.append((nummer, "unvollständig"))
+            continue
+        if legacy_praefix and zeile.startswith(legacy_praefix.encode("utf-8")):
+            try:
+                nutzlasten.append(zeile.decode("utf-8"))
+            except UnicodeDecodeError:
+                verworfen.append((nummer, "ungültige Kodierung"))
+            continue
+        pruefsumme, _, nutzdaten = zeile.partition(b" ")
+        try:
+            if len(pruefsumme) != 8 or int(pruefsumme, 16) != crc32(nutzdaten):
+                verworfen.append((nummer, "Prüfsumme falsch"))
+                continue
+            nutzlasten.append(nutzdaten.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            verworfen.append((nummer, "beschädigt"))
+
+    return nutzlasten, Wiederherstellungsbericht(len(nutzlasten), verworfen)
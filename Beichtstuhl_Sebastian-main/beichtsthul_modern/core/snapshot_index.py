@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Snapshot Offset Index for Beichtsthul Modern
+Sidecar file with the byte offset of every history entry in a line-based
+snapshot, and a reader that memory-maps snapshot and index so that any
+range of entries is located in O(1) and only those records are decoded.
+"""
+
+import os
+import json
+import mmap
+import struct
+from array import array
+
+from .sichere_datei import schreibe_atomar
+
+
+# Kopf der Index-Datei: Kennung, Größe und Änderungszeit (ns) des zugehörigen Snapshots
+_KOPF = struct.Struct("<4s4xQq")
+_KENNUNG = b"BIX2"
+
+
+def index_bytes(datei_stat, offsets):
+    """
+    Serialisiert einen Index
+
+    Args:
+        datei_stat: os.stat_result des Snapshots (Größe und Änderungszeit
+            zur Gültigkeitsprüfung)
+        offsets: array("Q") mit dem Start jedes Eintrags und dem Ende des letzten
+
+    Returns:
+        bytes: Inhalt der Index-Datei
+    """
+    return _KOPF.pack(_KENNUNG, datei_stat.st_size, datei_stat.st_mtime_ns) + offsets.tobytes()
+
+
+def schreibe_index(index_dateiname, datei_stat, offsets):
+    """Schreibt den Index atomar"""
+    schreibe_atomar(index_dateiname, index_bytes(datei_stat, offsets), binaer=True)
+
+
+class SnapshotIndex:
+    """Wahlfreier Lesezugriff auf einen zeilenweisen Snapshot per mmap"""
+
+    def __init__(self, dateiname, index_dateiname, anzahl):
+        """
+        Öffnet Snapshot und Index; ein fehlender oder veralteter Index
+        wird mit einem einzigen Durchlauf über den Snapshot neu aufgebaut.
+
+        Args:
+            dateiname: Snapshot mit einem Eintrag pro Zeile nach der Kopfzeile
+            index_dateiname: Pfad der Index-Datei
+            anzahl: Anzahl Einträge im Snapshot
+        """
+        self.anzahl = anzahl
+        self._datei = open(dateiname, "rb")
+        stat = os.fstat(self._datei.fileno())
+        groesse = stat.st_size
+        self._daten_mmap = mmap.mmap(self._datei.fileno(), 0, access=mmap.ACCESS_READ) if groesse else None
+        self._daten = memoryview(self._daten_mmap) if groesse else memoryview(b"")
+        self._index_mmap = None
+
+        offsets = self._oeffne_index(index_dateiname, stat)
+        if offsets is None:
+            offsets = self._baue_offsets()
+            try:
+                schreibe_index(index_dateiname, stat, offsets)
+            except OSError as e:
+                print(f"Fehler beim Schreiben des Index: {e}")
+        self._offsets = offsets
+
+    def _oeffne_index(self, index_dateiname, stat):
+        """
+        Mappt einen passenden Index oder liefert None
+
+        Ein Snapshot, der nach dem Index bei gleicher Größe ersetzt oder
+        bearbeitet wurde, fällt über die Änderungszeit auf.
+        """
+        try:
+            with open(index_dateiname, "rb") as f:
+                index_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        gueltig = len(index_mmap) == _KOPF.size + 8 * (self.anzahl + 1)
+        if gueltig:
+            kennung, index_groesse, index_mtime = _KOPF.unpack_from(index_mmap)
+            gueltig = (kennung == _KENNUNG and index_groesse == stat.st_size
+                       and index_mtime == stat.st_mtime_ns)
+        if not gueltig:
+            index_mmap.close()
+            return None
+        self._index_mmap = index_mmap
+        return memoryview(index_mmap)[_KOPF.size:].cast("Q")
+
+    def _baue_offsets(self):
+        """Sucht die Zeilenanfänge im Snapshot (einmalig, falls der Index fehlt)"""
+        offsets = array("Q")
+        position = self._zeilenende(0)
+        for _ in range(self.anzahl + 1):
+            offsets.append(position)
+            position = self._zeilenende(position)
+        return offsets
+
+    def _zeilenende(self, position):
+        """Beginn der nächsten Zeile; fehlt der Zeilenumbruch, das Dateiende"""
+        daten = self._daten_mmap
+        if daten is None:
+            return 0
+        zeilenende = daten.find(b"\n", position)
+        return len(daten) if zeilenende == -1 else zeilenende + 1
+
+    def lese(self, start, stop):
+        """
+        Dekodiert die Einträge [start, stop)
+
+        Returns:
+            list: Historien-Einträge
+        """
+        stop = min(stop, self.anzahl)
+        if start >= stop:
+            return []
+        # Den Bereich einmal dekodieren und an den Zeilenumbrüchen teilen
+        # (ein Eintrag pro Zeile; JSON-Strings enthalten keine rohen Umbrüche)
+        block = str(self._daten[self._offsets[start]:self._offsets[stop]], "utf-8")
+        loads = json.loads
+        return [loads(zeile.rstrip(",\r")) for zeile in block.split("\n", stop - start)[:stop - start]]
+
+    def schliesse(self):
+        """Gibt die Mappings frei (nötig, bevor der Snapshot ersetzt wird)"""
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._daten.release()
+        if self._index_mmap is not None:
+            self._index_mmap.close()
+        if self._daten_mmap is not None:
+            self._daten_mmap.close()
+        self._datei.close()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SQLite Storage for Beichtsthul Modern
+Optional storage backend for the DateiManager that keeps every confession
+as a row of an indexed SQLite table (WAL mode). Aggregates such as counts
+per category, the last N confessions or the karma sum are answered in SQL
+without loading the whole history.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+
+from .json_strom_leser import JsonStromLeser, suenden_text
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS beichten (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    kategorie TEXT NOT NULL,
+    karma INTEGER NOT NULL,
+    zeitstempel REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_beichten_kategorie ON beichten (kategorie);
+CREATE INDEX IF NOT EXISTS idx_beichten_zeitstempel ON beichten (zeitstempel);
+CREATE TABLE IF NOT EXISTS zustand (
+    schluessel TEXT PRIMARY KEY,
+    wert TEXT NOT NULL
+);
+"""
+
+# Zeitstempel von Legacy-Beichten ohne "zeit"; sie zählen in keinem Zeitraum
+_OHNE_ZEIT = 0
+
+
+class SQLiteSpeicher:
+    """Eine Zeile pro Beichte plus laufende Summen in der Tabelle zustand"""
+
+    def __init__(self, dateiname):
+        """
+        Args:
+            dateiname: Pfad der SQLite-Datenbank
+        """
+        self.dateiname = dateiname
+        self._lock = threading.Lock()
+        self._verbindung = sqlite3.connect(dateiname, check_same_thread=False)
+        self._verbindung.execute("PRAGMA journal_mode=WAL")
+        self._verbindung.execute("PRAGMA synchronous=NORMAL")
+        self._verbindung.executescript(_SCHEMA)
+        self._persistiert = self.anzahl()
+        # Generation der zuletzt gespeicherten BeichtHistorie (siehe DateiManager.neue_historie)
+        self._generation = 0
+        # Gespeicherter Zustand des StatistikAggregator (None = unbekannt, neu aufbauen)
+        self.statistik = None
+
+    def schliesse(self):
+        """Schließt die Datenbankverbindung"""
+        with self._lock:
+            self._verbindung.close()
+
+    def _eintrag_zu_zeile(self, eintrag):
+        """Wandelt einen Historien-Eintrag in Tabellenwerte um"""
+        return (
+            suenden_text(eintrag),
+            eintrag.get("kategorie", "standard"),
+            eintrag.get("karma", 0),
+            eintrag.get("zeit", _OHNE_ZEIT)
+        )
+
+    @staticmethod
+    def _zeile_zu_eintrag(text, kategorie, karma, zeit):
+        """Wandelt Tabellenwerte zurück in einen Historien-Eintrag (ohne "zeit" für Legacy-Beichten)"""
+        eintrag = {"suende": text, "kategorie": kategorie, "karma": karma}
+        if zeit != _OHNE_ZEIT:
+            eintrag["zeit"] = zeit
+        return eintrag
+
+    def speichere_daten(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        """
+        Fügt neue Einträge am Ende der Historie als Zeilen ein
+
+        Args:
+            statistik: Optionaler Zustand des StatistikAggregator (dict)
+
+        Returns:
+            bool: True bei Erfolg
+        """
+        try:
+            with self._lock:
+                anzahl = len(beicht_historie)
+                bereits = self._persistiert
+                generation = getattr(beicht_historie, "generation", self._generation)
+                with self._verbindung:
+                    if anzahl < bereits or generation != self._generation:
+                        # Reset oder gekürzte Historie: Tabelle neu aufbauen
+                        self._verbindung.execute("DELETE FROM beichten")
+                        bereits = 0
+                    self._verbindung.executemany(
+                        "INSERT INTO beichten (text, kategorie, karma, zeitstempel) VALUES (?, ?, ?, ?)",
+                        [self._eintrag_zu_zeile(e) for e in beicht_historie[bereits:anzahl]]
+                    )
+                    self._schreibe_summen(karma_schulden, suenden_kategorien, statistik)
+                # Erst nach dem Commit; bei einem Rollback bleibt der alte Stand gültig
+                self._persistiert = anzahl
+                self._generation = generation
+            self.statistik = statistik
+            return True
+        except Exception as e:
+            print(f"Fehler beim Speichern: {e}")
+            return False
+
+    def _schreibe_summen(self, karma_schulden, suenden_kategorien, statistik=None):
+        """Speichert die laufenden Summen (innerhalb einer Transaktion aufrufen)"""
+        self._verbindung.executemany(
+            "INSERT OR REPLACE INTO zustand (schluessel, wert) VALUES (?, ?)",
+            [
+                ("karma_schulden", json.dumps(karma_schulden)),
+                ("suenden_kategorien", json.dumps(dict(suenden_kategorien), ensure_ascii=False))
+            ]
+        )
+        if statistik is None:
+            # Eine veraltete Statistik darf nicht weiterleben
+            self._verbindung.execute("DELETE FROM zustand WHERE schluessel = 'statistik'")
+        else:
+            self._verbindung.execute(
+                "INSERT OR REPLACE INTO zustand (schluessel, wert) VALUES ('statistik', ?)",
+                (json.dumps(statistik, ensure_ascii=False),)
+            )
+
+    def _lese_summen(self):
+        """Liest die laufenden Summen; fehlende Werte werden aus den Zeilen berechnet"""
+        werte = dict(self._verbindung.execute("SELECT schluessel, wert FROM zustand"))
+        if "karma_schulden" in werte:
+            karma_schulden = json.loads(werte["karma_schulden"])
+        else:
+            karma_schulden = self._verbindung.execute("SELECT COALESCE(SUM(karma), 0) FROM beichten").fetchone()[0]
+        if "suenden_kategorien" in werte:
+            suenden_kategorien = json.loads(werte["suenden_kategorien"])
+        else:
+            suenden_kategorien = dict(self._verbindung.execute(
+                "SELECT kategorie, COUNT(*) FROM beichten GROUP BY kategorie"
+            ))
+        self.statistik = json.loads(werte["statistik"]) if "statistik" in werte else None
+        return karma_schulden, suenden_kategorien
+
+    def lade_daten(self):
+        """
+        Returns:
+            tuple: (karma_schulden, beicht_historie, suenden_kategorien)
+        """
+        try:
+            with self._lock:
+                karma_schulden, suenden_kategorien = self._lese_summen()
+                beicht_historie = [
+                    self._zeile_zu_eintrag(*zeile)
+                    for zeile in self._verbindung.execute(
+                        "SELECT text, kategorie, karma, zeitstempel FROM beichten ORDER BY id"
+                    )
+                ]
+            self._persistiert = len(beicht_historie)
+            return karma_schulden, beicht_historie, defaultdict(int, suenden_kategorien)
+        except Exception as e:
+            print(f"Fehler beim Laden: {e}")
+        return 0, [], defaultdict(int)
+
+    def lade_zusammenfassung(self):
+        """
+        Lädt nur die laufenden Summen und die Anzahl der Beichten
+
+        Returns:
+            tuple: (karma_schulden, anzahl, suenden_kategorien)
+        """
+        try:
+            with self._lock:
+                karma_schulden, suenden_kategorien = self._lese_summen()
+                anzahl = self._verbindung.execute("SELECT COUNT(*) FROM beichten").fetchone()[0]
+            self._persistiert = anzahl
+            return karma_schulden, anzahl, defaultdict(int, suenden_kategorien)
+        except Exception as e:
+            print(f"Fehler beim Laden: {e}")
+        return 0, 0, defaultdict(int)
+
+    def lese_eintraege(self, start, stop):
+        """
+        Liest die Beichten [start, stop) in Einfügereihenfolge
+
+        Returns:
+            list: Historien-Einträge
+        """
+        with self._lock:
+            return [
+                self._zeile_zu_eintrag(*zeile)
+                for zeile in self._verbindung.execute(
+                    "SELECT text, kategorie, karma, zeitstempel FROM beichten ORDER BY id LIMIT ? OFFSET ?",
+                    (max(0, stop - start), start)
+                )
+            ]
+
+    def anzahl(self):
+        """Anzahl gespeicherter Beichten"""
+        with self._lock:
+            return self._verbindung.execute("SELECT COUNT(*) FROM beichten").fetchone()[0]
+
+    def anzahl_pro_kategorie(self):
+        """Anzahl Beichten pro Kategorie (über den Kategorie-Index)"""
+        with self._lock:
+            return dict(self._verbindung.execute(
+                "SELECT kategorie, COUNT(*) FROM beichten GROUP BY kategorie"
+            ))
+
+    def karma_summe(self, seit=None):
+        """
+        Summe der Karma-Schulden aller Beichten
+
+        Args:
+            seit: Optionaler Unix-Zeitstempel; nur neuere Beichten zählen
+                (Legacy-Beichten ohne Zeitstempel nie)
+        """
+        with self._lock:
+            if seit is None:
+                zeile = self._verbindung.execute("SELECT COALESCE(SUM(karma), 0) FROM beichten").fetchone()
+            else:
+                zeile = self._verbindung.execute(
+                    "SELECT COALESCE(SUM(karma), 0) FROM beichten WHERE zeitstempel >= ? AND zeitstempel != ?",
+                    (seit, _OHNE_ZEIT)
+                ).fetchone()
+            return zeile[0]
+
+    def letzte(self, anzahl):
+        """
+        Die letzten Beichten, neueste zuerst
+
+        Args:
+            anzahl: Maximale Anzahl Einträge
+        """
+        with self._lock:
+            return [
+                self._zeile_zu_eintrag(*zeile)
+                for zeile in self._verbindung.execute(
+                    "SELECT text, kategorie, karma, zeitstempel FROM beichten ORDER BY id DESC LIMIT ?",
+                    (anzahl,)
+                )
+            ]
+
+    def importiere_json(self, json_dateiname):
+        """
+        Einmaliger Import einer Legacy-JSON-Datei in eine leere Datenbank
+
+        Args:
+            json_dateiname: Pfad der Datei im Format von beichtstuh_daten_.json
+
+        Returns:
+            int: Anzahl importierter Beichten (0, wenn die Datenbank nicht leer ist)
+        """
+        if self.anzahl() > 0 or not os.path.exists(json_dateiname):
+            return 0
+        try:
+            # Zwei gestreamte Durchläufe: erst die Summen, dann die Einträge
+            leser = JsonStromLeser(json_dateiname)
+            karma_schulden, anzahl, suenden_kategorien = leser.zusammenfassung()
+            with self._lock, self._verbindung:
+                self._verbindung.executemany(
+                    "INSERT INTO beichten (text, kategorie, karma, zeitstempel) VALUES (?, ?, ?, ?)",
+                    (self._eintrag_zu_zeile(e) for e in leser)
+                )
+                self._schreibe_summen(karma_schulden, suenden_kategorien)
+            self._persistiert = anzahl
+            return anzahl
+        except Exception as e:
+            print(f"Fehler beim Import: {e}")
+            return 0
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Incremental Statistics for Beichtsthul Modern
+Running aggregates over all confessions (count, karma sum, min, max, mean
+and per-category counts and karma sums), updated in O(1) per confession
+and stored next to the data file, so the statistics view never scans the
+history. Timestamped confessions are also booked into ZeitRollups for
+time-range queries, and every karma value feeds the distribution sketches
+(median, p95, p99 and a histogram, total and per category).
+PersistenceWorker.submit() takes a cheap schnappschuss() together with the
+history length, so the saved statistics cover exactly the saved history;
+the snapshot is serialised on the worker thread.
+"""
+
+import threading
+from collections import namedtuple
+
+from .zeit_rollups import ZeitRollups, KategorieStatistik
+from .verteilung import KarmaVerteilung
+
+
+# Unveränderliche Momentaufnahme für die Statistik-Anzeige
+StatistikMomentaufnahme = namedtuple("StatistikMomentaufnahme", [
+    "anzahl",       # Anzahl Beichten
+    "summe",        # Summe der Karma-Schulden
+    "minimum",      # Kleinste Karma-Schuld einer Beichte (None ohne Beichten)
+    "maximum",      # Größte Karma-Schuld einer Beichte (None ohne Beichten)
+    "mittelwert",   # Durchschnittliche Karma-Schuld (0.0 ohne Beichten)
+    "kategorien",   # dict: kategorie -> KategorieStatistik
+    "quantile",     # Quantile (Median, p95, p99) über alle Beichten
+    "kategorie_quantile",  # dict: kategorie -> Quantile
+    "histogramm",   # list: (untergrenze, obergrenze, anzahl)
+])
+
+
+class StatistikAggregator:
+    """Laufende Kennzahlen, die pro Beichte in O(1) fortgeschrieben werden"""
+
+    def __init__(self):
+        # Schützt den Zustand, während ein anderer Thread einen Schnappschuss nimmt
+        self._sperre = threading.Lock()
+        self.zuruecksetzen()
+
+    def zuruecksetzen(self):
+        """Setzt alle Kennzahlen auf den Anfangszustand"""
+        with self._sperre:
+            self.anzahl = 0
+            self.summe = 0
+            self.minimum = None
+            self.maximum = None
+            # kategorie -> [anzahl, karma]
+            self._kategorien = {}
+            self.rollups = ZeitRollups()
+            self.verteilung = KarmaVerteilung()
+            # kategorie -> KarmaVerteilung
+            self._kategorie_verteilungen = {}
+
+    def erfasse(self, kategorie, karma, zeit=None):
+        """
+        Schreibt die Kennzahlen für eine neue Beichte fort
+
+        Args:
+            kategorie: Sünden-Kategorie der Beichte
+            karma: Berechnete Karma-Schuld
+            zeit: Unix-Zeitstempel; ohne ihn wird die Beichte nicht in die Rollups gebucht
+        """
+        with self._sperre:
+            self.anzahl += 1
+            self.summe += karma
+            if self.minimum is None or karma < self.minimum:
+                self.minimum = karma
+            if self.maximum is None or karma > self.maximum:
+                self.maximum = karma
+            werte = self._kategorien.get(kategorie)
+            if werte is None:
+                self._kategorien[kategorie] = [1, karma]
+            else:
+                werte[0] += 1
+                werte[1] += karma
+            self.verteilung.erfasse(karma)
+            verteilung = self._kategorie_verteilungen.get(kategorie)
+            if verteilung is None:
+                verteilung = self._kategorie_verteilungen[kategorie] = KarmaVerteilung()
+            verteilung.erfasse(karma)
+            if zeit is not None:
+                self.rollups.erfasse(zeit, kategorie, karma)
+
+    def erfasse_eintrag(self, eintrag):
+        """Schreibt die Kennzahlen für einen Historien-Eintrag fort"""
+        self.erfasse(eintrag.get("kategorie", "standard"), eintrag.get("karma", 0), eintrag.get("zeit"))
+
+    @property
+    def mittelwert(self):
+        """Durchschnittliche Karma-Schuld pro Beichte"""
+        return self.summe / self.anzahl if self.anzahl else 0.0
+
+    def kategorie_anzahlen(self):
+        """Beichten pro Kategorie im Format von suenden_kategorien"""
+        return {kategorie: werte[0] for kategorie, werte in self._kategorien.items()}
+
+    def momentaufnahme(self):
+        """
+        Returns:
+            StatistikMomentaufnahme: Aktueller Stand für die Anzeige
+        """
+        return StatistikMomentaufnahme(
+            self.anzahl, self.summe, self.minimum, self.maximum, self.mittelwert,
+            {kategorie: KategorieStatistik(*werte) for kategorie, werte in self._kategorien.items()},
+            self.verteilung.kennzahlen(),
+            {kategorie: verteilung.kennzahlen() for kategorie, verteilung in self._kategorie_verteilungen.items()},
+            self.verteilung.histogramm.buckets()
+        )
+
+    def verschmelze(self, anderer):
+        """
+        Addiert die Kennzahlen eines anderen Aggregators (z.B. von einem
+        zweiten Kiosk); Summen, Rollups und Verteilungen sind verschmelzbar
+        """
+        with self._sperre:
+            self.anzahl += anderer.anzahl
+            self.summe += anderer.summe
+            for wert in (anderer.minimum, anderer.maximum):
+                if wert is None:
+                    continue
+                if self.minimum is None or wert < self.minimum:
+                    self.minimum = wert
+                if self.maximum is None or wert > self.maximum:
+                    self.maximum = wert
+            for kategorie, (anzahl, karma) in anderer._kategorien.items():
+                werte = self._kategorien.setdefault(kategorie, [0, 0])
+                werte[0] += anzahl
+                werte[1] += karma
+            self.rollups.verschmelze(anderer.rollups)
+            self.verteilung.verschmelze(anderer.verteilung)
+            for kategorie, verteilung in anderer._kategorie_verteilungen.items():
+                self._kategorie_verteilungen.setdefault(kategorie, KarmaVerteilung()).verschmelze(verteilung)
+
+    def schnappschuss(self):
+        """
+        Unabhängige Kopie des aktuellen Stands (nur flache Kopien, hält die Sperre kurz)
+
+        Returns:
+            StatistikAggregator: Kopie, die erfasse() nicht mehr verändert
+        """
+        kopie = type(self)()
+        with self._sperre:
+            kopie.anzahl = self.anzahl
+            kopie.summe = self.summe
+            kopie.minimum = self.minimum
+            kopie.maximum = self.maximum
+            kopie._kategorien = {kategorie: list(werte) for kategorie, werte in self._kategorien.items()}
+            kopie.rollups = self.rollups.kopie()
+            kopie.verteilung = self.verteilung.kopie()
+            kopie._kategorie_verteilungen = {
+                kategorie: verteilung.kopie() for kategorie, verteilung in self._kategorie_verteilungen.items()
+            }
+        return kopie
+
+    def als_dict(self):
+        """
+        JSON-serialisierbarer Zustand (wird mit der Datendatei gespeichert)
+
+        Darf aus einem anderen Thread aufgerufen werden als erfasse(); unter
+        der Sperre wird nur der Schnappschuss genommen.
+        """
+        kopie = self.schnappschuss()
+        return {
+            "anzahl": kopie.anzahl,
+            "summe": kopie.summe,
+            "minimum": kopie.minimum,
+            "maximum": kopie.maximum,
+            "kategorien": kopie._kategorien,
+            "rollups": kopie.rollups.als_dict(),
+            "verteilung": kopie.verteilung.als_dict(),
+            "kategorie_verteilungen": {
+                kategorie: verteilung.als_dict() for kategorie, verteilung in kopie._kategorie_verteilungen.items()
+            }
+        }
+
+    @classmethod
+    def aus_dict(cls, daten):
+        """Stellt einen Aggregator aus als_dict() wieder her"""
+        aggregator = cls()
+        aggregator.anzahl = daten.get("anzahl", 0)
+        aggregator.summe = daten.get("summe", 0)
+        aggregator.minimum = daten.get("minimum")
+        aggregator.maximum = daten.get("maximum")
+        aggregator._kategorien = {
+            kategorie: [werte[0], werte[1]] for kategorie, werte in daten.get("kategorien", {}).items()
+        }
+        aggregator.rollups = ZeitRollups.aus_dict(daten.get("rollups", {}))
+        aggregator.verteilung = KarmaVerteilung.aus_dict(daten.get("verteilung", {}))
+        aggregator._kategorie_verteilungen = {
+            kategorie: KarmaVerteilung.aus_dict(verteilung)
+            for kategorie, verteilung in daten.get("kategorie_verteilungen", {}).items()
+        }
+        return aggregator
+
+    @classmethod
+    def aus_historie(cls, beicht_historie):
+        """
+        Baut die Kennzahlen einmalig aus einer vorhandenen Historie auf
+        (für Daten, die vor dem Aggregator gespeichert wurden)
+        """
+        aggregator = cls()
+        for eintrag in beicht_historie:
+            aggregator.erfasse_eintrag(eintrag)
+        return aggregator
+
+    @classmethod
+    def lade(cls, daten, beicht_historie):
+        """
+        Stellt den gespeicherten Stand wieder her und holt die Einträge nach,
+        die seitdem angehängt wurden (gespeichert wird nur mit dem Snapshot)
+
+        Args:
+            daten: als_dict() aus DateiManager.statistik oder None
+            beicht_historie: Geladene Historie
+
+        Returns:
+            StatistikAggregator
+        """
+        # Stände ohne Verteilungen (vor deren Einführung gespeichert) einmalig neu aufbauen
+        if daten is None or "verteilung" not in daten or daten.get("anzahl", 0) > len(beicht_historie):
+            return cls.aus_historie(beicht_historie)
+        aggregator = cls.aus_dict(daten)
+        for eintrag in beicht_historie[aggregator.anzahl:]:
+            aggregator.erfasse_eintrag(eintrag)
+        return aggregator
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Statistics Reports for Beichtsthul Modern
+Reports that need a pass over the whole history (full-text filter,
+per-keyword breakdown, re-scoring under the current rules, sorting).
+Each report is a generator that reads the history page by page and
+yields a cumulative BerichtStand after every page, so a background task
+can stream partial results and stop between two pages when cancelled.
+"""
+
+import heapq
+from collections import namedtuple
+
+from .json_strom_leser import suenden_text
+from .zeit_rollups import KategorieStatistik
+
+
+# Zwischen- oder Endstand eines Berichts (unveränderlich, darf zwischen Threads wandern)
+BerichtStand = namedtuple("BerichtStand", [
+    "verarbeitet",  # Anzahl bisher gelesener Einträge
+    "gesamt",       # Anzahl Einträge, über die der Bericht läuft
+    "ergebnis",     # Bericht-spezifisches Ergebnis (Kopie, wird nicht weiter verändert)
+])
+
+# Ergebnis je Kategorie bei der Neubewertung
+Neubewertung = namedtuple("Neubewertung", ["anzahl", "karma_alt", "karma_neu"])
+
+
+def _seiten(historie, seitengroesse):
+    """Liest die ersten len(historie) Einträge seitenweise"""
+    gesamt = len(historie)
+    for start in range(0, gesamt, seitengroesse):
+        yield start, gesamt, historie[start:min(start + seitengroesse, gesamt)]
+
+
+def filter_bericht(historie, suchtext, seitengroesse=500):
+    """
+    Anzahl und Karma pro Kategorie für Beichten, die suchtext enthalten
+
+    Yields:
+        BerichtStand: ergebnis ist dict kategorie -> KategorieStatistik
+    """
+    suchtext = suchtext.lower()
+    kategorien = {}
+    verarbeitet = gesamt = 0
+    for start, gesamt, seite in _seiten(historie, seitengroesse):
+        for eintrag in seite:
+            if suchtext in suenden_text(eintrag).lower():
+                werte = kategorien.setdefault(eintrag.get("kategorie", "standard"), [0, 0])
+                werte[0] += 1
+                werte[1] += eintrag.get("karma", 0)
+        verarbeitet = start + len(seite)
+        yield BerichtStand(verarbeitet, gesamt, {
+            kategorie: KategorieStatistik(*werte) for kategorie, werte in kategorien.items()
+        })
+    if not verarbeitet:
+        yield BerichtStand(0, 0, {})
+
+
+def keyword_bericht(historie, analysator, seitengroesse=500):
+    """
+    Treffer pro Keyword (Kategorie- und Straf-Wörter) über die ganze Historie
+
+    Args:
+        analysator: BeichtAnalysator mit den aktuellen Keyword-Tabellen
+
+    Yields:
+        BerichtStand: ergebnis ist dict wort -> anzahl
+    """
+    treffer = {}
+    verarbeitet = 0
+    for start, gesamt, seite in _seiten(historie, seitengroesse):
+        for eintrag in seite:
+            analyse = analysator.analysiere(suenden_text(eintrag))
+            for wort in [t.wort for t in analyse.kategorie_treffer] + list(analyse.straf_treffer):
+                treffer[wort] = treffer.get(wort, 0) + 1
+        verarbeitet = start + len(seite)
+        yield BerichtStand(verarbeitet, gesamt, dict(treffer))
+    if not verarbeitet:
+        yield BerichtStand(0, 0, {})
+
+
+def neubewertung_bericht(historie, analysator, karma_rechner, seitengroesse=500):
+    """
+    Bewertet alle Beichten mit den aktuellen Regeln neu
+
+    Die Kategorie wird neu bestimmt; verglichen wird mit dem gespeicherten Karma.
+
+    Yields:
+        BerichtStand: ergebnis ist dict kategorie -> Neubewertung
+    """
+    kategorien = {}
+    verarbeitet = 0
+    for start, gesamt, seite in _seiten(historie, seitengroesse):
+        for eintrag in seite:
+            analyse = analysator.analysiere(suenden_text(eintrag))
+            werte = kategorien.setdefault(analyse.kategorie, [0, 0, 0])
+            werte[0] += 1
+            werte[1] += eintrag.get("karma", 0)
+            werte[2] += karma_rechner.berechne_karma_schulden(analyse.kategorie, analyse)
+        verarbeitet = start + len(seite)
+        yield BerichtStand(verarbeitet, gesamt, {
+            kategorie: Neubewertung(*werte) for kategorie, werte in kategorien.items()
+        })
+    if not verarbeitet:
+        yield BerichtStand(0, 0, {})
+
+
+def sortier_bericht(historie, schluessel, absteigend=False, seitengroesse=500, blockgroesse=16384):
+    """
+    Sortiert die Positionen der Historie nach einem Schlüssel
+
+    Sortiert wird in Blöcken, die danach zusammengeführt werden; so hält
+    kein einzelner Schritt den GIL lange und der UI-Thread bleibt flüssig.
+    Zwischenstände tragen nur den Fortschritt; erst der letzte Stand
+    enthält die Reihenfolge (stabil wie sorted()).
+
+    Args:
+        schluessel: Funktion eintrag -> Sortierschlüssel
+
+    Yields:
+        BerichtStand: ergebnis ist None, zuletzt die Liste der Positionen
+    """
+    werte = []
+    gesamt = 0
+    for start, gesamt, seite in _seiten(historie, seitengroesse):
+        werte.extend(schluessel(eintrag) for eintrag in seite)
+        yield BerichtStand(len(werte), gesamt, None)
+
+    bloecke = []
+    for start in range(0, len(werte), blockgroesse):
+        block = range(start, min(start + blockgroesse, len(werte)))
+        bloecke.append(sorted(block, key=werte.__getitem__, reverse=absteigend))
+        yield BerichtStand(gesamt, gesamt, None)
+
+    reihenfolge = []
+    for position in heapq.merge(*bloecke, key=werte.__getitem__, reverse=absteigend):
+        reihenfolge.append(position)
+        if len(reihenfolge) % blockgroesse == 0:
+            yield BerichtStand(gesamt, gesamt, None)
+    yield BerichtStand(gesamt, gesamt, reihenfolge)
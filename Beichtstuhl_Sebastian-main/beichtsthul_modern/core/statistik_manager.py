@@ -1,16 +1,26 @@
-from tkinter import messagebox
+from .json_strom_leser import suenden_text
 
-"""Verwaltet und zeigt Statistiken an"""
+"""Verwaltet und zeigt Statistiken an
+
+tkinter wird erst beim Anzeigen importiert: die PyQt-Oberfläche nutzt
+ui.dialogs.statistik_dialog und lädt so kein zweites GUI-Toolkit.
+"""
 class StatistikManager:
 
 
     def __init__(self):
         pass
 
-    """Zeigt detaillierte Statistiken in einem Dialog"""
-    def zeige_statistiken(self, karma_schulden, beicht_historie, suenden_kategorien):
+    """Zeigt detaillierte Statistiken in einem Dialog
+
+    statistik ist eine StatistikMomentaufnahme; damit liest der Dialog nur
+    fertige Kennzahlen und keine Historie außer der letzten Beichte.
+    """
+    def zeige_statistiken(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        from tkinter import messagebox
 
-        if not beicht_historie:
+        anzahl_beichten = statistik.anzahl if statistik is not None else len(beicht_historie)
+        if not anzahl_beichten:
             messagebox.showinfo("Statistiken", "Noch keine Beichten vorhanden!")
             return
 
@@ -18,22 +28,37 @@ class StatistikManager:
 DEINE SÜNDEN-STATISTIKEN 
 
 Gesamt Karma-Schulden: {karma_schulden}
-Anzahl Beichten: {len(beicht_historie)}
-Durchschnitt pro Beichte: {karma_schulden // len(beicht_historie) if beicht_historie else 0}
-
-KATEGORIEN:
+Anzahl Beichten: {anzahl_beichten}
+Durchschnitt pro Beichte: {karma_schulden // anzahl_beichten}
 """
+        if statistik is not None:
+            stats_text += f"Kleinste / größte Schuld: {statistik.minimum} / {statistik.maximum}\n"
+            stats_text += f"Median / p95 / p99: {self._formatiere_quantile(statistik.quantile)}\n"
+            kategorien = {kategorie: werte.anzahl for kategorie, werte in statistik.kategorien.items()}
+        else:
+            kategorien = suenden_kategorien
 
-        for kategorie, anzahl in suenden_kategorien.items():
-            prozent = (anzahl / len(beicht_historie)) * 100
-            stats_text += f"• {kategorie.title()}: {anzahl}x ({prozent:.1f}%)\n"
+        stats_text += "\nKATEGORIEN:\n"
+        for kategorie, anzahl in kategorien.items():
+            prozent = (anzahl / anzahl_beichten) * 100
+            stats_text += f"• {kategorie.title()}: {anzahl}x ({prozent:.1f}%)"
+            if statistik is not None and kategorie in statistik.kategorie_quantile:
+                stats_text += f" – Median/p95/p99: {self._formatiere_quantile(statistik.kategorie_quantile[kategorie])}"
+            stats_text += "\n"
 
         if beicht_historie:
-            stats_text += f"\n LETZTE BEICHTE:\n\"{beicht_historie[-1]['sünde'][:50]}...\""
+            stats_text += f"\n LETZTE BEICHTE:\n\"{suenden_text(beicht_historie[-1])[:50]}...\""
 
         messagebox.showinfo("Deine Sünden-Statistiken", stats_text)
 
+    """Formatiert Quantile aus den Verteilungs-Skizzen (geschätzt, ±1%)"""
+    @staticmethod
+    def _formatiere_quantile(quantile):
+
+        return " / ".join("-" if wert is None else f"{wert:.0f}" for wert in quantile)
+
     """Fragt nach Bestätigung für Reset"""
     def bestätige_reset(self):
+        from tkinter import messagebox
 
         return messagebox.askyesno("Reset", "Wirklich alle Sünden vergeben? ")
\ No newline at end of file
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Text Column for Beichtsthul Modern
+Holds a whole column of confession texts for the batch scoring APIs of the
+AntwortGenerator and the KarmaRechner. The texts are lowercased once and
+joined into a single string so keyword searches run in C over the whole
+column; per-row flags are returned as NumPy arrays. Every hit still costs
+a Python step, so the first search over a column is only about 1.4x faster
+than the per-text loop. Hits are cached per word, so further passes over
+the same column (re-scoring, other keyword sets) skip the text entirely.
+"""
+
+import numpy as np
+
+
+# Trennzeichen zwischen den Zeilen; Keywords dürfen es nicht enthalten
+TRENNER = "\x00"
+# Ersetzt TRENNER innerhalb eines Textes (gleiche Länge, in keinem Keyword)
+ERSATZ = "\ufffd"
+
+
+class TextSpalte:
+    """Eine Spalte von Beichttexten, einmal normalisiert für Batch-Auswertungen"""
+
+    def __init__(self, texte):
+        """
+        Args:
+            texte: Sequenz oder Iterable von Beichttexten
+        """
+        self.texte = texte if isinstance(texte, list) else list(texte)
+        self.anzahl = len(self.texte)
+        self.laengen = np.fromiter(map(len, self.texte), dtype=np.int64, count=self.anzahl)
+
+        texte = self.texte
+        verbunden = TRENNER.join(texte)
+        if verbunden.count(TRENNER) != max(self.anzahl - 1, 0):
+            # Ein Text enthält selbst TRENNER; sonst flössen Treffer in die Nachbarzeile
+            texte = [text.replace(TRENNER, ERSATZ) for text in texte]
+            verbunden = TRENNER.join(texte)
+        klein = verbunden.lower()
+        if len(klein) == len(verbunden):
+            klein_laengen = self.laengen
+        else:
+            # Einige Zeichen ändern beim Kleinschreiben ihre Länge (z. B. "İ")
+            klein_liste = [text.lower() for text in texte]
+            klein = TRENNER.join(klein_liste)
+            klein_laengen = np.fromiter(map(len, klein_liste), dtype=np.int64, count=self.anzahl)
+        self.kleingeschrieben = klein
+
+        self._starts = np.zeros(self.anzahl, dtype=np.int64)
+        if self.anzahl > 1:
+            np.cumsum(klein_laengen[:-1] + 1, out=self._starts[1:])
+
+        self._caps = None
+        # wort -> Zeilenindizes; eine Spalte wird meist mehrfach ausgewertet
+        self._treffer = {}
+
+    def __len__(self):
+        return self.anzahl
+
+    def zeilen_mit(self, wort):
+        """
+        Findet alle Zeilen, deren kleingeschriebener Text das Wort enthält
+
+        Args:
+            wort: Kleingeschriebenes Suchwort ohne Trennzeichen
+
+        Returns:
+            np.ndarray: Zeilenindizes (aufsteigend, ohne Duplikate)
+        """
+        zeilen = self._treffer.get(wort)
+        if zeilen is None:
+            zeilen = self._treffer[wort] = self._suche(wort)
+        return zeilen
+
+    def _suche(self, wort):
+        klein = self.kleingeschrieben
+        positionen = []
+        finde = klein.find
+        pos = finde(wort)
+        while pos != -1:
+            positionen.append(pos)
+            # Rest der Zeile überspringen; ein Treffer pro Zeile genügt
+            ende = finde(TRENNER, pos + len(wort))
+            if ende == -1:
+                break
+            pos = finde(wort, ende + 1)
+        if not positionen:
+            return np.empty(0, dtype=np.int64)
+        return np.searchsorted(self._starts, np.asarray(positionen, dtype=np.int64), side="right") - 1
+
+    def maske_mit(self, wörter):
+        """
+        Args:
+            wörter: Kleingeschriebene Suchwörter
+
+        Returns:
+            np.ndarray: bool-Maske der Zeilen, die mindestens eines der Wörter enthalten
+        """
+        maske = np.zeros(self.anzahl, dtype=bool)
+        for wort in wörter:
+            if not wort:
+                # "" ist in jedem Text enthalten
+                maske[:] = True
+                break
+            maske[self.zeilen_mit(wort)] = True
+        return maske
+
+    def ist_caps(self):
+        """
+        Returns:
+            np.ndarray: bool-Maske text.isupper() pro Zeile
+        """
+        if self._caps is None:
+            self._caps = np.fromiter(map(str.isupper, self.texte), dtype=bool, count=self.anzahl)
+        return self._caps
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Karma Distribution Sketches for Beichtsthul Modern
+A mergeable streaming quantile sketch (logarithmic buckets with bounded
+relative error, as in DDSketch) and a fixed-bucket histogram. Both are
+updated in O(1) per confession, serialise to JSON and can be merged
+across kiosks by adding bucket counts.
+"""
+
+import math
+from bisect import bisect_right
+from collections import namedtuple
+
+
+# Standard-Grenzen des Karma-Histogramms (Bucket i = [grenzen[i-1], grenzen[i]))
+HISTOGRAMM_GRENZEN = (0, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100)
+
+# Kennzahlen für die Statistik-Anzeige (None ohne Werte)
+Quantile = namedtuple("Quantile", ["median", "p95", "p99"])
+
+
+class QuantilSkizze:
+    """Quantile mit relativem Fehler <= genauigkeit, unabhängig von der Anzahl Werte"""
+
+    def __init__(self, genauigkeit=0.01):
+        """
+        Args:
+            genauigkeit: Maximaler relativer Fehler der geschätzten Quantile
+        """
+        self.genauigkeit = genauigkeit
+        self._gamma = (1 + genauigkeit) / (1 - genauigkeit)
+        self._log_gamma = math.log(self._gamma)
+        self.anzahl = 0
+        self._null = 0
+        # bucket_index -> anzahl; negative Werte werden über ihren Betrag gezählt
+        self._positiv = {}
+        self._negativ = {}
+
+    def _index(self, betrag):
+        return math.ceil(math.log(betrag) / self._log_gamma)
+
+    def _wert(self, index):
+        """Repräsentant eines Buckets (Mitte im relativen Sinn)"""
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def hinzufuegen(self, wert, anzahl=1):
+        """Nimmt einen Wert auf"""
+        self.anzahl += anzahl
+        if wert > 0:
+            index = self._index(wert)
+            self._positiv[index] = self._positiv.get(index, 0) + anzahl
+        elif wert < 0:
+            index = self._index(-wert)
+            self._negativ[index] = self._negativ.get(index, 0) + anzahl
+        else:
+            self._null += anzahl
+
+    def quantil(self, q):
+        """
+        Schätzt das q-Quantil
+
+        Args:
+            q: Zwischen 0 und 1 (0.5 = Median, 0.95 = p95)
+
+        Returns:
+            float: Geschätzter Wert oder None ohne Werte
+        """
+        if not self.anzahl:
+            return None
+        rang = q * (self.anzahl - 1)
+        gezaehlt = 0
+        for index in sorted(self._negativ, reverse=True):
+            gezaehlt += self._negativ[index]
+            if gezaehlt > rang:
+                return -self._wert(index)
+        gezaehlt += self._null
+        if gezaehlt > rang:
+            return 0.0
+        for index in sorted(self._positiv):
+            gezaehlt += self._positiv[index]
+            if gezaehlt > rang:
+                return self._wert(index)
+        return self._wert(max(self._positiv))
+
+    def kennzahlen(self):
+        """
+        Returns:
+            Quantile: Median, p95 und p99
+        """
+        return Quantile(self.quantil(0.5), self.quantil(0.95), self.quantil(0.99))
+
+    def verschmelze(self, andere):
+        """
+        Addiert eine andere Skizze (z.B. von einem zweiten Kiosk)
+
+        Raises:
+            ValueError: Bei unterschiedlicher Genauigkeit
+        """
+        if andere.genauigkeit != self.genauigkeit:
+            raise ValueError("Skizzen mit unterschiedlicher Genauigkeit sind nicht verschmelzbar")
+        self.anzahl += andere.anzahl
+        self._null += andere._null
+        for eigene, fremde in ((self._positiv, andere._positiv), (self._negativ, andere._negativ)):
+            for index, anzahl in fremde.items():
+                eigene[index] = eigene.get(index, 0) + anzahl
+
+    def kopie(self):
+        """Unabhängige Kopie"""
+        skizze = type(self)(self.genauigkeit)
+        skizze.anzahl = self.anzahl
+        skizze._null = self._null
+        skizze._positiv = dict(self._positiv)
+        skizze._negativ = dict(self._negativ)
+        return skizze
+
+    def als_dict(self):
+        """JSON-serialisierbarer Zustand"""
+        return {
+            "genauigkeit": self.genauigkeit,
+            "null": self._null,
+            "positiv": dict(self._positiv),
+            "negativ": dict(self._negativ)
+        }
+
+    @classmethod
+    def aus_dict(cls, daten):
+        """Stellt eine Skizze aus als_dict() wieder her"""
+        skizze = cls(daten.get("genauigkeit", 0.01))
+        skizze._null = daten.get("null", 0)
+        skizze._positiv = {int(index): anzahl for index, anzahl in daten.get("positiv", {}).items()}
+        skizze._negativ = {int(index): anzahl for index, anzahl in daten.get("negativ", {}).items()}
+        skizze.anzahl = skizze._null + sum(skizze._positiv.values()) + sum(skizze._negativ.values())
+        return skizze
+
+
+class Histogramm:
+    """Histogramm mit festen Bucket-Grenzen"""
+
+    def __init__(self, grenzen=HISTOGRAMM_GRENZEN):
+        """
+        Args:
+            grenzen: Aufsteigende Bucket-Grenzen; es gibt len(grenzen) + 1 Buckets
+        """
+        self.grenzen = tuple(grenzen)
+        self.anzahlen = [0] * (len(self.grenzen) + 1)
+
+    def hinzufuegen(self, wert, anzahl=1):
+        """Zählt einen Wert in seinen Bucket"""
+        self.anzahlen[bisect_right(self.grenzen, wert)] += anzahl
+
+    def buckets(self):
+        """
+        Returns:
+            list: (untergrenze, obergrenze, anzahl); offene Enden sind None
+        """
+        unten = (None,) + self.grenzen
+        oben = self.grenzen + (None,)
+        return list(zip(unten, oben, self.anzahlen))
+
+    def verschmelze(self, anderes):
+        """
+        Addiert ein anderes Histogramm
+
+        Raises:
+            ValueError: Bei unterschiedlichen Grenzen
+        """
+        if anderes.grenzen != self.grenzen:
+            raise ValueError("Histogramme mit unterschiedlichen Grenzen sind nicht verschmelzbar")
+        self.anzahlen = [a + b for a, b in zip(self.anzahlen, anderes.anzahlen)]
+
+    def kopie(self):
+        """Unabhängige Kopie"""
+        histogramm = type(self)(self.grenzen)
+        histogramm.anzahlen = list(self.anzahlen)
+        return histogramm
+
+    def als_dict(self):
+        """JSON-serialisierbarer Zustand"""
+        return {"grenzen": list(self.grenzen), "anzahlen": list(self.anzahlen)}
+
+    @classmethod
+    def aus_dict(cls, daten):
+        """Stellt ein Histogramm aus als_dict() wieder her"""
+        histogramm = cls(daten.get("grenzen", HISTOGRAMM_GRENZEN))
+        anzahlen = daten.get("anzahlen")
+        if anzahlen and len(anzahlen) == len(histogramm.anzahlen):
+            histogramm.anzahlen = list(anzahlen)
+        return histogramm
+
+
+class KarmaVerteilung:
+    """Quantil-Skizze und Histogramm, die gemeinsam fortgeschrieben werden"""
+
+    def __init__(self, skizze=None, histogramm=None):
+        self.skizze = skizze if skizze is not None else QuantilSkizze()
+        self.histogramm = histogramm if histogramm is not None else Histogramm()
+
+    def erfasse(self, karma):
+        """Nimmt die Karma-Schuld einer Beichte auf"""
+        self.skizze.hinzufuegen(karma)
+        self.histogramm.hinzufuegen(karma)
+
+    def kennzahlen(self):
+        """
+        Returns:
+            Quantile: Median, p95 und p99
+        """
+        return self.skizze.kennzahlen()
+
+    def verschmelze(self, andere):
+        """Addiert eine andere Verteilung (z.B. von einem zweiten Kiosk)"""
+        self.skizze.verschmelze(andere.skizze)
+        self.histogramm.verschmelze(andere.histogramm)
+
+    def kopie(self):
+        """Unabhängige Kopie"""
+        return type(self)(self.skizze.kopie(), self.histogramm.kopie())
+
+    def als_dict(self):
+        """JSON-serialisierbarer Zustand"""
+        return {"skizze": self.skizze.als_dict(), "histogramm": self.histogramm.als_dict()}
+
+    @classmethod
+    def aus_dict(cls, daten):
+        """Stellt eine Verteilung aus als_dict() wieder her"""
+        return cls(QuantilSkizze.aus_dict(daten.get("skizze", {})),
+                   Histogramm.aus_dict(daten.get("histogramm", {})))
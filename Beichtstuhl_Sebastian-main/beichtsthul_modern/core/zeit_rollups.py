@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Time-bucketed Rollups for Beichtsthul Modern
+Pre-aggregated per-minute, per-hour and per-day buckets of confession
+counts and karma (total and per category). Fine buckets are dropped once
+they age out, coarse ones keep the data, so time-range queries cost a
+bounded number of bucket lookups instead of a scan of the history.
+"""
+
+from collections import namedtuple
+
+
+KategorieStatistik = namedtuple("KategorieStatistik", ["anzahl", "karma"])
+
+# Ergebnis einer Zeitraum-Abfrage
+RollupErgebnis = namedtuple("RollupErgebnis", [
+    "anzahl",       # Anzahl Beichten im Zeitraum
+    "karma",        # Summe der Karma-Schulden im Zeitraum
+    "kategorien",   # dict: kategorie -> KategorieStatistik
+])
+
+MINUTE = 60
+STUNDE = 60 * MINUTE
+TAG = 24 * STUNDE
+
+_LEER = (0, 0, {})
+
+
+class ZeitRollups:
+    """Minuten-, Stunden- und Tages-Buckets mit Ausdünnung alter Buckets"""
+
+    def __init__(self, minuten_aufbewahrung=2 * TAG, stunden_aufbewahrung=90 * TAG):
+        """
+        Args:
+            minuten_aufbewahrung: Sekunden, die Minuten-Buckets aufbewahrt werden
+            stunden_aufbewahrung: Sekunden, die Stunden-Buckets aufbewahrt werden
+                (Tages-Buckets bleiben immer erhalten)
+        """
+        self.aufbewahrung = {MINUTE: minuten_aufbewahrung, STUNDE: stunden_aufbewahrung, TAG: None}
+        # groesse -> {bucket_start: (anzahl, karma, {kategorie: (anzahl, karma)})}
+        # Buckets werden bei Änderung ersetzt, nie verändert: als_dict() kopiert nur flach
+        self._buckets = {MINUTE: {}, STUNDE: {}, TAG: {}}
+        # Auflösungen, in denen ein Bucket außer der Zeitreihenfolge entstanden ist
+        self._unsortiert = set()
+        self._neueste = None
+
+    def erfasse(self, zeit, kategorie, karma):
+        """
+        Bucht eine Beichte in alle drei Auflösungen
+
+        Args:
+            zeit: Unix-Zeitstempel der Beichte
+            kategorie: Sünden-Kategorie
+            karma: Karma-Schuld
+        """
+        zeit = int(zeit)
+        for groesse, buckets in self._buckets.items():
+            start = zeit - zeit % groesse
+            if start not in buckets and buckets and start < next(reversed(buckets)):
+                # Nachgetragene ältere Beichte: vor dem nächsten Ausdünnen sortieren
+                self._unsortiert.add(groesse)
+            anzahl, summe, kategorien = buckets.get(start, _LEER)
+            kategorien = dict(kategorien)
+            kategorie_anzahl, kategorie_karma = kategorien.get(kategorie, (0, 0))
+            kategorien[kategorie] = (kategorie_anzahl + 1, kategorie_karma + karma)
+            buckets[start] = (anzahl + 1, summe + karma, kategorien)
+        if self._neueste is None or zeit > self._neueste:
+            self._neueste = zeit
+            self._duenne_aus()
+
+    def _duenne_aus(self):
+        """Verwirft feine Buckets, die älter als ihre Aufbewahrungszeit sind"""
+        for groesse, aufbewahrung in self.aufbewahrung.items():
+            if aufbewahrung is None:
+                continue
+            buckets = self._buckets[groesse]
+            if groesse in self._unsortiert:
+                buckets = self._buckets[groesse] = dict(sorted(buckets.items()))
+                self._unsortiert.discard(groesse)
+            grenze = self._neueste - aufbewahrung
+            # Buckets stehen in Zeitreihenfolge; die ältesten stehen vorn
+            while buckets:
+                start = next(iter(buckets))
+                if start >= grenze:
+                    break
+                del buckets[start]
+
+    def _zerlege(self, von, bis):
+        """
+        Zerlegt [von, bis) in möglichst grobe vorhandene Buckets
+
+        Ein Bucket zählt, wenn sein Beginn im Zeitraum liegt. Wo feine
+        Buckets schon ausgedünnt sind, zählt stattdessen der gröbere Bucket,
+        in dem sie liegen, ganz: Alte Zeiträume werden auf Stunden- bzw.
+        Tagesgrenzen nach außen gerundet, es gehen keine Beichten verloren.
+
+        Yields:
+            tuple: (anzahl, karma, kategorien) je Bucket
+        """
+        zeit = -(-int(von) // MINUTE) * MINUTE
+        ende = -(-int(bis) // MINUTE) * MINUTE
+        neueste = self._neueste if self._neueste is not None else ende
+        while zeit < ende:
+            for groesse in (TAG, STUNDE, MINUTE):
+                if zeit % groesse == 0 and zeit + groesse <= ende:
+                    break
+            start = zeit
+            while self._ausgeduennt(groesse, start, neueste):
+                # Der umfassende gröbere Bucket; ältere feine Buckets fehlen
+                # ebenfalls, im Zeitraum wurde also noch nichts davon gezählt
+                groesse = STUNDE if groesse == MINUTE else TAG
+                start = zeit - zeit % groesse
+            bucket = self._buckets[groesse].get(start)
+            if bucket is not None:
+                yield bucket
+            zeit = start + groesse
+
+    def _ausgeduennt(self, groesse, start, neueste):
+        """True, wenn der Bucket bei start in dieser Auflösung schon verworfen ist"""
+        aufbewahrung = self.aufbewahrung[groesse]
+        return aufbewahrung is not None and start < neueste - aufbewahrung
+
+    def abfrage(self, von, bis, kategorie=None):
+        """
+        Summen im Zeitraum [von, bis), z.B. "Karma dieser Woche pro Kategorie"
+
+        Für ausgedünnte (alte) Zeiträume wird auf ganze Stunden bzw. Tage
+        nach außen gerundet.
+
+        Args:
+            von: Unix-Zeitstempel (inklusive)
+            bis: Unix-Zeitstempel (exklusive)
+            kategorie: Optional nur diese Kategorie zählen
+
+        Returns:
+            RollupErgebnis
+        """
+        anzahl = karma = 0
+        kategorien = {}
+        for bucket in self._zerlege(von, bis):
+            for name, werte in bucket[2].items():
+                if kategorie is not None and name != kategorie:
+                    continue
+                summe = kategorien.setdefault(name, [0, 0])
+                summe[0] += werte[0]
+                summe[1] += werte[1]
+                anzahl += werte[0]
+                karma += werte[1]
+        return RollupErgebnis(anzahl, karma, {
+            name: KategorieStatistik(*werte) for name, werte in kategorien.items()
+        })
+
+    def verlauf(self, von, bis, aufloesung=STUNDE):
+        """
+        Zeitreihe für Diagramme, z.B. "Beichten pro Stunde heute"
+
+        Args:
+            von: Unix-Zeitstempel (inklusive)
+            bis: Unix-Zeitstempel (exklusive)
+            aufloesung: MINUTE, STUNDE oder TAG
+
+        Returns:
+            list: (bucket_start, anzahl, karma) für jeden Bucket im Zeitraum
+        """
+        buckets = self._buckets[aufloesung]
+        start = int(von) - int(von) % aufloesung
+        verlauf = []
+        for bucket_start in range(start, int(bis), aufloesung):
+            bucket = buckets.get(bucket_start)
+            verlauf.append((bucket_start, bucket[0], bucket[1]) if bucket else (bucket_start, 0, 0))
+        return verlauf
+
+    def verschmelze(self, andere):
+        """Addiert die Buckets anderer Rollups (z.B. von einem zweiten Kiosk)"""
+        for groesse, buckets in self._buckets.items():
+            for start, (anzahl, karma, kategorien) in andere._buckets[groesse].items():
+                eigene_anzahl, eigenes_karma, eigene_kategorien = buckets.get(start, _LEER)
+                eigene_kategorien = dict(eigene_kategorien)
+                for kategorie, (k_anzahl, k_karma) in kategorien.items():
+                    alt_anzahl, alt_karma = eigene_kategorien.get(kategorie, (0, 0))
+                    eigene_kategorien[kategorie] = (alt_anzahl + k_anzahl, alt_karma + k_karma)
+                buckets[start] = (eigene_anzahl + anzahl, eigenes_karma + karma, eigene_kategorien)
+            # Buckets müssen für _duenne_aus in Zeitreihenfolge stehen
+            self._buckets[groesse] = dict(sorted(buckets.items()))
+        if andere._neueste is not None and (self._neueste is None or andere._neueste > self._neueste):
+            self._neueste = andere._neueste
+        if self._neueste is not None:
+            self._duenne_aus()
+
+    def kopie(self):
+        """Unabhängige Kopie (flach; Buckets sind unveränderlich)"""
+        rollups = type(self)()
+        rollups.aufbewahrung = dict(self.aufbewahrung)
+        rollups._buckets = {groesse: dict(buckets) for groesse, buckets in self._buckets.items()}
+        rollups._unsortiert = set(self._unsortiert)
+        rollups._neueste = self._neueste
+        return rollups
+
+    def als_dict(self):
+        """JSON-serialisierbarer Zustand (flache Kopie; Buckets sind unveränderlich)"""
+        daten = {str(groesse): dict(buckets) for groesse, buckets in self._buckets.items()}
+        daten["neueste"] = self._neueste
+        return daten
+
+    @classmethod
+    def aus_dict(cls, daten, **optionen):
+        """Stellt Rollups aus als_dict() wieder her"""
+        rollups = cls(**optionen)
+        for groesse in rollups._buckets:
+            gespeichert = daten.get(str(groesse), {})
+            rollups._buckets[groesse] = {
+                int(start): (bucket[0], bucket[1], {k: tuple(w) for k, w in bucket[2].items()})
+                for start, bucket in sorted(gespeichert.items(), key=lambda paar: int(paar[0]))
+            }
+        rollups._neueste = daten.get("neueste")
+        return rollups
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared Qt application for the unit tests
+Qt allows one application object per process. All tests that need Qt get
+the same offscreen QApplication from qt_app(), so widget, pixmap and event
+loop tests can run in any order in one process (tests/run_tests.py).
+"""
+
+_app = None
+
+
+def qt_app():
+    """
+    Get the QApplication of the test run, creating it on first use
+
+    Returns:
+        QApplication: Offscreen application, kept alive until the process exits
+    """
+    global _app
+    from PyQt6.QtWidgets import QApplication
+
+    if _app is None:
+        _app = QApplication.instance()
+        if _app is None:
+            _app = QApplication(["test", "-platform", "offscreen"])
+        elif not isinstance(_app, QApplication):
+            raise RuntimeError("Tests must create the Qt application through tests.qt_app.qt_app()")
+    return _app
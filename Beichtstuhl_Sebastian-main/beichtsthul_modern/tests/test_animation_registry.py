@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the parsed animation registry
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from PyQt6.QtCore import QCoreApplication
+    from tests.qt_app import qt_app
+    from utils.animation_registry import AnimationRegistry
+except ImportError:
+    AnimationRegistry = None
+
+
+def _animation(frames):
+    """Minimal animation with one static circle"""
+    return {
+        "v": "5.7.0", "fr": 30, "ip": 0, "op": frames, "w": 100, "h": 100,
+        "layers": [{
+            "ty": 4, "ind": 1, "ip": 0, "op": frames, "ks": {},
+            "shapes": [
+                {"ty": "el", "p": {"a": 0, "k": [50, 50]}, "s": {"a": 0, "k": [20, 20]}},
+                {"ty": "fl", "c": {"a": 0, "k": [1, 0, 0, 1]}, "o": {"a": 0, "k": 100}},
+            ],
+        }],
+    }
+
+
+@unittest.skipUnless(AnimationRegistry, "PyQt6 or lottie not installed")
+class TestAnimationRegistry(unittest.TestCase):
+    """Test cases for AnimationRegistry"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.registry = AnimationRegistry()
+        self.idle = self._write("idle.json", 30)
+        self.angry = self._write("angry.json", 60)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, frames, mtime=None):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "w") as f:
+            json.dump(_animation(frames), f)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_parses_once(self):
+        """Test that repeated lookups share one parsed animation"""
+        first = self.registry.get(self.idle)
+        second = self.registry.get(os.path.join(self.test_dir, ".", "idle.json"))
+        self.assertIs(first, second)
+        self.assertEqual(self.registry.parses, 1)
+        self.assertEqual(first.renderer.frame_count, 30)
+
+    def test_changed_file_is_parsed_again(self):
+        """Test that a new modification time invalidates the entry"""
+        first = self.registry.get(self.idle)
+        self._write("idle.json", 45, mtime=os.stat(self.idle).st_mtime + 10)
+        second = self.registry.get(self.idle)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.renderer.frame_count, 45)
+        self.assertEqual(self.registry.parses, 2)
+
+    def test_missing_file(self):
+        """Test that a missing file raises and is not cached"""
+        missing = os.path.join(self.test_dir, "missing.json")
+        with self.assertRaises(OSError):
+            self.registry.get(missing)
+        self.assertFalse(self.registry.is_loaded(missing))
+
+    def test_warm_in_idle_time(self):
+        """Test that warming parses files from the event loop and skips broken ones"""
+        self.registry.warm([self.idle, os.path.join(self.test_dir, "missing.json"), self.angry])
+        self.assertFalse(self.registry.is_loaded(self.idle))
+        for _ in range(10):
+            QCoreApplication.processEvents()
+        self.assertTrue(self.registry.is_loaded(self.idle))
+        self.assertTrue(self.registry.is_loaded(self.angry))
+        self.assertEqual(self.registry.parses, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
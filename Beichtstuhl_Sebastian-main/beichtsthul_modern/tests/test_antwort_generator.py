@@ -8,6 +8,12 @@ Unit tests for AntwortGenerator
 import sys
 import os
 import unittest
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # Add the project root to sys.path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -144,6 +150,42 @@ class TestAntwortGenerator(unittest.TestCase):
         self.assertEqual(self.antwort_generator.emotionen_mapping["neid"], "schockiert")
         self.assertEqual(self.antwort_generator.emotionen_mapping["standard"], "neutral")
 
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_kategorisiere_batch_matches_scalar(self):
+        """Test that batch categorization matches the scalar path exactly"""
+        rng = random.Random(7)
+        woerter = [w for liste in self.antwort_generator.keywords.values() for w in liste]
+        woerter += ["ich", "habe", "heute", "İch", "lü", ""]
+        texte = [
+            " ".join(rng.choice(woerter) for _ in range(rng.randint(0, 4))).upper()
+            if rng.random() < 0.2 else
+            " ".join(rng.choice(woerter) for _ in range(rng.randint(0, 4)))
+            for _ in range(400)
+        ]
+        erwartet = [self.antwort_generator.kategorisiere_suende(t) for t in texte]
+        kategorie_liste = self.antwort_generator.kategorie_liste
+
+        codes = self.antwort_generator.kategorisiere_batch(texte)
+        self.assertEqual([kategorie_liste[c] for c in codes], erwartet)
+
+        # Pfad für große Keyword-Packs
+        self.antwort_generator.BATCH_SPALTEN_LIMIT = 0
+        codes = self.antwort_generator.kategorisiere_batch(iter(texte))
+        self.assertEqual([kategorie_liste[c] for c in codes], erwartet)
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_batch_texts_containing_separator(self):
+        """Test that a NUL inside a confession does not split it into two rows"""
+        from core.text_spalte import TextSpalte
+
+        texte = ["lüge\x00lüge", "nichts", "\x00", "x\x00lüge"]
+        spalte = TextSpalte(texte)
+        self.assertEqual(spalte.zeilen_mit("lüge").tolist(), [0, 3])
+        self.assertEqual(spalte.maske_mit(["nichts"]).tolist(), [False, True, False, False])
+        erwartet = [self.antwort_generator.kategorisiere_suende(t) for t in texte]
+        codes = self.antwort_generator.kategorisiere_batch(texte)
+        self.assertEqual([self.antwort_generator.kategorie_liste[c] for c in codes], erwartet)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for BeichtAnalysator
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.antwort_generator import AntwortGenerator
+from core.karma_rechner import KarmaRechner
+from core.beicht_analyse import BeichtAnalysator
+
+
+class TestBeichtAnalysator(unittest.TestCase):
+    """Test cases for BeichtAnalysator"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.antwort_generator = AntwortGenerator()
+        self.karma_rechner = KarmaRechner()
+        self.analysator = BeichtAnalysator(self.antwort_generator, self.karma_rechner)
+
+    def test_analyse_fields(self):
+        """Test that one analysis collects all hits"""
+        analyse = self.analysator.analysiere("Ich habe meine Mama betrogen und Pizza gegessen")
+        self.assertEqual(analyse.kategorie, "lügen")
+        self.assertIn("essen", {t.kategorie for t in analyse.kategorie_treffer})
+        self.assertEqual(analyse.easter_egg_treffer, ("mutter",))
+        self.assertEqual(analyse.straf_treffer, ("betrogen",))
+        self.assertEqual(analyse.laenge, 47)
+        self.assertFalse(analyse.ist_caps)
+
+    def test_analyse_is_immutable(self):
+        """Test that the analysis result cannot be modified"""
+        analyse = self.analysator.analysiere("Ich war faul")
+        with self.assertRaises(AttributeError):
+            analyse.kategorie = "neid"
+
+    def test_easter_egg_priority(self):
+        """Test that animals win over mothers like in the text-based check"""
+        analyse = self.analysator.analysiere("Mama hat den Hund gefüttert")
+        self.assertEqual(analyse.easter_egg_treffer, ("tiere", "mutter"))
+
+    def test_rebuilt_with_keyword_matcher(self):
+        """Test that changed keywords reach the analysis after baue_keyword_matcher()"""
+        self.antwort_generator.keywords["neid"].append("mopsfidel")
+        self.antwort_generator.keywords["zorn"] = ["wütend"]
+        self.antwort_generator.baue_keyword_matcher()
+        self.assertEqual(self.analysator.analysiere("Ich bin mopsfidel").kategorie, "neid")
+        self.assertEqual(self.analysator.analysiere("Ich war wütend").kategorie, "zorn")
+        self.assertEqual(self.antwort_generator.kategorisiere_suende("Ich war wütend"), "zorn")
+
+    def test_components_match_text_path(self):
+        """Test that consuming the analysis gives the same results as the text path"""
+        texte = [
+            "Ich habe gelogen",
+            "ICH HABE GELD GESTOHLEN UND WAR FAUL",
+            "Meine Katze hat Schokolade gegessen",
+            "Ich habe meiner Mutter absichtlich nichts gesagt",
+            "x" * 150,
+            "Ich habe gesündigt " * 15,
+            "",
+        ]
+        for text in texte:
+            analyse = self.analysator.analysiere(text)
+            kategorie = self.antwort_generator.kategorisiere_suende(text)
+            self.assertEqual(self.antwort_generator.kategorisiere_suende(analyse), kategorie)
+            self.assertEqual(
+                self.antwort_generator.prüfe_easter_eggs(analyse),
+                self.antwort_generator.prüfe_easter_eggs(text)
+            )
+            self.assertEqual(
+                self.karma_rechner.berechne_karma_schulden(kategorie, analyse),
+                self.karma_rechner.berechne_karma_schulden(kategorie, text)
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
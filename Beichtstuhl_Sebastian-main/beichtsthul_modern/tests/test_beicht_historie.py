@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the lazy BeichtHistorie returned by DateiManager.lade_historie
+"""
+
+import sys
+import os
+import unittest
+import json
+import tempfile
+import shutil
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.datei_manager import DateiManager
+from core.beicht_historie import BeichtHistorie
+
+
+def eintrag(i):
+    return {"suende": f"Sünde {i}", "kategorie": "standard", "karma": 7}
+
+
+class TestBeichtHistorie(unittest.TestCase):
+    """Test cases for lazy, paged history loading"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_data_file = os.path.join(self.test_dir, "beichtstuh_daten_.json")
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def fuelle(self, anzahl, modus="journal", dateiname=None, kompaktierung_ab=1000):
+        """Write a history of the given length and return a fresh manager"""
+        dateiname = dateiname or self.test_data_file
+        manager = DateiManager(dateiname, modus=modus, kompaktierung_ab=kompaktierung_ab)
+        historie = [eintrag(i) for i in range(anzahl)]
+        manager.speichere_daten(7 * anzahl, historie, {"standard": anzahl})
+        return DateiManager(dateiname, modus=modus, kompaktierung_ab=kompaktierung_ab)
+
+    def test_summary_without_entries(self):
+        """Test that lade_historie returns totals and length without reading entries"""
+        manager = self.fuelle(50)
+        karma, historie, kategorien = manager.lade_historie(fenster=10)
+        self.assertIsInstance(historie, BeichtHistorie)
+        self.assertEqual((karma, len(historie), kategorien["standard"]), (350, 50, 50))
+        self.assertEqual(historie._fenster, [])
+
+    def test_paged_access(self):
+        """Test indexing, slicing, paging and iteration over the snapshot"""
+        _, historie, _ = self.fuelle(50).lade_historie()
+        self.assertEqual(historie[0]["suende"], "Sünde 0")
+        self.assertEqual(historie[-1]["suende"], "Sünde 49")
+        self.assertEqual([e["suende"] for e in historie[10:13]], ["Sünde 10", "Sünde 11", "Sünde 12"])
+        self.assertEqual([len(seite) for seite in historie.seiten(20)], [20, 20, 10])
+        self.assertEqual([e["suende"] for e in historie], [f"Sünde {i}" for i in range(50)])
+        self.assertEqual(len(historie.letzte(5)), 5)
+        with self.assertRaises(IndexError):
+            historie[50]
+
+    def test_window_stays_bounded(self):
+        """Test that persisted entries leave the window but remain readable"""
+        manager = self.fuelle(0)
+        karma, historie, kategorien = manager.lade_historie(fenster=5)
+        for i in range(40):
+            historie.append(eintrag(i))
+            manager.speichere_daten(7 * (i + 1), historie.ansicht(len(historie)), {"standard": i + 1})
+            historie.markiere_persistiert(len(historie))
+        self.assertLessEqual(len(historie._fenster), 10)
+        self.assertEqual([e["suende"] for e in historie], [f"Sünde {i}" for i in range(40)])
+
+    def test_unsaved_entries_stay_in_window(self):
+        """Test that entries not yet written are never dropped from memory"""
+        _, historie, _ = self.fuelle(0).lade_historie(fenster=2)
+        for i in range(20):
+            historie.append(eintrag(i))
+        self.assertEqual(len(historie._fenster), 20)
+        self.assertEqual(historie[3]["suende"], "Sünde 3")
+
+    def test_compaction_streams_lazy_history(self):
+        """Test that compaction rewrites the snapshot from a lazy history"""
+        manager = self.fuelle(30, kompaktierung_ab=5)
+        karma, historie, kategorien = manager.lade_historie(fenster=3)
+        for i in range(30, 40):
+            historie.append(eintrag(i))
+            kategorien["standard"] += 1
+            manager.speichere_daten(7 * (i + 1), historie.ansicht(len(historie)), kategorien)
+
+        with open(self.test_data_file, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["beicht_historie"]), 40)
+        karma, historie, _ = DateiManager(self.test_data_file, modus="journal").lade_historie()
+        self.assertEqual((karma, len(historie)), (280, 40))
+        self.assertEqual(historie[39]["suende"], "Sünde 39")
+
+    def test_legacy_snapshot_is_rewritten(self):
+        """Test that an indented legacy file is converted once to the line format"""
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "karma_schulden": 14,
+                "beicht_historie": [eintrag(0), eintrag(1)],
+                "suenden_kategorien": {"standard": 2}
+            }, f, indent=2)
+
+        karma, historie, _ = DateiManager(self.test_data_file, modus="journal").lade_historie()
+        self.assertEqual((karma, len(historie), historie[1]["suende"]), (14, 2, "Sünde 1"))
+        with open(self.test_data_file, encoding="utf-8") as f:
+            self.assertTrue(f.readline().rstrip("\n").endswith('"beicht_historie":['))
+
+    def test_legacy_snapshot_keeps_journal(self):
+        """Test that streaming migration keeps journal entries written after the snapshot"""
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "karma_schulden": 7,
+                "beicht_historie": [{"sünde": "alt", "kategorie": "standard", "karma": 7}],
+                "suenden_kategorien": {"standard": 1}
+            }, f, indent=2)
+        manager = DateiManager(self.test_data_file, modus="journal")
+        manager.speicher._persistiert = 1
+        manager.speicher._letzte_summen = (7, {"standard": 1})
+        manager.speichere_daten(14, [None, eintrag(1)], {"standard": 2})
+
+        karma, historie, kategorien = DateiManager(self.test_data_file, modus="journal").lade_historie()
+        self.assertEqual((karma, len(historie), kategorien["standard"]), (14, 2, 2))
+        self.assertEqual([e["suende"] for e in historie], ["alt", "Sünde 1"])
+
+    def test_sqlite_mode(self):
+        """Test that the SQLite backend serves pages via LIMIT/OFFSET"""
+        dateiname = os.path.join(self.test_dir, "beichten.db")
+        manager = self.fuelle(25, modus="sqlite", dateiname=dateiname)
+        karma, historie, kategorien = manager.lade_historie()
+        self.assertEqual((karma, len(historie), kategorien["standard"]), (175, 25, 25))
+        self.assertEqual([e["suende"] for e in historie[20:]], [f"Sünde {i}" for i in range(20, 25)])
+        manager.speicher.schliesse()
+
+    def test_json_mode_returns_list(self):
+        """Test that the legacy JSON mode keeps returning a plain list"""
+        manager = self.fuelle(3, modus="json")
+        _, historie, _ = manager.lade_historie()
+        self.assertEqual(len(historie), 3)
+        self.assertEqual(manager.neue_historie(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
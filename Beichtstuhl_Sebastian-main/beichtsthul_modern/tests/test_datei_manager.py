@@ -156,6 +156,27 @@ class TestDateiManager(unittest.TestCase):
         self.assertEqual(saved_data["karma_schulden"], new_karma_schulden)
         self.assertNotEqual(saved_data["karma_schulden"], initial_data["karma_schulden"])
 
+    def test_lade_daten_invalid_json_is_preserved(self):
+        """Test that an unreadable data file is kept aside instead of being overwritten"""
+        with open(self.test_data_file, 'w', encoding='utf-8') as f:
+            f.write('{"karma_schulden": 42, "beicht_his')
+
+        self.datei_manager.lade_daten()
+        self.datei_manager.speichere_daten(0, [], {})
+
+        with open(self.test_data_file + ".defekt", 'r', encoding='utf-8') as f:
+            self.assertIn('"karma_schulden": 42', f.read())
+
+    def test_speichere_daten_is_atomic(self):
+        """Test that a failing save leaves the previous file intact"""
+        self.datei_manager.speichere_daten(42, [], {})
+        # Objects that cannot be serialized make the save fail midway
+        self.assertFalse(self.datei_manager.speichere_daten(1, [object()], {}))
+
+        karma_schulden, _, _ = self.datei_manager.lade_daten()
+        self.assertEqual(karma_schulden, 42)
+        self.assertEqual(os.listdir(self.test_dir), ["beichtstuh_daten_.json"])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the rendered frame cache
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from utils.frame_cache import FrameCache
+except ImportError:
+    FrameCache = None
+
+
+@unittest.skipUnless(FrameCache, "PyQt6 not installed")
+class TestFrameCache(unittest.TestCase):
+    """Test cases for FrameCache"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        # Room for exactly four 10x10 frames at DPR 1
+        self.cache = FrameCache(budget_bytes=4 * 10 * 10 * 4)
+        self.idle = FrameCache.key("idle.json", 10, 10, 1.0)
+        self.angry = FrameCache.key("angry.json", 10, 10, 1.0)
+
+    def test_hits_and_misses(self):
+        """Test that lookups are counted"""
+        self.assertIsNone(self.cache.get(self.idle, 0))
+        self.cache.put(self.idle, 0, "frame0")
+        self.assertEqual(self.cache.get(self.idle, 0), "frame0")
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.bytes_used, stats.entries), (1, 1, 400, 1))
+
+    def test_lru_eviction_under_budget(self):
+        """Test that the least recently used animation is evicted first"""
+        self.cache.put(self.idle, 0, "i0")
+        self.cache.put(self.angry, 0, "a0")
+        self.cache.put(self.idle, 1, "i1")
+        self.cache.get(self.angry, 0)
+        self.cache.put(self.angry, 1, "a1")
+        self.cache.put(self.angry, 2, "a2")
+        self.assertFalse(self.cache.contains(self.idle, 0))
+        self.assertTrue(self.cache.contains(self.angry, 2))
+        stats = self.cache.stats()
+        self.assertEqual((stats.evictions, stats.bytes_used), (1, 1200))
+        self.assertLessEqual(stats.bytes_used, stats.budget)
+
+    def test_animation_larger_than_budget(self):
+        """Test that an animation never evicts its own frames"""
+        for frame in range(4):
+            self.assertTrue(self.cache.put(self.idle, frame, frame))
+        self.assertFalse(self.cache.put(self.idle, 4, 4))
+        self.assertEqual(self.cache.frame_count(self.idle), 4)
+
+    def test_default_budget_holds_a_hidpi_loop(self):
+        """Test that a 90-frame 280x280 animation at DPR 2 fits the default budget"""
+        cache = FrameCache()
+        self.assertTrue(cache.fits(280, 280, 2.0, 90))
+        key = FrameCache.key("monk_idle.json", 280, 280, 2.0)
+        self.assertTrue(all(cache.put(key, frame, frame) for frame in range(90)))
+        self.assertFalse(self.cache.fits(10, 10, 2.0, 4))
+        self.assertTrue(self.cache.fits(10, 10, 1.0, 4))
+
+    def test_keys_include_size_and_dpr(self):
+        """Test that size and device pixel ratio separate cache entries"""
+        self.assertNotEqual(FrameCache.key("idle.json", 10, 10, 1.0), FrameCache.key("idle.json", 10, 10, 2.0))
+        self.assertEqual(FrameCache.frame_bytes(10, 10, 2.0), 1600)
+        self.cache.put(self.idle, 0, "i0")
+        self.cache.discard("idle.json")
+        self.assertEqual(self.cache.stats().bytes_used, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
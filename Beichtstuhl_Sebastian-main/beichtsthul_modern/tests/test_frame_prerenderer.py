@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for off-thread frame pre-rendering
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from PyQt6.QtCore import QCoreApplication, QElapsedTimer
+    from tests.qt_app import qt_app
+    from utils.frame_cache import FrameCache
+    from utils.frame_prerenderer import FramePrerenderer
+    from utils.lottie_renderer import LottieRenderer
+except ImportError:
+    FramePrerenderer = None
+
+
+def _animation(frames=30):
+    """Small animation: one circle moving from left to right"""
+    return {
+        "v": "5.7.0", "fr": 30, "ip": 0, "op": frames, "w": 100, "h": 100,
+        "layers": [{
+            "ty": 4, "ind": 1, "ip": 0, "op": frames,
+            "ks": {"p": {"a": 1, "k": [
+                {"t": 0, "s": [20, 50], "e": [80, 50]},
+                {"t": frames - 1, "s": [80, 50]},
+            ]}},
+            "shapes": [
+                {"ty": "el", "p": {"a": 0, "k": [0, 0]}, "s": {"a": 0, "k": [20, 20]}},
+                {"ty": "fl", "c": {"a": 0, "k": [1, 0, 0, 1]}, "o": {"a": 0, "k": 100}},
+            ],
+        }],
+    }
+
+
+@unittest.skipUnless(FramePrerenderer, "PyQt6 not installed")
+class TestFramePrerenderer(unittest.TestCase):
+    """Test cases for FramePrerenderer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cache = FrameCache()
+        self.prerenderer = FramePrerenderer(cache=self.cache, max_threads=1, first_chunk=4, chunk_size=5)
+        self.renderer = LottieRenderer(_animation())
+        self.key = FrameCache.key("moving.json", 40, 40, 1.0)
+        self.ready = []
+        self.prerenderer.frame_ready.connect(lambda key, frame: self.ready.append(frame))
+
+    def tearDown(self):
+        self.prerenderer.cancel_all()
+        self.prerenderer.wait()
+
+    def _process_until(self, condition, timeout_ms=5000):
+        timer = QElapsedTimer()
+        timer.start()
+        while not condition() and timer.elapsed() < timeout_ms:
+            QCoreApplication.processEvents()
+
+    def test_fills_cache_progressively(self):
+        """Test that all frames reach the cache and the requested frame comes first"""
+        self.prerenderer.request(self.renderer, self.key, 40, 40, 1.0, start_frame=10)
+        self.assertTrue(self.prerenderer.is_pending(self.key, 10))
+        self._process_until(lambda: len(self.ready) == 30)
+        self.assertEqual(self.ready[0], 10)
+        self.assertEqual(sorted(self.ready), list(range(30)))
+        self.assertEqual(self.cache.frame_count(self.key), 30)
+        self.assertFalse(self.prerenderer.is_pending(self.key, 10))
+
+    def test_cached_frames_are_skipped(self):
+        """Test that frames already in the cache are not rendered again"""
+        for frame in range(25):
+            self.cache.put(self.key, frame, "cached")
+        self.prerenderer.request(self.renderer, self.key, 40, 40, 1.0)
+        self._process_until(lambda: len(self.ready) == 5)
+        self.assertEqual(sorted(self.ready), [25, 26, 27, 28, 29])
+        self.assertEqual(self.cache.get(self.key, 0), "cached")
+
+    def test_cancel_drops_pending_frames(self):
+        """Test that a cancelled animation stops reaching the cache"""
+        self.prerenderer.request(self.renderer, self.key, 40, 40, 1.0)
+        self.prerenderer.cancel(self.key)
+        self.prerenderer.wait()
+        QCoreApplication.processEvents()
+        self.assertFalse(self.prerenderer.is_pending(self.key, 0))
+        self.assertEqual(self.ready, [])
+        self.assertEqual(self.cache.frame_count(self.key), 0)
+
+
+    def test_failed_frame_is_released(self):
+        """Test that a frame that fails to render stops being pending and the rest still renders"""
+        renderer = self.renderer
+        original = renderer.render_image
+
+        def render_image(frame, *args):
+            if frame == 1:
+                raise ValueError("kaputt")
+            return original(frame, *args)
+
+        renderer.render_image = render_image
+        failed = []
+        self.prerenderer.frame_failed.connect(lambda key, frame: failed.append(frame))
+        self.prerenderer.request(renderer, self.key, 40, 40, 1.0)
+        self.prerenderer.wait()
+        self._process_until(lambda: len(self.ready) == 29)
+        self.assertEqual(failed, [1])
+        self.assertFalse(any(self.prerenderer.is_pending(self.key, frame) for frame in range(30)))
+        self.assertEqual(sorted(self.ready), [0] + list(range(2, 30)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the journal storage mode of DateiManager
+"""
+
+import sys
+import os
+import unittest
+import json
+import tempfile
+import shutil
+import zlib
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.datei_manager import DateiManager
+
+
+def eintrag(i):
+    return {"suende": f"Sünde {i}", "kategorie": "standard", "karma": 7}
+
+
+class TestJournalSpeicher(unittest.TestCase):
+    """Test cases for the journal storage mode"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_data_file = os.path.join(self.test_dir, "beichtstuh_daten_.json")
+        self.journal_file = self.test_data_file + ".journal"
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def manager(self, kompaktierung_ab=1000):
+        return DateiManager(self.test_data_file, modus="journal", kompaktierung_ab=kompaktierung_ab)
+
+    def bestaetige(self, historie):
+        """Simulate MainWindow saving after each confession"""
+        manager = self.manager()
+        karma, geladen, kategorien = manager.lade_daten()
+        for e in historie:
+            geladen.append(e)
+            karma += e["karma"]
+            kategorien[e["kategorie"]] += 1
+            self.assertTrue(manager.speichere_daten(karma, geladen, kategorien))
+        return manager
+
+    def test_unknown_mode(self):
+        """Test that an unknown storage mode is rejected"""
+        with self.assertRaises(ValueError):
+            DateiManager(self.test_data_file, modus="tape")
+
+    def test_append_one_record_per_confession(self):
+        """Test that each save appends one journal line and leaves the snapshot alone"""
+        self.bestaetige([eintrag(i) for i in range(5)])
+        self.assertFalse(os.path.exists(self.test_data_file))
+        with open(self.journal_file, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 5)
+
+        karma, historie, kategorien = self.manager().lade_daten()
+        self.assertEqual(karma, 35)
+        self.assertEqual([e["suende"] for e in historie], [f"Sünde {i}" for i in range(5)])
+        self.assertEqual(kategorien["standard"], 5)
+
+    def test_legacy_json_is_migrated(self):
+        """Test that an existing legacy JSON file is used as snapshot"""
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "karma_schulden": 14,
+                "beicht_historie": [eintrag(0), eintrag(1)],
+                "suenden_kategorien": {"standard": 2}
+            }, f, indent=2)
+
+        self.bestaetige([eintrag(2)])
+        karma, historie, kategorien = self.manager().lade_daten()
+        self.assertEqual(karma, 21)
+        self.assertEqual(len(historie), 3)
+        self.assertEqual(kategorien["standard"], 3)
+
+    def test_compaction(self):
+        """Test that compaction merges the journal into the snapshot"""
+        manager = self.manager(kompaktierung_ab=3)
+        karma, historie, kategorien = manager.lade_daten()
+        for i in range(4):
+            historie.append(eintrag(i))
+            kategorien["standard"] += 1
+            manager.speichere_daten(7 * (i + 1), historie, kategorien)
+
+        with open(self.test_data_file, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["beicht_historie"]), 3)
+        with open(self.journal_file, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        karma, historie, kategorien = self.manager().lade_daten()
+        self.assertEqual((karma, len(historie), kategorien["standard"]), (28, 4, 4))
+
+    def test_stale_journal_after_interrupted_compaction(self):
+        """Test that journal lines already contained in the snapshot are skipped"""
+        manager = self.bestaetige([eintrag(i) for i in range(3)])
+        with open(self.journal_file, encoding="utf-8") as f:
+            alt = f.read()
+        _, historie, kategorien = manager.lade_daten()
+        manager.kompaktiere(21, historie, kategorien)
+        # Simulate a crash before the journal was truncated
+        with open(self.journal_file, "w", encoding="utf-8") as f:
+            f.write(alt)
+
+        karma, historie, _ = self.manager().lade_daten()
+        self.assertEqual((karma, len(historie)), (21, 3))
+
+    def test_truncated_last_line(self):
+        """Test that a partially written last record is ignored"""
+        self.bestaetige([eintrag(i) for i in range(2)])
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"n":2,"e":{"suende"')
+
+        karma, historie, _ = self.manager().lade_daten()
+        self.assertEqual((karma, len(historie)), (14, 2))
+
+    def test_reset_writes_snapshot(self):
+        """Test that a shrinking history is persisted as a fresh snapshot"""
+        manager = self.bestaetige([eintrag(i) for i in range(3)])
+        manager.speichere_daten(0, [], {})
+
+        karma, historie, kategorien = self.manager().lade_daten()
+        self.assertEqual((karma, historie, dict(kategorien)), (0, [], {}))
+
+    def test_reset_to_history_of_same_length(self):
+        """Test that a new history replaces the old one even when it is not shorter"""
+        manager = self.manager()
+        _, historie, _ = manager.lade_historie()
+        historie.append(eintrag(0))
+        manager.speichere_daten(7, historie, {"standard": 1})
+        historie = manager.neue_historie()
+        historie.append({"suende": "neu", "kategorie": "geld", "karma": 6})
+        manager.speichere_daten(6, historie, {"geld": 1})
+
+        karma, geladen, kategorien = self.manager().lade_daten()
+        self.assertEqual((karma, [e["suende"] for e in geladen], dict(kategorien)), (6, ["neu"], {"geld": 1}))
+
+    def test_records_are_checksummed(self):
+        """Test that every journal line carries a CRC32 frame"""
+        self.bestaetige([eintrag(0)])
+        with open(self.journal_file, encoding="utf-8") as f:
+            zeile = f.readline()
+        pruefsumme, _, nutzdaten = zeile.rstrip("\n").partition(" ")
+        self.assertEqual(int(pruefsumme, 16), zlib.crc32(nutzdaten.encode("utf-8")))
+
+    def test_corrupt_record_is_dropped_and_rest_salvaged(self):
+        """Test that a damaged record in the middle does not lose the following ones"""
+        self.bestaetige([eintrag(i) for i in range(4)])
+        with open(self.journal_file, encoding="utf-8") as f:
+            zeilen = f.readlines()
+        zeilen[1] = zeilen[1].replace("Sünde 1", "Sünde X")
+        with open(self.journal_file, "w", encoding="utf-8") as f:
+            f.writelines(zeilen)
+
+        manager = self.manager()
+        karma, historie, _ = manager.lade_daten()
+        self.assertEqual([e["suende"] for e in historie], ["Sünde 0", "Sünde 2", "Sünde 3"])
+        self.assertEqual(karma, 28)
+        self.assertEqual(len(manager.bericht.verworfen), 1)
+
+        # Recovery compacted the files; the next launch is clean
+        manager = self.manager()
+        _, historie, _ = manager.lade_daten()
+        self.assertEqual(len(historie), 3)
+        self.assertEqual(manager.bericht.verworfen, [])
+
+    def test_unreadable_snapshot_is_kept(self):
+        """Test that an unreadable snapshot is moved aside instead of overwritten"""
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            f.write('{"karma_schulden": 1')
+        self.bestaetige([eintrag(0)])
+        self.assertTrue(os.path.exists(self.test_data_file + ".defekt"))
+
+    def test_compaction_leaves_no_temp_files(self):
+        """Test that atomic snapshot writes clean up after themselves"""
+        manager = self.bestaetige([eintrag(i) for i in range(3)])
+        _, historie, kategorien = manager.lade_daten()
+        manager.kompaktiere(21, historie, kategorien)
+        self.assertEqual(
+            sorted(os.listdir(self.test_dir)),
+            ["beichtstuh_daten_.json", "beichtstuh_daten_.json.idx", "beichtstuh_daten_.json.journal"]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the streaming legacy JSON reader
+"""
+
+import sys
+import os
+import unittest
+import json
+import tempfile
+import shutil
+import tracemalloc
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.json_strom_leser import JsonStromLeser, suenden_text
+
+
+class TestJsonStromLeser(unittest.TestCase):
+    """Test cases for JsonStromLeser"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_data_file = os.path.join(self.test_dir, "beichtstuh_daten_.json")
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def schreibe(self, daten, **optionen):
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            json.dump(daten, f, **optionen)
+
+    def test_entries_and_summary(self):
+        """Test that entries and totals match json.load for small buffers"""
+        daten = {
+            "karma_schulden": 123456789,
+            "beicht_historie": [
+                {"suende": f"Ich habe {i}x gelogen – ä", "kategorie": "lügen", "karma": 15}
+                for i in range(30)
+            ],
+            "suenden_kategorien": {"lügen": 30}
+        }
+        self.schreibe(daten, indent=2, ensure_ascii=False)
+        for puffergroesse in (1, 7, 64, 1 << 16):
+            leser = JsonStromLeser(self.test_data_file, puffergroesse)
+            self.assertEqual(list(leser), daten["beicht_historie"])
+            self.assertEqual(leser.zusammenfassung(), (123456789, 30, {"lügen": 30}))
+
+    def test_both_text_keys(self):
+        """Test that the sünde key of older data is read as suende"""
+        self.schreibe({"beicht_historie": [{"sünde": "alt"}, {"suende": "neu"}]})
+        eintraege = list(JsonStromLeser(self.test_data_file))
+        self.assertEqual([e["suende"] for e in eintraege], ["alt", "neu"])
+        self.assertEqual(suenden_text({"sünde": "alt"}), "alt")
+
+    def test_empty_and_missing_keys(self):
+        """Test documents without history or totals"""
+        self.schreibe({})
+        self.assertEqual(JsonStromLeser(self.test_data_file).zusammenfassung(), (0, 0, {}))
+        self.schreibe({"beicht_historie": [], "karma_schulden": 5})
+        self.assertEqual(JsonStromLeser(self.test_data_file).zusammenfassung(), (5, 0, {}))
+
+    def test_invalid_file(self):
+        """Test that a truncated document raises ValueError"""
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            f.write('{"karma_schulden": 1, "beicht_historie": [{"suende": "x"}, {"sue')
+        with self.assertRaises(ValueError):
+            list(JsonStromLeser(self.test_data_file, 8))
+
+    def test_corrupt_value_is_capped(self):
+        """Test that an unterminated value raises ValueError instead of buffering the file"""
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            f.write('{"karma_schulden": 1, "beicht_historie": [{"suende": "')
+            f.write("x" * 200000)
+
+        tracemalloc.start()
+        try:
+            with self.assertRaises(ValueError):
+                list(JsonStromLeser(self.test_data_file, 64, max_wertgroesse=1024))
+            _, spitze = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(spitze, 100000)
+
+        # Werte bis zur Grenze werden weiterhin gelesen
+        self.schreibe({"beicht_historie": [{"suende": "x" * 900}]})
+        self.assertEqual(len(list(JsonStromLeser(self.test_data_file, 64, max_wertgroesse=1024))), 1)
+
+    def test_constant_memory(self):
+        """Test that peak memory does not grow with the number of entries"""
+        with open(self.test_data_file, "w", encoding="utf-8") as f:
+            f.write('{"karma_schulden": 1, "beicht_historie": [')
+            f.write(",".join(json.dumps({"suende": "x" * 100, "kategorie": "standard", "karma": 7})
+                             for _ in range(50000)))
+            f.write('], "suenden_kategorien": {"standard": 50000}}')
+
+        tracemalloc.start()
+        try:
+            _, anzahl, _ = JsonStromLeser(self.test_data_file).zusammenfassung()
+            _, spitze = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(anzahl, 50000)
+        self.assertLess(spitze, os.path.getsize(self.test_data_file) // 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,13 @@ Unit tests for KarmaRechner
 import sys
 import os
 import unittest
+import unittest.mock
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # Add the project root to sys.path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -86,6 +93,48 @@ class TestKarmaRechner(unittest.TestCase):
         schulden = self.karma_rechner.berechne_karma_schulden("unknown", "Ich habe gesündigt")
         self.assertEqual(schulden, 7)  # Should default to standard
 
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_berechne_batch_matches_scalar(self):
+        """Test that batch scoring matches the scalar calculation exactly"""
+        rng = random.Random(42)
+        woerter = ["ich", "habe", "BETROGEN", "gestohlen", "Geld", "absichtlich", "x" * 60, "İ", ""]
+        kategorien = list(self.karma_rechner.base_punkte) + ["unknown"]
+        texte = []
+        for _ in range(300):
+            text = " ".join(rng.choice(woerter) for _ in range(rng.randint(0, 5)))
+            texte.append(text.upper() if rng.random() < 0.3 else text)
+        kats = [rng.choice(kategorien) for _ in texte]
+
+        erwartet = [self.karma_rechner.berechne_karma_schulden(k, t) for k, t in zip(kats, texte)]
+        self.assertEqual(self.karma_rechner.berechne_batch(kats, texte).tolist(), erwartet)
+
+        # Codes plus wiederverwendete Merkmale nach Änderung der Basispunkte
+        merkmale = self.karma_rechner.extrahiere_merkmale(iter(texte))
+        codes = [kategorien.index(k) for k in kats]
+        self.karma_rechner.base_punkte["lügen"] = 99
+        erwartet = [self.karma_rechner.berechne_karma_schulden(k, t) for k, t in zip(kats, texte)]
+        ergebnis = self.karma_rechner.berechne_batch(codes, merkmale, kategorie_liste=kategorien)
+        self.assertEqual(ergebnis.tolist(), erwartet)
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_berechne_batch_empty(self):
+        """Test batch scoring of an empty history"""
+        self.assertEqual(len(self.karma_rechner.berechne_batch([], [])), 0)
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_rescoring_a_column_skips_the_text(self):
+        """Test that re-scoring the same TextSpalte reuses its keyword hits"""
+        from core.text_spalte import TextSpalte
+        texte = ["Ich habe Geld gestohlen", "ICH WAR FAUL UND ABSICHTLICH", "nichts"] * 50
+        kats = ["geld", "faul", "standard"] * 50
+        spalte = TextSpalte(texte)
+        self.karma_rechner.berechne_batch(kats, spalte)
+
+        self.karma_rechner.base_punkte["geld"] = 40
+        erwartet = [self.karma_rechner.berechne_karma_schulden(k, t) for k, t in zip(kats, texte)]
+        with unittest.mock.patch.object(spalte, "_suche", side_effect=AssertionError("Text erneut durchsucht")):
+            self.assertEqual(self.karma_rechner.berechne_batch(kats, spalte).tolist(), erwartet)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for KeywordMatcher
+"""
+
+import sys
+import os
+import random
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.keyword_matcher import KeywordMatcher
+from core.antwort_generator import AntwortGenerator
+
+
+def naive_kategorie(keywords, text):
+    """Reference implementation: the original nested substring scan"""
+    text_lower = text.lower()
+    for kategorie, wörter in keywords.items():
+        for wort in wörter:
+            if wort in text_lower:
+                return kategorie
+    return "standard"
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test cases for KeywordMatcher"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.keywords = AntwortGenerator().keywords
+        self.matcher = KeywordMatcher(self.keywords)
+
+    def test_finde_alle_offsets(self):
+        """Test that all hits are reported with offsets into the lowered text"""
+        text = "Ich habe GELOGEN und Pizza gegessen"
+        treffer = self.matcher.finde_alle(text)
+        gefunden = {(t.wort, t.kategorie) for t in treffer}
+        self.assertIn(("gelogen", "lügen"), gefunden)
+        self.assertIn(("log", "lügen"), gefunden)
+        self.assertIn(("pizza", "essen"), gefunden)
+        self.assertIn(("gegessen", "essen"), gefunden)
+        for t in treffer:
+            self.assertEqual(text.lower()[t.start:t.ende], t.wort)
+
+    def test_overlapping_keywords(self):
+        """Test that keywords nested in other keywords are all reported"""
+        matcher = KeywordMatcher({"a": ["he", "she", "his", "hers"]})
+        woerter = sorted(t.wort for t in matcher.finde_alle("ushers"))
+        self.assertEqual(woerter, ["he", "hers", "she"])
+
+    def test_erste_kategorie_priority(self):
+        """Test that the first category in table order wins regardless of position"""
+        # "pizza" (essen) appears before "gelogen" (lügen) in the text
+        self.assertEqual(self.matcher.erste_kategorie("Pizza und gelogen"), "lügen")
+
+    def test_erste_kategorie_no_match(self):
+        """Test the fallback category when nothing matches"""
+        self.assertEqual(self.matcher.erste_kategorie("nichts"), "standard")
+        self.assertEqual(self.matcher.erste_kategorie("", standard="x"), "x")
+
+    def test_matches_naive_scan(self):
+        """Test equivalence with the original substring scan on random texts"""
+        rng = random.Random(1234)
+        woerter = [w for liste in self.keywords.values() for w in liste]
+        woerter += ["ich", "habe", "heute", "der", "katze", " ", "lü", "gel"]
+        for _ in range(500):
+            text = " ".join(rng.choice(woerter) for _ in range(rng.randint(0, 6)))
+            if rng.random() < 0.3:
+                text = text.upper()
+            self.assertEqual(
+                self.matcher.erste_kategorie(text),
+                naive_kategorie(self.keywords, text),
+                text
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the LottiePlayer playback clock
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from PyQt6.QtCore import QCoreApplication, QElapsedTimer
+    from tests.qt_app import qt_app
+    from utils.animation_registry import LottieAnimation
+    from utils.frame_cache import FrameCache
+    from utils.frame_prerenderer import FramePrerenderer
+    from utils.lottie_player import LottiePlayer
+    from utils.lottie_renderer import LottieRenderer
+except ImportError:
+    LottiePlayer = None
+
+
+def _animation(frames=90, color=(1, 0, 0, 1)):
+    """Static circle with the given number of frames at 30 fps"""
+    return {
+        "v": "5.7.0", "fr": 30, "ip": 0, "op": frames, "w": 100, "h": 100,
+        "layers": [{
+            "ty": 4, "ind": 1, "ip": 0, "op": frames, "ks": {},
+            "shapes": [
+                {"ty": "el", "p": {"a": 0, "k": [50, 50]}, "s": {"a": 0, "k": [20, 20]}},
+                {"ty": "fl", "c": {"a": 0, "k": list(color)}, "o": {"a": 0, "k": 100}},
+            ],
+        }],
+    }
+
+
+@unittest.skipUnless(LottiePlayer, "PyQt6 not installed")
+class TestLottiePlayerClock(unittest.TestCase):
+    """Test cases for the elapsed-time playback clock"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        cache = FrameCache()
+        self.prerenderer = FramePrerenderer(cache=cache, max_threads=1)
+        self.player = LottiePlayer(cache=cache, prerenderer=self.prerenderer)
+        self.player.set_size(40, 40)
+        self.player.set_animation(LottieAnimation("circle.json", 0, None, LottieRenderer(_animation())))
+
+    def tearDown(self):
+        self.player.stop()
+        self.prerenderer.cancel_all()
+        self.prerenderer.wait()
+
+    def test_frame_follows_elapsed_time(self):
+        """Test that a late tick skips to the frame of the elapsed time"""
+        self.player._clock_position = 7.4
+        self.player._on_tick()
+        self.assertEqual(self.player.current_frame, 7)
+        self.assertEqual(self.player.frames_skipped, 6)
+
+        # Past the end the animation wraps around
+        self.player._clock_position = 95.0
+        self.player._on_tick()
+        self.assertEqual(self.player.current_frame, 5)
+
+    def test_render_rate_limit(self):
+        """Test that max_fps lowers the redraw rate but not the playback speed"""
+        self.player.play()
+        self.assertEqual(self.player.timer.interval(), 33)
+        self.assertEqual(self.player.fps, 30)
+
+        self.player.max_fps = 15
+        self.player.play()
+        self.assertEqual(self.player.timer.interval(), 67)
+        self.assertEqual(self.player.fps, 30)
+
+    def test_pause_and_resume_keep_position(self):
+        """Test that pausing freezes the position and play continues from it"""
+        self.player._clock_position = 12.5
+        self.player.play()
+        self.player.pause()
+        paused = self.player.position()
+        self.assertGreaterEqual(paused, 12.5)
+        self.assertEqual(self.player.position(), paused)
+        self.assertFalse(self.player.is_playing())
+
+        self.player.play()
+        self.assertGreaterEqual(self.player.position(), paused)
+
+    def test_stop_and_new_animation_rewind(self):
+        """Test that stop and set_animation start from the first frame"""
+        self.player._clock_position = 40.0
+        self.player.stop()
+        self.assertEqual(self.player.position(), 0.0)
+        self.assertEqual(self.player.current_frame, 0)
+
+        self.player._clock_position = 40.0
+        self.player.set_animation(LottieAnimation("other.json", 0, None, LottieRenderer(_animation(30))))
+        self.assertEqual(self.player.position(), 0.0)
+
+    def test_suspend_holds_playback(self):
+        """Test that a suspended player keeps no timer running and resumes playing"""
+        # Not shown yet, so the visibility scheduler has suspended the player
+        self.player.play()
+        self.assertFalse(self.player.timer.isActive())
+        self.assertTrue(self.player.is_playing())
+
+        self.player.resume()
+        self.assertTrue(self.player.timer.isActive())
+        self.player.suspend()
+        self.assertFalse(self.player.timer.isActive())
+        self.assertTrue(self.player.is_playing())
+
+        # A pause while suspended is kept on resume
+        self.player.pause()
+        self.player.resume()
+        self.assertFalse(self.player.is_playing())
+
+
+
+@unittest.skipUnless(LottiePlayer, "PyQt6 not installed")
+class TestLottiePlayerCrossFade(unittest.TestCase):
+    """Test cases for cross-fading between animations"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cache = FrameCache()
+        self.prerenderer = FramePrerenderer(cache=self.cache, max_threads=1)
+        self.player = LottiePlayer(cache=self.cache, prerenderer=self.prerenderer)
+        self.player.set_size(40, 40)
+        self.red = LottieAnimation("red.json", 0, None, LottieRenderer(_animation(color=(1, 0, 0, 1))))
+        self.blue = LottieAnimation("blue.json", 0, None, LottieRenderer(_animation(color=(0, 0, 1, 1))))
+        self.green = LottieAnimation("green.json", 0, None, LottieRenderer(_animation(color=(0, 1, 0, 1))))
+        self.player.set_animation(self.red)
+        self._process_until(lambda: self._shown() is not None)
+
+    def tearDown(self):
+        self.player.stop()
+        self.prerenderer.cancel_all()
+        self.prerenderer.wait()
+
+    def _shown(self):
+        pixmap = self.player.label.pixmap()
+        return None if pixmap is None or pixmap.isNull() else pixmap
+
+    def _center(self):
+        return self._shown().toImage().pixelColor(20, 20)
+
+    def _process_until(self, condition, timeout_ms=2000):
+        timer = QElapsedTimer()
+        timer.start()
+        while not condition() and timer.elapsed() < timeout_ms:
+            QCoreApplication.processEvents()
+
+    def _halfway(self):
+        """Wait for the first new frame and part of the fade, then redraw"""
+        self._process_until(lambda: self.cache.contains(self.player._requested_key, 0)
+                            and self.player._fade_clock.elapsed() >= 40)
+        self.player.render_frame()
+
+    def test_fade_blends_then_shows_plain_frame(self):
+        """Test that a fade shows blends of cached frames and ends on the plain frame"""
+        self.player.set_animation(self.blue, fade_duration=150)
+        self._halfway()
+        color = self._center()
+        self.assertGreater(color.red(), 0)
+        self.assertGreater(color.blue(), 0)
+
+        self._process_until(lambda: self.player._fade_from is None, 1000)
+        color = self._center()
+        self.assertEqual((color.red(), color.blue()), (0, 255))
+
+    def test_burst_fades_to_latest(self):
+        """Test that switching again during a fade continues from the blend on screen"""
+        self.player.set_animation(self.blue, fade_duration=150)
+        self._halfway()
+        blend = self._shown()
+        self.player.set_animation(self.green, fade_duration=150)
+        self.assertEqual(self.player._fade_from.cacheKey(), blend.cacheKey())
+
+        self._process_until(lambda: self.player._fade_from is None, 1000)
+        color = self._center()
+        self.assertEqual((color.red(), color.green(), color.blue()), (0, 255, 0))
+
+    def test_hard_cut_without_duration(self):
+        """Test that set_animation without a fade switches directly"""
+        self.player.set_animation(self.blue)
+        self.assertIsNone(self.player._fade_from)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the QPainter-based Lottie renderer
+"""
+
+import sys
+import os
+import unittest
+import json
+import time
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from tests.qt_app import qt_app
+    from utils.lottie_renderer import LottieRenderer, AnimatedProperty, _Transform
+except ImportError:
+    LottieRenderer = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ANIMATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "animations")
+
+
+def lade(name):
+    with open(os.path.join(ANIMATIONS, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@unittest.skipUnless(LottieRenderer, "PyQt6 not installed")
+class TestLottieRenderer(unittest.TestCase):
+    """Test cases for LottieRenderer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def test_keyframe_table(self):
+        """Test that keyframes are precomputed with linear and eased segments"""
+        linear = AnimatedProperty({"a": 1, "k": [{"t": 0, "s": [0]}, {"t": 10, "s": [100]}]}, 0, 20)
+        self.assertEqual(len(linear.values), 20)
+        self.assertAlmostEqual(linear(5)[0], 50.0)
+        self.assertEqual(linear(15), (100,))
+        eased = AnimatedProperty({"a": 1, "k": [
+            {"t": 0, "s": [0], "o": {"x": [0.333], "y": [0]}, "i": {"x": [0.667], "y": [1]}},
+            {"t": 10, "s": [100]}
+        ]}, 0, 20)
+        self.assertLess(eased(2)[0], linear(2)[0])
+        self.assertAlmostEqual(eased(5)[0], 50.0, places=3)
+        self.assertEqual(AnimatedProperty({"a": 0, "k": [1, 2]}, 0, 20)(7), (1, 2))
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_vectorised_timeline_matches_frame_by_frame(self):
+        """Test that the NumPy timeline gives the values of the per-frame evaluation"""
+        keyframes = [
+            {"t": 5, "s": [0, 10], "o": {"x": [0.333], "y": [0]}, "i": {"x": [0.667], "y": [1]}},
+            {"t": 20, "s": [100, -40], "h": 1},
+            {"t": 30, "s": [50, 50], "o": {"x": [0.1, 0.8], "y": [0.9, 0.2]}, "i": {"x": [0.5, 0.3], "y": [1.4, 0]}},
+            {"t": 45, "s": [70, 0], "e": [80, 5]},
+            {"t": 60, "s": [0, 0]},
+        ]
+        property_ = AnimatedProperty({"a": 1, "k": keyframes}, 0, 70)
+        self.assertIsNotNone(property_.table)
+        self.assertEqual(property_.table.shape, (70, 2))
+        for frame in range(70):
+            for value, expected in zip(property_(frame), AnimatedProperty._evaluate(keyframes, frame)):
+                self.assertAlmostEqual(value, expected, places=9, msg=frame)
+        # Values of differing dimension fall back to the per-frame evaluation
+        ragged = AnimatedProperty({"a": 1, "k": [{"t": 0, "s": [0]}, {"t": 10, "s": [1, 2]}]}, 0, 20)
+        self.assertIsNone(ragged.table)
+        self.assertEqual(len(ragged.values), 20)
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_transform_table_matches_qt(self):
+        """Test that the per-frame matrix table equals the QTransform operations"""
+        transform = _Transform({
+            "a": {"a": 1, "k": [{"t": 0, "s": [10, 20]}, {"t": 30, "s": [-5, 0]}]},
+            "p": {"a": 0, "k": [140, 150]},
+            "s": {"a": 1, "k": [{"t": 0, "s": [100, 80]}, {"t": 30, "s": [40, 120]}]},
+            "r": {"a": 1, "k": [{"t": 0, "s": [0]}, {"t": 30, "s": [270]}]},
+        }, 0, 40)
+        for frame in range(40):
+            matrix, expected = transform.matrix(frame), transform._compose(frame)
+            for name in ("m11", "m12", "m21", "m22", "dx", "dy"):
+                self.assertAlmostEqual(getattr(matrix, name)(), getattr(expected, name)(), places=9, msg=(frame, name))
+        self.assertIs(transform.matrix(99), transform.matrix(39))
+
+    def test_draws_the_monk(self):
+        """Test that the body is painted at the centre of the frame"""
+        renderer = LottieRenderer(lade("monk_idle.json"))
+        image = renderer.render_image(0, 280, 280)
+        self.assertEqual((image.width(), image.height()), (280, 280))
+        self.assertGreater(image.pixelColor(140, 150).alpha(), 0)
+        self.assertEqual(image.pixelColor(5, 5).alpha(), 0)
+
+    def test_animated_transform_changes_pixels(self):
+        """Test that keyframed transforms move shapes between frames"""
+        renderer = LottieRenderer(lade("monk_sad.json"))
+        self.assertNotEqual(renderer.render_image(0, 280, 280), renderer.render_image(45, 280, 280))
+
+    def test_frame_budget(self):
+        """Test that a 280x280 frame renders well within a 60 Hz budget"""
+        for name in sorted(os.listdir(ANIMATIONS)):
+            renderer = LottieRenderer(lade(name))
+            start = time.perf_counter()
+            for frame in range(renderer.in_point, renderer.out_point):
+                renderer.render_image(frame, 280, 280)
+            pro_frame = (time.perf_counter() - start) / renderer.frame_count
+            self.assertLess(pro_frame, 1 / 60, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the emotion-to-animation table of the monk visualizer
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.antwort_generator import AntwortGenerator
+from core.constants import MONK_ANIMATIONS, EMOTION_MAPPING
+
+try:
+    from PyQt6.QtCore import QCoreApplication, QElapsedTimer
+    from tests.qt_app import qt_app
+    from ui.components.monk_visualizer import MonkVisualizer
+    from utils.frame_prerenderer import FramePrerenderer
+    from utils.animation_registry import animation_registry
+except ImportError:
+    MonkVisualizer = None
+
+ANIMATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "animations")
+
+
+class TestMonkAnimations(unittest.TestCase):
+    """Test cases for MONK_ANIMATIONS"""
+
+    def test_every_emotion_has_an_animation(self):
+        """Test that all emotions the generator can return are in the table"""
+        generator = AntwortGenerator()
+        emotionen = set(generator.emotionen_mapping.values()) | set(EMOTION_MAPPING.values())
+        emotionen |= {emotion for _, emotion in generator.easter_egg_antworten.values()}
+        emotionen |= {"neutral"}
+        self.assertEqual(emotionen - set(MONK_ANIMATIONS), set())
+
+    def test_animation_files_exist(self):
+        """Test that every table entry points to a shipped animation"""
+        for emotion, name in MONK_ANIMATIONS.items():
+            self.assertTrue(os.path.isfile(os.path.join(ANIMATIONS, name)), emotion)
+
+
+@unittest.skipUnless(MonkVisualizer, "PyQt6 not installed")
+class TestMonkVisualizer(unittest.TestCase):
+    """Test cases for MonkVisualizer.set_emotion"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.visualizer = MonkVisualizer()
+        timer = QElapsedTimer()
+        timer.start()
+        while len(set(map(id, self.visualizer.animations.values()))) < len(set(MONK_ANIMATIONS.values())) \
+                and timer.elapsed() < 5000:
+            QCoreApplication.processEvents()
+
+    def tearDown(self):
+        # Pre-rendering runs on the shared pool; let no worker outlive the test
+        self.visualizer.lottie_player.stop()
+        prerenderer = FramePrerenderer.instance()
+        prerenderer.cancel_all()
+        prerenderer.wait()
+        QCoreApplication.processEvents()
+
+    def test_paths_do_not_depend_on_working_directory(self):
+        """Test that animation paths are absolute"""
+        for path in self.visualizer.animation_paths.values():
+            self.assertTrue(os.path.isabs(path))
+
+    def test_switch_uses_preloaded_animation(self):
+        """Test that switching emotions plays the preloaded animation without parsing"""
+        parses = animation_registry.parses
+        for emotion in MONK_ANIMATIONS:
+            self.visualizer.set_emotion(emotion)
+            self.assertEqual(self.visualizer.lottie_player.renderer, self.visualizer.animations[emotion].renderer)
+        self.assertEqual(animation_registry.parses, parses)
+
+    def test_unknown_emotion_falls_back_to_neutral(self):
+        """Test that unknown emotions show the neutral animation"""
+        self.visualizer.set_emotion("verwirrt")
+        self.assertIs(self.visualizer.lottie_player.renderer, self.visualizer.animations["neutral"].renderer)
+
+
+if __name__ == '__main__':
+    unittest.main()
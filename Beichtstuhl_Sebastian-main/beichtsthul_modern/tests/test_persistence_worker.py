@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for PersistenceWorker
+"""
+
+import sys
+import os
+import unittest
+import tempfile
+import shutil
+import threading
+import unittest.mock
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from utils.persistence_worker import PersistenceWorker
+except ImportError:
+    PersistenceWorker = None
+
+from core.datei_manager import DateiManager
+from core.statistik_aggregator import StatistikAggregator
+
+
+class ZaehlenderDateiManager(DateiManager):
+    """DateiManager that counts writes and can be slowed down"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.schreibvorgaenge = 0
+        self.freigabe = threading.Event()
+        self.freigabe.set()
+
+    def speichere_daten(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        self.freigabe.wait()
+        self.schreibvorgaenge += 1
+        return super().speichere_daten(karma_schulden, beicht_historie, suenden_kategorien, statistik)
+
+
+@unittest.skipUnless(PersistenceWorker, "PyQt6 not installed")
+class TestPersistenceWorker(unittest.TestCase):
+    """Test cases for PersistenceWorker"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_data_file = os.path.join(self.test_dir, "beichtstuh_daten_.json")
+        self.datei_manager = ZaehlenderDateiManager(self.test_data_file, modus="journal")
+        self.worker = PersistenceWorker(self.datei_manager, coalesce_ms=10000)
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        self.worker.stop()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_burst_is_coalesced(self):
+        """Test that a burst of updates results in a single write of the latest state"""
+        historie = []
+        for i in range(20):
+            historie.append({"suende": f"Sünde {i}", "kategorie": "standard", "karma": 7})
+            self.worker.submit(7 * (i + 1), historie, {"standard": i + 1})
+        self.assertTrue(self.worker.flush(timeout=5))
+
+        self.assertEqual(self.datei_manager.schreibvorgaenge, 1)
+        karma, geladen, kategorien = DateiManager(self.test_data_file, modus="journal").lade_daten()
+        self.assertEqual((karma, len(geladen), kategorien["standard"]), (140, 20, 20))
+
+    def test_history_appended_after_submit_is_not_written(self):
+        """Test that the worker writes the history length seen at submit time"""
+        historie = [{"suende": "a", "kategorie": "standard", "karma": 7}]
+        self.worker.submit(7, historie, {"standard": 1})
+        historie.append({"suende": "b", "kategorie": "standard", "karma": 7})
+        self.worker.flush(timeout=5)
+
+        _, geladen, _ = DateiManager(self.test_data_file, modus="journal").lade_daten()
+        self.assertEqual(len(geladen), 1)
+
+    def test_reset_and_confession_in_one_write(self):
+        """Test that a reset merged with the next confession replaces the old history"""
+        for modus, dateiname in (("journal", "reset.json"), ("sqlite", "reset.db")):
+            pfad = os.path.join(self.test_dir, dateiname)
+            datei_manager = DateiManager(pfad, modus=modus)
+            worker = PersistenceWorker(datei_manager, coalesce_ms=10000)
+            self.addCleanup(worker.stop)
+            _, historie, _ = datei_manager.lade_historie()
+            historie.append({"suende": "alt", "kategorie": "lügen", "karma": 15})
+            worker.submit(15, historie, {"lügen": 1})
+            self.assertTrue(worker.flush(timeout=5))
+
+            historie = datei_manager.neue_historie()
+            worker.submit(0, historie, {})
+            historie.append({"suende": "neu", "kategorie": "geld", "karma": 6})
+            worker.submit(6, historie, {"geld": 1})
+            self.assertTrue(worker.flush(timeout=5))
+            worker.stop()
+
+            if modus == "sqlite":
+                datei_manager.speicher.schliesse()
+            geladen = DateiManager(pfad, modus=modus)
+            karma, eintraege, kategorien = geladen.lade_daten()
+            self.assertEqual(
+                (karma, [e["suende"] for e in eintraege], dict(kategorien)), (6, ["neu"], {"geld": 1}), modus
+            )
+            if modus == "sqlite":
+                geladen.speicher.schliesse()
+
+    def test_flush_timeout(self):
+        """Test that flush reports a write that did not finish in time"""
+        self.datei_manager.freigabe.clear()
+        self.worker.submit(0, [], {})
+        self.assertFalse(self.worker.flush(timeout=0.05))
+        self.datei_manager.freigabe.set()
+        self.assertTrue(self.worker.flush(timeout=5))
+
+    def test_statistics_are_serialised_on_the_worker(self):
+        """Test that a submitted aggregator is serialised at write time, off the calling thread"""
+        threads = []
+
+        class Aggregator(StatistikAggregator):
+            def als_dict(self):
+                threads.append(threading.current_thread())
+                return super().als_dict()
+
+        aggregator = Aggregator()
+        historie = []
+        for karma in (3, 5, 7):
+            historie.append({"suende": "x", "kategorie": "standard", "karma": karma, "zeit": 1700000000})
+            aggregator.erfasse_eintrag(historie[-1])
+            self.worker.submit(sum(e["karma"] for e in historie), historie, aggregator.kategorie_anzahlen(), aggregator)
+        self.assertEqual(threads, [])
+        self.assertTrue(self.worker.flush(timeout=5))
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+        geladen = DateiManager(self.test_data_file, modus="journal")
+        _, historie_geladen, _ = geladen.lade_daten()
+        statistik = StatistikAggregator.lade(geladen.statistik, historie_geladen)
+        self.assertEqual((statistik.anzahl, statistik.summe), (3, 15))
+
+    def test_statistics_cover_the_saved_history(self):
+        """Test that confessions recorded after submit reach neither history nor statistics"""
+        aggregator = StatistikAggregator()
+        historie = [{"suende": "a", "kategorie": "standard", "karma": 7, "zeit": 1700000000}]
+        aggregator.erfasse_eintrag(historie[0])
+        self.worker.submit(7, historie, aggregator.kategorie_anzahlen(), aggregator)
+        historie.append({"suende": "b", "kategorie": "standard", "karma": 5, "zeit": 1700000060})
+        aggregator.erfasse_eintrag(historie[1])
+        self.assertTrue(self.worker.flush(timeout=5))
+
+        geladen = DateiManager(self.test_data_file, modus="journal")
+        _, historie_geladen, _ = geladen.lade_daten()
+        self.assertEqual((len(historie_geladen), geladen.statistik["anzahl"]), (1, 1))
+        with unittest.mock.patch.object(StatistikAggregator, "aus_historie") as neu_aufbauen:
+            statistik = StatistikAggregator.lade(geladen.statistik, historie_geladen)
+        neu_aufbauen.assert_not_called()
+        self.assertEqual((statistik.anzahl, statistik.summe), (1, 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the snapshot offset index used by the journal storage mode
+"""
+
+import sys
+import os
+import unittest
+import tempfile
+import shutil
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.datei_manager import DateiManager
+from core.snapshot_index import SnapshotIndex
+
+
+def eintrag(i):
+    return {"suende": f"Sünde {i} ä", "kategorie": "standard", "karma": 7}
+
+
+class TestSnapshotIndex(unittest.TestCase):
+    """Test cases for SnapshotIndex"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_data_file = os.path.join(self.test_dir, "beichtstuh_daten_.json")
+        self.index_file = self.test_data_file + ".idx"
+        manager = DateiManager(self.test_data_file, modus="journal")
+        manager.speichere_daten(7 * 100, [eintrag(i) for i in range(100)], {"standard": 100})
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def lese(self, start, stop):
+        index = SnapshotIndex(self.test_data_file, self.index_file, 100)
+        try:
+            return [e["suende"] for e in index.lese(start, stop)]
+        finally:
+            index.schliesse()
+
+    def test_index_written_with_snapshot(self):
+        """Test that compaction writes the index next to the snapshot"""
+        self.assertTrue(os.path.exists(self.index_file))
+        self.assertEqual(self.lese(50, 53), ["Sünde 50 ä", "Sünde 51 ä", "Sünde 52 ä"])
+        self.assertEqual(self.lese(99, 200), ["Sünde 99 ä"])
+
+    def test_missing_index_is_rebuilt(self):
+        """Test that a missing index is rebuilt from the snapshot"""
+        os.remove(self.index_file)
+        self.assertEqual(self.lese(0, 2), ["Sünde 0 ä", "Sünde 1 ä"])
+        self.assertTrue(os.path.exists(self.index_file))
+
+    def test_stale_index_is_rebuilt(self):
+        """Test that an index belonging to another snapshot is ignored"""
+        with open(self.index_file, "r+b") as f:
+            f.seek(8)
+            f.write(b"\xff" * 8)
+        self.assertEqual(self.lese(42, 43), ["Sünde 42 ä"])
+
+    def test_snapshot_edited_at_same_size(self):
+        """Test that an index is rebuilt when the snapshot changed but kept its size"""
+        with open(self.test_data_file, "rb") as f:
+            daten = f.read()
+        # Eintrag 1 wird drei Bytes länger, Eintrag 2 drei kürzer
+        daten = daten.replace("Sünde 1 ä".encode(), "Sünde 1 äabc".encode())
+        daten = daten.replace("Sünde 2 ä".encode(), "Sü 2 ä".encode())
+        stat = os.stat(self.test_data_file)
+        with open(self.test_data_file, "wb") as f:
+            f.write(daten)
+        os.utime(self.test_data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertEqual(os.path.getsize(self.test_data_file), stat.st_size)
+        self.assertEqual(self.lese(0, 4), ["Sünde 0 ä", "Sünde 1 äabc", "Sü 2 ä", "Sünde 3 ä"])
+
+    def test_last_line_without_newline(self):
+        """Test that a snapshot ending without a newline is indexed to the end of the file"""
+        with open(self.test_data_file, "rb") as f:
+            daten = f.read()
+        with open(self.test_data_file, "wb") as f:
+            f.write(daten[:daten.rindex(b"\n]}")])
+        os.remove(self.index_file)
+        self.assertEqual(self.lese(98, 100), ["Sünde 98 ä", "Sünde 99 ä"])
+
+    def test_compaction_while_mapped(self):
+        """Test that the mapped snapshot can be replaced by a compaction"""
+        manager = DateiManager(self.test_data_file, modus="journal", kompaktierung_ab=2)
+        karma, historie, kategorien = manager.lade_historie(fenster=1)
+        self.assertEqual(historie[10]["suende"], "Sünde 10 ä")
+        for i in range(100, 104):
+            historie.append(eintrag(i))
+            manager.speichere_daten(karma, historie.ansicht(len(historie)), kategorien)
+        self.assertEqual(historie[102]["suende"], "Sünde 102 ä")
+        self.assertEqual(historie[10]["suende"], "Sünde 10 ä")
+        manager.speicher.schliesse()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for compiled sprite sheets
+"""
+
+import sys
+import os
+import json
+import shutil
+import struct
+import tempfile
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from PyQt6 import sip
+    from PyQt6.QtCore import QCoreApplication, QElapsedTimer
+    from PyQt6.QtGui import QImage, QPainter
+    from tests.qt_app import qt_app
+    from utils.lottie_renderer import LottieRenderer
+    from utils.sprite_sheet import SpriteSheet, compile_sprite_sheet, sprite_sheet_path, _HEADER, _ENTRY
+    from utils.animation_registry import AnimationRegistry
+    from utils.frame_cache import FrameCache
+    from utils.frame_prerenderer import FramePrerenderer
+    from utils.lottie_player import LottiePlayer
+except ImportError:
+    SpriteSheet = None
+
+
+def _animation(moving=True):
+    """Circle that moves for the first 10 of 30 frames, then stays put"""
+    position = {"a": 1, "k": [
+        {"t": 0, "s": [20, 50], "e": [80, 50]},
+        {"t": 10, "s": [80, 50]},
+    ]} if moving else {"a": 0, "k": [50, 50]}
+    return {
+        "v": "5.7.0", "fr": 30, "ip": 0, "op": 30, "w": 100, "h": 100,
+        "layers": [{
+            "ty": 4, "ind": 1, "ip": 0, "op": 30, "ks": {"p": position},
+            "shapes": [
+                {"ty": "el", "p": {"a": 0, "k": [0, 0]}, "s": {"a": 0, "k": [20, 20]}},
+                {"ty": "fl", "c": {"a": 0, "k": [1, 0, 0, 1]}, "o": {"a": 0, "k": 100}},
+            ],
+        }],
+    }
+
+
+@unittest.skipUnless(SpriteSheet, "PyQt6 not installed")
+class TestSpriteSheet(unittest.TestCase):
+    """Test cases for compile_sprite_sheet and SpriteSheet"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.test_dir, "circle.json")
+        self._write(_animation())
+        self.sheet_path, _ = compile_sprite_sheet(self.json_path, sizes=((40, 40),), dprs=(1.0, 2.0))
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, data):
+        with open(self.json_path, "w") as f:
+            json.dump(data, f)
+
+    def test_frames_match_renderer(self):
+        """Test that sheet frames are the renderer's frames"""
+        renderer = LottieRenderer(_animation())
+        sheet = SpriteSheet(self.sheet_path)
+        self.assertEqual(self.sheet_path, sprite_sheet_path(self.json_path))
+        self.assertEqual((sheet.frame_rate, sheet.in_point, sheet.frame_count), (30, 0, 30))
+        self.assertEqual(sorted(sheet.sizes()), [(40, 40, 1.0), (40, 40, 2.0)])
+        for frame in (0, 5, 29):
+            for dpr in (1.0, 2.0):
+                image = sheet.render_image(frame, 40, 40, dpr)
+                self.assertEqual(image.devicePixelRatio(), dpr)
+                self.assertEqual(image, renderer.render_image(frame, 40, 40, dpr))
+
+    def test_identical_frames_share_pixels(self):
+        """Test that repeated frames are stored once"""
+        sheet = SpriteSheet(self.sheet_path)
+        self.assertEqual(int(sheet.sprite(15, 40, 40)[0].constBits()),
+                         int(sheet.sprite(25, 40, 40)[0].constBits()))
+
+    def test_frames_are_cropped(self):
+        """Test that only the area the animation draws to is stored"""
+        sheet = SpriteSheet(self.sheet_path)
+        renderer = LottieRenderer(_animation())
+        # The circle (radius 4 at 40x40) moves from x=8 to x=32 along y=20
+        image, offset = sheet.sprite(0, 40, 40, 2.0)
+        self.assertEqual(image.devicePixelRatio(), 2.0)
+        self.assertLessEqual(image.width(), 2 * 34)
+        self.assertLessEqual(image.height(), 2 * 10)
+        self.assertTrue(4 <= offset.x() <= 5 and 15 <= offset.y() <= 16)
+        # 11 distinct frames stay far below 11 whole frames at 40x40 and 80x80
+        frame_bytes = 11 * (40 * 40 + 80 * 80) * 4
+        self.assertLess(os.path.getsize(self.sheet_path), frame_bytes // 3)
+        # Painting the crop at its offset gives the whole frame back
+        frame = QImage(80, 80, QImage.Format.Format_ARGB32_Premultiplied)
+        frame.fill(0)
+        frame.setDevicePixelRatio(2.0)
+        painter = QPainter(frame)
+        painter.drawImage(offset, image)
+        painter.end()
+        self.assertEqual(frame, renderer.render_image(0, 40, 40, 2.0))
+        self.assertIsNone(sheet.sprite(0, 60, 60))
+
+    def test_images_point_into_the_mapping(self):
+        """Test that frames are not copied out of the file"""
+        sheet = SpriteSheet(self.sheet_path)
+        start = int(sip.voidptr(sheet._view))
+        address = int(sheet.sprite(3, 40, 40, 2.0)[0].constBits())
+        self.assertTrue(start <= address < start + len(sheet._view))
+
+    def test_other_sizes_are_scaled(self):
+        """Test that sizes missing from the sheet are scaled from the closest entry"""
+        image = SpriteSheet(self.sheet_path).render_image(0, 60, 60, 1.0)
+        self.assertEqual((image.width(), image.height()), (60, 60))
+
+    def test_invalid_file(self):
+        """Test that files that are no sprite sheets are rejected"""
+        with open(self.sheet_path, "wb") as f:
+            f.write(b"{}" * 100)
+        with self.assertRaises(ValueError):
+            SpriteSheet(self.sheet_path)
+
+    def test_truncated_file(self):
+        """Test that a sheet cut short is rejected and the registry falls back to the JSON"""
+        size = os.path.getsize(self.sheet_path)
+        for length in (size // 2, size - 1, 120):
+            with open(self.sheet_path, "r+b") as f:
+                f.truncate(length)
+            with self.assertRaises(ValueError):
+                SpriteSheet(self.sheet_path)
+        self.assertIsNone(AnimationRegistry()._load_sprite_sheet(self.json_path))
+
+    def test_slot_index_out_of_range(self):
+        """Test that a frame referring to a slot the sheet does not have is rejected"""
+        with open(self.sheet_path, "r+b") as f:
+            f.seek(_HEADER.size)
+            _, _, _, slot_count, map_offset, *_ = _ENTRY.unpack(f.read(_ENTRY.size))
+            f.seek(map_offset)
+            f.write(struct.pack("<I", slot_count))
+        with self.assertRaises(ValueError):
+            SpriteSheet(self.sheet_path)
+
+    def test_registry_prefers_up_to_date_sheet(self):
+        """Test that the registry maps the sheet and ignores it once the JSON changes"""
+        registry = AnimationRegistry()
+        animation = registry.get(self.json_path)
+        self.assertIsInstance(animation.renderer, SpriteSheet)
+        self.assertIsNone(animation.model)
+        self.assertEqual((registry.parses, registry.sheet_loads), (0, 1))
+
+        # A changed source makes the sheet stale; the JSON is parsed instead
+        self._write(_animation(moving=False))
+        self.assertIsNone(registry._load_sprite_sheet(self.json_path))
+
+
+@unittest.skipUnless(SpriteSheet, "PyQt6 not installed")
+class TestSpriteSheetPlayback(unittest.TestCase):
+    """Test cases for LottiePlayer with a mapped sprite sheet"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        json_path = os.path.join(self.test_dir, "circle.json")
+        with open(json_path, "w") as f:
+            json.dump(_animation(), f)
+        compile_sprite_sheet(json_path, sizes=((40, 40),), dprs=(1.0,))
+        self.animation = AnimationRegistry().get(json_path)
+        self.cache = FrameCache()
+        self.prerenderer = FramePrerenderer(cache=self.cache, max_threads=1)
+        self.player = LottiePlayer(cache=self.cache, prerenderer=self.prerenderer)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.player.stop()
+        self.prerenderer.cancel_all()
+        self.prerenderer.wait()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_mapped_frames_are_painted_directly(self):
+        """Test that frames of a stored size bypass the pixmap cache"""
+        self.player.set_size(40, 40)
+        self.player.set_animation(self.animation)
+        self.player.next_frame()
+        sheet = self.animation.renderer
+        start = int(sip.voidptr(sheet._view))
+        self.assertTrue(start <= int(self.player._image.constBits()) < start + len(sheet._view))
+        self.assertTrue(self.player.label.pixmap().isNull())
+        self.assertEqual(self.cache.stats().bytes_used, 0)
+        self.assertIsNone(self.player._requested_key)
+        self.assertEqual(self.player.grab().toImage().pixelColor(10, 20).red(), 255)
+
+    def test_other_sizes_use_the_cache(self):
+        """Test that scaled frames still go through the prerenderer and cache"""
+        self.player.set_size(60, 60)
+        self.player.set_animation(self.animation)
+        self.assertIsNone(self.player._image)
+        self.assertIsNotNone(self.player._requested_key)
+
+    def test_fade_ends_on_the_mapped_frame(self):
+        """Test that a cross-fade blends copies and then returns to the mapped frame"""
+        self.player.set_size(40, 40)
+        self.player.set_animation(self.animation)
+        self.player.set_animation(self.animation, fade_duration=50)
+        self.assertIsNone(self.player._image)
+        self.assertFalse(self.player.label.pixmap().isNull())
+        timer = QElapsedTimer()
+        timer.start()
+        while self.player._image is None and timer.elapsed() < 1000:
+            QCoreApplication.processEvents()
+        self.assertIsNotNone(self.player._image)
+        self.assertTrue(self.player.label.pixmap().isNull())
+
+        # A fade away from the mapped frame starts from the whole frame
+        shown = self.player._shown_pixmap().toImage()
+        expected = self.animation.renderer.render_image(self.player.current_frame, 40, 40)
+        self.assertEqual(shown.convertToFormat(expected.format()), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the SQLite storage mode of DateiManager
+"""
+
+import sys
+import os
+import unittest
+import json
+import tempfile
+import shutil
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.datei_manager import DateiManager
+
+
+class TestSQLiteSpeicher(unittest.TestCase):
+    """Test cases for the SQLite storage mode"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.test_dir, "beichtstuh_daten_.db")
+        self.datei_manager = DateiManager(self.db_file, modus="sqlite")
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        self.datei_manager.speicher.schliesse()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Test that saved confessions are loaded back in order"""
+        historie = [
+            {"suende": "Ich habe gelogen", "kategorie": "lügen", "karma": 15, "zeit": 1000.0},
+            {"suende": "Pizza", "kategorie": "essen", "karma": 8, "zeit": 2000.0},
+        ]
+        self.assertTrue(self.datei_manager.speichere_daten(15, historie[:1], {"lügen": 1}))
+        self.assertTrue(self.datei_manager.speichere_daten(23, historie, {"lügen": 1, "essen": 1}))
+        self.datei_manager.speicher.schliesse()
+
+        self.datei_manager = DateiManager(self.db_file, modus="sqlite")
+        karma, geladen, kategorien = self.datei_manager.lade_daten()
+        self.assertEqual(karma, 23)
+        self.assertEqual(geladen, historie)
+        self.assertEqual(kategorien["essen"], 1)
+        self.assertEqual(kategorien["neid"], 0)
+
+    def test_queries(self):
+        """Test aggregate queries answered in SQL"""
+        historie = [
+            {"suende": f"Sünde {i}", "kategorie": "faul" if i % 2 else "geld", "karma": i, "zeit": 1000.0 + i}
+            for i in range(10)
+        ]
+        self.datei_manager.speichere_daten(45, historie, {"faul": 5, "geld": 5})
+        speicher = self.datei_manager.speicher
+        self.assertEqual(speicher.anzahl(), 10)
+        self.assertEqual(speicher.anzahl_pro_kategorie(), {"faul": 5, "geld": 5})
+        self.assertEqual(speicher.karma_summe(), 45)
+        self.assertEqual(speicher.karma_summe(seit=1008.0), 17)
+        self.assertEqual([e["suende"] for e in speicher.letzte(2)], ["Sünde 9", "Sünde 8"])
+
+    def test_reset(self):
+        """Test that a reset removes all rows"""
+        self.datei_manager.speichere_daten(7, [{"suende": "x", "kategorie": "standard", "karma": 7}], {"standard": 1})
+        self.datei_manager.speichere_daten(0, [], {})
+        karma, historie, kategorien = self.datei_manager.lade_daten()
+        self.assertEqual((karma, historie, dict(kategorien)), (0, [], {}))
+
+    def test_failed_reset_keeps_rows_in_sync(self):
+        """Test that a rolled-back rebuild leaves the persisted count unchanged"""
+        historie = [{"suende": f"Sünde {i}", "kategorie": "standard", "karma": 1} for i in range(3)]
+        self.datei_manager.speichere_daten(2, historie[:2], {"standard": 2})
+        kaputt = [{"suende": "x", "kategorie": "standard", "karma": object()}]
+        self.assertFalse(self.datei_manager.speichere_daten(1, kaputt, {"standard": 1}))
+        self.assertEqual(self.datei_manager.speicher.anzahl(), 2)
+
+        self.assertTrue(self.datei_manager.speichere_daten(3, historie, {"standard": 3}))
+        karma, geladen, _ = self.datei_manager.lade_daten()
+        self.assertEqual([e["suende"] for e in geladen], [e["suende"] for e in historie])
+
+    def test_reset_to_history_of_same_length(self):
+        """Test that a new history replaces the rows even when it is not shorter"""
+        _, historie, _ = self.datei_manager.lade_historie()
+        historie.append({"suende": "alt", "kategorie": "lügen", "karma": 15})
+        self.datei_manager.speichere_daten(15, historie, {"lügen": 1})
+        historie = self.datei_manager.neue_historie()
+        historie.append({"suende": "neu", "kategorie": "geld", "karma": 6})
+        self.datei_manager.speichere_daten(6, historie, {"geld": 1})
+
+        karma, geladen, kategorien = self.datei_manager.lade_daten()
+        self.assertEqual((karma, [e["suende"] for e in geladen], dict(kategorien)), (6, ["neu"], {"geld": 1}))
+
+    def test_import_json(self):
+        """Test the one-shot import of the legacy JSON file"""
+        json_file = os.path.join(self.test_dir, "beichtstuh_daten_.json")
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "karma_schulden": 14,
+                "beicht_historie": [
+                    {"suende": "a", "kategorie": "standard", "karma": 7},
+                    {"suende": "b", "kategorie": "standard", "karma": 7}
+                ],
+                "suenden_kategorien": {"standard": 2}
+            }, f)
+
+        self.assertEqual(self.datei_manager.speicher.importiere_json(json_file), 2)
+        self.assertEqual(self.datei_manager.speicher.importiere_json(json_file), 0)
+        karma, historie, kategorien = self.datei_manager.lade_daten()
+        self.assertEqual((karma, len(historie), kategorien["standard"]), (14, 2, 2))
+
+    def test_entries_without_time(self):
+        """Test that legacy confessions without "zeit" stay undated"""
+        from core.statistik_aggregator import StatistikAggregator
+        historie = [
+            {"suende": "alt", "kategorie": "geld", "karma": 12},
+            {"suende": "neu", "kategorie": "faul", "karma": 5, "zeit": 5000.0},
+        ]
+        self.assertTrue(self.datei_manager.speichere_daten(17, historie, {"geld": 1, "faul": 1}))
+
+        speicher = self.datei_manager.speicher
+        self.assertEqual(speicher.karma_summe(), 17)
+        self.assertEqual(speicher.karma_summe(seit=0), 5)
+        self.assertEqual(speicher.lade_daten()[1], historie)
+        # Ohne Zeitstempel landet die alte Beichte in keinem Rollup-Bucket
+        statistik = StatistikAggregator.aus_historie(speicher.letzte(10))
+        self.assertEqual(statistik.rollups.abfrage(0, 4e9).anzahl, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the incremental StatistikAggregator
+"""
+
+import sys
+import os
+import unittest
+import tempfile
+import shutil
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.statistik_aggregator import StatistikAggregator, KategorieStatistik
+from core.datei_manager import DateiManager
+
+
+class TestStatistikAggregator(unittest.TestCase):
+    """Test cases for StatistikAggregator"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.aggregator = StatistikAggregator()
+        for kategorie, karma in [("lügen", 15), ("gier", 25), ("lügen", 5), ("standard", 7)]:
+            self.aggregator.erfasse(kategorie, karma)
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures after each test method."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_running_values(self):
+        """Test count, sum, min, max, mean and per-category values"""
+        stand = self.aggregator.momentaufnahme()
+        self.assertEqual((stand.anzahl, stand.summe, stand.minimum, stand.maximum), (4, 52, 5, 25))
+        self.assertEqual(stand.mittelwert, 13.0)
+        self.assertEqual(stand.kategorien["lügen"], KategorieStatistik(2, 20))
+        self.assertEqual(self.aggregator.kategorie_anzahlen(), {"lügen": 2, "gier": 1, "standard": 1})
+
+    def test_empty(self):
+        """Test the initial state"""
+        stand = StatistikAggregator().momentaufnahme()
+        self.assertEqual((stand.anzahl, stand.minimum, stand.mittelwert, stand.kategorien), (0, None, 0.0, {}))
+
+    def test_snapshot_is_immutable(self):
+        """Test that a snapshot does not change with later confessions"""
+        stand = self.aggregator.momentaufnahme()
+        self.aggregator.erfasse("lügen", 100)
+        self.assertEqual(stand.kategorien["lügen"].anzahl, 2)
+
+    def test_round_trip(self):
+        """Test serialisation via als_dict/aus_dict"""
+        kopie = StatistikAggregator.aus_dict(self.aggregator.als_dict())
+        self.assertEqual(kopie.momentaufnahme(), self.aggregator.momentaufnahme())
+
+    def test_snapshot_is_independent(self):
+        """Test that a snapshot is not changed by later confessions"""
+        aggregator = StatistikAggregator()
+        aggregator.erfasse("geld", 10, 1700000000)
+        kopie = aggregator.schnappschuss()
+        aggregator.erfasse("geld", 20, 1700000060)
+        self.assertEqual((kopie.anzahl, kopie.als_dict()["kategorien"]), (1, {"geld": [1, 10]}))
+        self.assertEqual(kopie.rollups.abfrage(0, 1800000000).anzahl, 1)
+        self.assertEqual(kopie.verteilung.skizze.anzahl, 1)
+        self.assertEqual(aggregator.als_dict()["anzahl"], 2)
+
+    def test_from_history(self):
+        """Test the one-off rebuild for data saved without statistics"""
+        historie = [{"suende": "x", "kategorie": "lügen", "karma": 15}, {"suende": "y", "kategorie": "gier", "karma": 25}]
+        stand = StatistikAggregator.aus_historie(historie).momentaufnahme()
+        self.assertEqual((stand.anzahl, stand.summe, stand.maximum), (2, 40, 25))
+
+    def test_persisted_with_data_file(self):
+        """Test that every storage mode restores the statistics after a restart"""
+        historie = [
+            {"suende": "x", "kategorie": "lügen", "karma": 15, "zeit": 1000},
+            {"suende": "y", "kategorie": "gier", "karma": 25, "zeit": 5000},
+        ]
+        for modus, name in [("json", "d.json"), ("journal", "j.json"), ("sqlite", "s.db")]:
+            dateiname = os.path.join(self.test_dir, name)
+            manager = DateiManager(dateiname, modus=modus)
+            _, geladen, _ = manager.lade_historie()
+            self.assertIsNone(manager.statistik)
+            aggregator = StatistikAggregator()
+            for eintrag in historie:
+                geladen.append(eintrag)
+                aggregator.erfasse_eintrag(eintrag)
+                manager.speichere_daten(aggregator.summe, geladen, aggregator.kategorie_anzahlen(),
+                                        aggregator.als_dict())
+            if modus == "journal":
+                # The journal keeps statistics in the snapshot only
+                manager.kompaktiere(15, geladen[:1], {"lügen": 1},
+                                    StatistikAggregator.aus_historie(historie[:1]).als_dict())
+                manager.speichere_daten(aggregator.summe, geladen, aggregator.kategorie_anzahlen())
+
+            neu = DateiManager(dateiname, modus=modus)
+            _, geladen, _ = neu.lade_historie()
+            self.assertIsNotNone(neu.statistik, modus)
+            wiederhergestellt = StatistikAggregator.lade(neu.statistik, geladen)
+            self.assertEqual(wiederhergestellt.momentaufnahme(), aggregator.momentaufnahme(), modus)
+            self.assertEqual(wiederhergestellt.rollups.abfrage(0, 10000).anzahl, 2, modus)
+            for m in (manager, neu):
+                if modus == "sqlite":
+                    m.speicher.schliesse()
+
+
+if __name__ == '__main__':
+    unittest.main()
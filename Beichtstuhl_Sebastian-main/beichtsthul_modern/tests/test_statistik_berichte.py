@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the paged statistics reports and their background tasks
+"""
+
+import sys
+import os
+import unittest
+import random
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.antwort_generator import AntwortGenerator
+from core.karma_rechner import KarmaRechner
+from core.beicht_analyse import BeichtAnalysator
+from core.statistik_berichte import (
+    filter_bericht, keyword_bericht, neubewertung_bericht, sortier_bericht, KategorieStatistik
+)
+
+try:
+    from tests.qt_app import qt_app
+    from utils.statistics_tasks import StatisticsTask, StatisticsTaskRunner
+except ImportError:
+    StatisticsTaskRunner = None
+
+
+def beispiel_historie(anzahl):
+    return [
+        {"suende": "Ich habe gelogen" if i % 3 == 0 else "Ich war faul", "kategorie": "lügen" if i % 3 == 0 else "faul",
+         "karma": 15 if i % 3 == 0 else 5}
+        for i in range(anzahl)
+    ]
+
+
+class TestStatistikBerichte(unittest.TestCase):
+    """Test cases for the report generators"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.historie = beispiel_historie(1200)
+        self.karma_rechner = KarmaRechner()
+        self.analysator = BeichtAnalysator(AntwortGenerator(), self.karma_rechner)
+
+    def test_filter_streams_partial_results(self):
+        """Test that the filter report yields one cumulative state per page"""
+        staende = list(filter_bericht(self.historie, "GELOGEN", seitengroesse=500))
+        self.assertEqual([s.verarbeitet for s in staende], [500, 1000, 1200])
+        self.assertEqual(staende[-1].ergebnis, {"lügen": KategorieStatistik(400, 6000)})
+        self.assertLess(staende[0].ergebnis["lügen"].anzahl, 400)
+
+    def test_keywords_and_rescoring(self):
+        """Test the per-keyword breakdown and re-scoring under the current rules"""
+        *_, stand = keyword_bericht(self.historie, self.analysator)
+        self.assertEqual(stand.ergebnis["gelogen"], 400)
+        *_, stand = neubewertung_bericht(self.historie, self.analysator, self.karma_rechner)
+        self.assertEqual(stand.ergebnis["lügen"].karma_neu, 400 * 15)
+        self.assertEqual(sum(w.anzahl for w in stand.ergebnis.values()), 1200)
+
+    def test_empty_history(self):
+        """Test that every report ends with a final state for an empty history"""
+        self.assertEqual(list(filter_bericht([], "x"))[-1].ergebnis, {})
+        self.assertEqual(list(sortier_bericht([], lambda e: 0))[-1].ergebnis, [])
+
+    def test_sort_matches_sorted(self):
+        """Test that the block-wise sort equals a stable sorted()"""
+        zufall = random.Random(3)
+        historie = [{"karma": zufall.randint(0, 30)} for _ in range(5000)]
+        for absteigend in (False, True):
+            *_, stand = sortier_bericht(historie, lambda e: e["karma"], absteigend, blockgroesse=700)
+            erwartet = sorted(range(5000), key=lambda i: historie[i]["karma"], reverse=absteigend)
+            self.assertEqual(stand.ergebnis, erwartet)
+
+
+@unittest.skipUnless(StatisticsTaskRunner, "PyQt6 not installed")
+class TestStatisticsTaskRunner(unittest.TestCase):
+    """Test cases for StatisticsTaskRunner"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def test_task_finishes(self):
+        """Test that a task delivers its final state"""
+        runner = StatisticsTaskRunner()
+        ergebnisse = []
+        task = StatisticsTask(lambda: filter_bericht(beispiel_historie(3000), "faul"))
+        task.signals.finished.connect(ergebnisse.append)
+        runner.start(task)
+        self.assertTrue(runner.wait(5000))
+        self.app.processEvents()
+        self.assertEqual(ergebnisse[-1].ergebnis["faul"].anzahl, 2000)
+
+    def test_cancel_stops_between_pages(self):
+        """Test that a cancelled task stops without a final result"""
+        runner = StatisticsTaskRunner()
+        gelesen = []
+
+        def bericht():
+            for stand in filter_bericht(beispiel_historie(100000), "faul", seitengroesse=100):
+                gelesen.append(stand.verarbeitet)
+                if len(gelesen) == 3:
+                    runner.cancel_all()
+                yield stand
+
+        task = StatisticsTask(bericht)
+        ergebnisse, abgebrochen = [], []
+        task.signals.finished.connect(ergebnisse.append)
+        task.signals.cancelled.connect(lambda: abgebrochen.append(True))
+        runner.start(task)
+        self.assertTrue(runner.wait(5000))
+        self.app.processEvents()
+        self.assertEqual((ergebnisse, abgebrochen, len(gelesen)), ([], [True], 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
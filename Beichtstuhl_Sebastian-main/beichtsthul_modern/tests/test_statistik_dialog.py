@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the lazy history table model of the statistics dialog
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from PyQt6.QtCore import Qt
+    from tests.qt_app import qt_app
+    from ui.dialogs.statistik_dialog import HistorienModell, StatistikDialog
+    from utils.statistics_tasks import StatisticsTask, StatisticsTaskRunner
+    from core.statistik_aggregator import StatistikAggregator
+    from core.statistik_berichte import BerichtStand
+except ImportError:
+    HistorienModell = None
+
+
+class ZaehlendeHistorie(list):
+    """History list that counts how many entries were read"""
+
+    gelesen = 0
+
+    def __getitem__(self, index):
+        ergebnis = super().__getitem__(index)
+        self.gelesen += len(ergebnis) if isinstance(index, slice) else 1
+        return ergebnis
+
+
+@unittest.skipUnless(HistorienModell, "PyQt6 not installed")
+class TestHistorienModell(unittest.TestCase):
+    """Test cases for HistorienModell"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.historie = ZaehlendeHistorie(
+            {"suende": f"Sünde {i}", "kategorie": "gier" if i % 2 else "lügen", "karma": i % 7}
+            for i in range(2000)
+        )
+        self.modell = HistorienModell(self.historie, seitengroesse=100)
+
+    def wert(self, zeile, spalte):
+        return self.modell.data(self.modell.index(zeile, spalte))
+
+    def test_rows_are_fetched_lazily(self):
+        """Test that rows are added page by page via fetchMore"""
+        self.assertEqual(self.modell.rowCount(), 100)
+        self.assertTrue(self.modell.canFetchMore())
+        self.modell.fetchMore()
+        self.assertEqual(self.modell.rowCount(), 200)
+        while self.modell.canFetchMore():
+            self.modell.fetchMore()
+        self.assertEqual(self.modell.rowCount(), 2000)
+
+    def test_newest_first_reads_one_page(self):
+        """Test that showing the newest rows reads only the page they are on"""
+        self.assertEqual(self.wert(0, HistorienModell.SPALTE_TEXT), "Sünde 1999")
+        self.assertEqual(self.wert(0, HistorienModell.SPALTE_NUMMER), 2000)
+        self.assertEqual(self.wert(5, HistorienModell.SPALTE_TEXT), "Sünde 1994")
+        self.assertEqual(self.historie.gelesen, 100)
+
+    def test_sort_by_karma(self):
+        """Test sorting by a content column"""
+        self.modell.sort(HistorienModell.SPALTE_KARMA, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.wert(0, HistorienModell.SPALTE_KARMA), 6)
+        self.modell.sort(HistorienModell.SPALTE_KARMA, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(self.wert(0, HistorienModell.SPALTE_KARMA), 0)
+        self.modell.sort(HistorienModell.SPALTE_NUMMER, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(self.wert(0, HistorienModell.SPALTE_TEXT), "Sünde 0")
+
+
+    def test_superseded_sort_is_ignored(self):
+        """Test that a slow sort finishing after a newer one does not replace its order"""
+        runner = StatisticsTaskRunner(max_threads=1)
+        freigabe = threading.Event()
+        # Queued signals must be delivered before the runner is collected
+        self.addCleanup(self.app.processEvents)
+        self.addCleanup(runner.wait)
+        self.addCleanup(freigabe.set)
+        runner.start(StatisticsTask(lambda: iter([freigabe.wait(5) and BerichtStand(0, 0, None)])))
+        modell = HistorienModell(self.historie, seitengroesse=100, runner=runner)
+        self.addCleanup(modell.breche_sortierung_ab)
+        modell.sort(HistorienModell.SPALTE_KARMA, Qt.SortOrder.DescendingOrder)
+        alt = modell._sortier_task
+        modell.sort(HistorienModell.SPALTE_KARMA, Qt.SortOrder.AscendingOrder)
+        neu = modell._sortier_task
+
+        neu.signals.finished.emit(BerichtStand(2000, 2000, list(range(2000))))
+        alt.signals.finished.emit(BerichtStand(2000, 2000, list(reversed(range(2000)))))
+        self.assertEqual(modell.data(modell.index(0, HistorienModell.SPALTE_TEXT)), "Sünde 0")
+
+
+@unittest.skipUnless(HistorienModell, "PyQt6 not installed")
+class TestStatistikDialog(unittest.TestCase):
+    """Test cases for StatistikDialog"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def test_closing_cancels_only_own_tasks(self):
+        """Test that closing the dialog leaves other tasks on the shared runner running"""
+        runner = StatisticsTaskRunner(max_threads=1)
+        freigabe = threading.Event()
+        # Queued signals must be delivered before the runner is collected
+        self.addCleanup(self.app.processEvents)
+        self.addCleanup(runner.wait)
+        self.addCleanup(freigabe.set)
+        fremd = runner.start(StatisticsTask(lambda: iter([freigabe.wait(5) and BerichtStand(0, 0, None)])))
+        historie = [{"suende": "Sünde", "kategorie": "gier", "karma": 3}] * 10
+        dialog = StatistikDialog(3, historie, StatistikAggregator.aus_historie(historie).momentaufnahme(),
+                                 runner=runner)
+        dialog.modell.sort(HistorienModell.SPALTE_KARMA, Qt.SortOrder.DescendingOrder)
+        sortierung = dialog.modell._sortier_task
+        dialog.start_report(lambda: iter([]), str)
+        bericht = dialog.bericht_task
+
+        dialog.done(0)
+        self.assertTrue(sortierung.is_cancelled)
+        self.assertTrue(bericht.is_cancelled)
+        self.assertFalse(fremd.is_cancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()
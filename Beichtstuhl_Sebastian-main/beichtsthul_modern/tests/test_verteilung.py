@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the karma distribution sketches
+"""
+
+import sys
+import os
+import unittest
+import json
+import random
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.verteilung import QuantilSkizze, Histogramm, KarmaVerteilung
+from core.statistik_aggregator import StatistikAggregator
+
+
+class TestQuantilSkizze(unittest.TestCase):
+    """Test cases for QuantilSkizze"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        zufall = random.Random(7)
+        self.werte = [zufall.randint(1, 120) for _ in range(5000)]
+        self.skizze = QuantilSkizze()
+        for wert in self.werte:
+            self.skizze.hinzufuegen(wert)
+
+    def exakt(self, q):
+        return sorted(self.werte)[int(q * (len(self.werte) - 1))]
+
+    def test_relative_error(self):
+        """Test that quantiles stay within the configured relative error"""
+        for q in (0.5, 0.95, 0.99):
+            self.assertAlmostEqual(self.skizze.quantil(q), self.exakt(q), delta=self.exakt(q) * 0.01)
+
+    def test_empty_and_zero(self):
+        """Test the empty sketch and zero values"""
+        self.assertEqual(QuantilSkizze().kennzahlen(), (None, None, None))
+        skizze = QuantilSkizze()
+        skizze.hinzufuegen(0)
+        self.assertEqual(skizze.quantil(0.5), 0.0)
+
+    def test_merge_equals_single_stream(self):
+        """Test that merging two kiosks gives the same sketch as one stream"""
+        a, b = QuantilSkizze(), QuantilSkizze()
+        for i, wert in enumerate(self.werte):
+            (a if i % 2 else b).hinzufuegen(wert)
+        a.verschmelze(b)
+        self.assertEqual(a.kennzahlen(), self.skizze.kennzahlen())
+        with self.assertRaises(ValueError):
+            a.verschmelze(QuantilSkizze(0.05))
+
+    def test_json_round_trip(self):
+        """Test that the sketch survives serialisation to JSON"""
+        kopie = QuantilSkizze.aus_dict(json.loads(json.dumps(self.skizze.als_dict())))
+        self.assertEqual(kopie.anzahl, len(self.werte))
+        self.assertEqual(kopie.kennzahlen(), self.skizze.kennzahlen())
+
+
+class TestHistogramm(unittest.TestCase):
+    """Test cases for Histogramm and KarmaVerteilung"""
+
+    def test_buckets(self):
+        """Test counting into fixed buckets"""
+        histogramm = Histogramm((10, 20))
+        for wert in (5, 10, 15, 25, 30):
+            histogramm.hinzufuegen(wert)
+        self.assertEqual(histogramm.buckets(), [(None, 10, 1), (10, 20, 2), (20, None, 2)])
+
+    def test_merge_and_round_trip(self):
+        """Test merging and JSON serialisation of a distribution"""
+        a, b = KarmaVerteilung(), KarmaVerteilung()
+        a.erfasse(15)
+        b.erfasse(80)
+        a.verschmelze(b)
+        kopie = KarmaVerteilung.aus_dict(json.loads(json.dumps(a.als_dict())))
+        self.assertEqual(kopie.histogramm.anzahlen, a.histogramm.anzahlen)
+        self.assertEqual(sum(kopie.histogramm.anzahlen), 2)
+        with self.assertRaises(ValueError):
+            a.histogramm.verschmelze(Histogramm((1, 2)))
+
+
+class TestAggregatorVerteilung(unittest.TestCase):
+    """Test cases for the distributions kept by StatistikAggregator"""
+
+    def test_snapshot_quantiles(self):
+        """Test total and per-category quantiles in the snapshot"""
+        aggregator = StatistikAggregator()
+        for karma in range(1, 101):
+            aggregator.erfasse("gier" if karma > 50 else "lügen", karma)
+        stand = aggregator.momentaufnahme()
+        self.assertAlmostEqual(stand.quantile.median, 50, delta=1)
+        self.assertAlmostEqual(stand.quantile.p99, 99, delta=1)
+        self.assertAlmostEqual(stand.kategorie_quantile["lügen"].median, 25, delta=1)
+        self.assertEqual(sum(anzahl for _, _, anzahl in stand.histogramm), 100)
+
+    def test_merge_kiosks(self):
+        """Test merging the aggregators of two kiosks"""
+        a, b = StatistikAggregator(), StatistikAggregator()
+        a.erfasse("lügen", 15, 1000)
+        b.erfasse("gier", 25, 2000)
+        a.verschmelze(b)
+        stand = a.momentaufnahme()
+        self.assertEqual((stand.anzahl, stand.summe, stand.minimum, stand.maximum), (2, 40, 15, 25))
+        self.assertEqual(set(stand.kategorie_quantile), {"lügen", "gier"})
+        self.assertEqual(a.rollups.abfrage(0, 3000).anzahl, 2)
+
+    def test_legacy_state_is_rebuilt(self):
+        """Test that a saved state without distributions is rebuilt from the history"""
+        historie = [{"suende": "x", "kategorie": "lügen", "karma": 15}]
+        daten = StatistikAggregator.aus_historie(historie).als_dict()
+        del daten["verteilung"]
+        stand = StatistikAggregator.lade(daten, historie).momentaufnahme()
+        self.assertAlmostEqual(stand.quantile.median, 15, delta=0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for visibility-aware suspending of animated widgets
+"""
+
+import sys
+import os
+import unittest
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from PyQt6.QtCore import Qt, QCoreApplication, QElapsedTimer
+    from PyQt6.QtWidgets import QWidget, QVBoxLayout
+    from tests.qt_app import qt_app
+    from utils.visibility_scheduler import VisibilityScheduler
+except ImportError:
+    VisibilityScheduler = None
+
+
+@unittest.skipUnless(VisibilityScheduler, "PyQt6 not installed")
+class TestVisibilityScheduler(unittest.TestCase):
+    """Test cases for VisibilityScheduler"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = qt_app()
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.scheduler = VisibilityScheduler()
+        self.window = QWidget()
+        self.child = QWidget(self.window)
+        QVBoxLayout(self.window).addWidget(self.child)
+        self.calls = []
+        self.scheduler.register(self.child, lambda: self.calls.append("suspend"),
+                                lambda: self.calls.append("resume"))
+
+    def tearDown(self):
+        self.window.close()
+        self.window.deleteLater()
+        QCoreApplication.processEvents()
+
+    def _process_until(self, condition, timeout_ms=2000):
+        timer = QElapsedTimer()
+        timer.start()
+        while not condition() and timer.elapsed() < timeout_ms:
+            QCoreApplication.processEvents()
+
+    def _show(self):
+        self.window.show()
+        self._process_until(lambda: self.window.windowHandle().isExposed())
+
+    def test_suspended_until_shown(self):
+        """Test that a widget starts suspended and resumes once exposed"""
+        self.assertEqual(self.calls, ["suspend"])
+        self.assertTrue(self.scheduler.is_suspended(self.child))
+        self._show()
+        self.assertEqual(self.calls, ["suspend", "resume"])
+        self.assertFalse(self.scheduler.is_suspended(self.child))
+
+    def test_hidden_widget(self):
+        """Test that hiding and showing the widget suspends and resumes it"""
+        self._show()
+        self.child.hide()
+        self.assertTrue(self.scheduler.is_suspended(self.child))
+        self.child.show()
+        self.assertEqual(self.calls, ["suspend", "resume", "suspend", "resume"])
+
+    def test_minimised_window(self):
+        """Test that minimising the window suspends and restoring resumes"""
+        self._show()
+        self.window.setWindowState(Qt.WindowState.WindowMinimized)
+        self._process_until(lambda: self.scheduler.is_suspended(self.child))
+        self.assertTrue(self.scheduler.is_suspended(self.child))
+        self.window.setWindowState(Qt.WindowState.WindowNoState)
+        self._process_until(lambda: not self.scheduler.is_suspended(self.child))
+        self.assertEqual(self.calls, ["suspend", "resume", "suspend", "resume"])
+
+    def test_unexposed_window(self):
+        """Test that a hidden window suspends without duplicate calls"""
+        self._show()
+        self.window.hide()
+        QCoreApplication.processEvents()
+        self.assertEqual(self.calls, ["suspend", "resume", "suspend"])
+
+
+if __name__ == '__main__':
+    unittest.main()
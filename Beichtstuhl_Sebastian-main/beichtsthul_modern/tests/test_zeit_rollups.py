@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the time-bucketed rollups
+"""
+
+import sys
+import os
+import unittest
+import json
+
+# Add the project root to sys.path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.zeit_rollups import ZeitRollups, KategorieStatistik, MINUTE, STUNDE, TAG
+
+# Monday 2024-01-01 00:00 UTC
+MONTAG = 1704067200
+
+
+class TestZeitRollups(unittest.TestCase):
+    """Test cases for ZeitRollups"""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.rollups = ZeitRollups()
+        self.rollups.erfasse(MONTAG + 10 * STUNDE + 5 * MINUTE, "lügen", 15)
+        self.rollups.erfasse(MONTAG + 10 * STUNDE + 50 * MINUTE, "gier", 25)
+        self.rollups.erfasse(MONTAG + TAG + 3 * STUNDE, "lügen", 5)
+
+    def test_range_query(self):
+        """Test totals and per-category sums for a time range"""
+        woche = self.rollups.abfrage(MONTAG, MONTAG + 7 * TAG)
+        self.assertEqual((woche.anzahl, woche.karma), (3, 45))
+        self.assertEqual(woche.kategorien["lügen"], KategorieStatistik(2, 20))
+
+        stunde = self.rollups.abfrage(MONTAG + 10 * STUNDE, MONTAG + 10 * STUNDE + 30 * MINUTE)
+        self.assertEqual((stunde.anzahl, stunde.karma), (1, 15))
+        self.assertEqual(self.rollups.abfrage(MONTAG, MONTAG + 7 * TAG, kategorie="gier").karma, 25)
+
+    def test_unaligned_bounds(self):
+        """Test ranges that do not start or end on bucket boundaries"""
+        ergebnis = self.rollups.abfrage(MONTAG + 10 * STUNDE + 4 * MINUTE, MONTAG + TAG + 3 * STUNDE + 1)
+        self.assertEqual(ergebnis.anzahl, 3)
+        ergebnis = self.rollups.abfrage(MONTAG + 10 * STUNDE + 6 * MINUTE, MONTAG + TAG)
+        self.assertEqual(ergebnis.anzahl, 1)
+
+    def test_hourly_series(self):
+        """Test the per-hour series for one day"""
+        verlauf = self.rollups.verlauf(MONTAG, MONTAG + TAG, STUNDE)
+        self.assertEqual(len(verlauf), 24)
+        self.assertEqual(verlauf[10], (MONTAG + 10 * STUNDE, 2, 40))
+        self.assertEqual(sum(anzahl for _, anzahl, _ in verlauf), 2)
+
+    def test_old_buckets_are_downsampled(self):
+        """Test that fine buckets age out while day totals remain"""
+        self.rollups.erfasse(MONTAG + 200 * TAG, "standard", 7)
+        self.assertNotIn(MONTAG + 10 * STUNDE, self.rollups._buckets[STUNDE])
+        self.assertNotIn(MONTAG + 10 * STUNDE + 5 * MINUTE, self.rollups._buckets[MINUTE])
+        self.assertEqual(self.rollups.abfrage(MONTAG, MONTAG + 2 * TAG).anzahl, 3)
+        # Minute and hour resolution are gone: partly covered days count whole
+        self.assertEqual(self.rollups.abfrage(MONTAG + 10 * STUNDE, MONTAG + TAG).anzahl, 2)
+        self.assertEqual(self.rollups.abfrage(MONTAG + 11 * STUNDE + 7 * MINUTE, MONTAG + TAG + 1).anzahl, 3)
+
+    def test_partly_thinned_range_keeps_counts(self):
+        """Test that a range starting inside a thinned hour counts that whole hour"""
+        rollups = ZeitRollups(minuten_aufbewahrung=STUNDE, stunden_aufbewahrung=30 * TAG)
+        rollups.erfasse(MONTAG + 10 * STUNDE + 20 * MINUTE, "gier", 10)
+        rollups.erfasse(MONTAG + 10 * STUNDE + 40 * MINUTE, "gier", 20)
+        rollups.erfasse(MONTAG + 14 * STUNDE, "standard", 7)
+        self.assertNotIn(MONTAG + 10 * STUNDE + 40 * MINUTE, rollups._buckets[MINUTE])
+        ergebnis = rollups.abfrage(MONTAG + 10 * STUNDE + 30 * MINUTE, MONTAG + 12 * STUNDE)
+        self.assertEqual((ergebnis.anzahl, ergebnis.karma), (2, 30))
+        ergebnis = rollups.abfrage(MONTAG + 9 * STUNDE, MONTAG + 10 * STUNDE + 30 * MINUTE)
+        self.assertEqual(ergebnis.anzahl, 2)
+        self.assertEqual(rollups.abfrage(MONTAG, MONTAG + TAG).anzahl, 3)
+
+    def test_out_of_order_buckets_are_thinned(self):
+        """Test that buckets booked after newer ones still age out"""
+        rollups = ZeitRollups(minuten_aufbewahrung=STUNDE, stunden_aufbewahrung=TAG)
+        rollups.erfasse(MONTAG + 3 * TAG, "standard", 1)
+        # Booked late, behind the newer buckets
+        rollups.erfasse(MONTAG + 2 * STUNDE, "standard", 1)
+        rollups.erfasse(MONTAG + 3 * TAG + 2 * MINUTE, "standard", 1)
+        self.assertEqual(list(rollups._buckets[MINUTE]), [MONTAG + 3 * TAG, MONTAG + 3 * TAG + 2 * MINUTE])
+        self.assertEqual(list(rollups._buckets[STUNDE]), [MONTAG + 3 * TAG])
+        self.assertEqual(rollups.abfrage(MONTAG, MONTAG + 4 * TAG).anzahl, 3)
+
+    def test_bounded_bucket_lookups(self):
+        """Test that a long range is answered from a bounded number of buckets"""
+        zugriffe = list(self.rollups._zerlege(MONTAG + 1, MONTAG + 365 * TAG - 1))
+        self.assertLessEqual(len(zugriffe), 3)
+        self.assertEqual(sum(b[0] for b in zugriffe), 3)
+
+    def test_json_round_trip(self):
+        """Test that rollups survive serialisation to JSON"""
+        kopie = ZeitRollups.aus_dict(json.loads(json.dumps(self.rollups.als_dict())))
+        self.assertEqual(kopie.abfrage(MONTAG, MONTAG + 7 * TAG), self.rollups.abfrage(MONTAG, MONTAG + 7 * TAG))
+        kopie.erfasse(MONTAG + TAG + 3 * STUNDE, "lügen", 5)
+        self.assertEqual(kopie.abfrage(MONTAG + TAG, MONTAG + 2 * TAG).anzahl, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
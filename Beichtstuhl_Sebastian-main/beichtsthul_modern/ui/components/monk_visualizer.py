@@ -10,11 +10,25 @@ Features a 280x280px display with a glow ring effect.
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGraphicsDropShadowEffect
 from PyQt6.QtGui import QColor
 from utils.lottie_player import LottiePlayer
-import os
+from utils.animation_registry import animation_registry
+from utils.resource_loader import resource_loader
+from ui.resources.animations import AnimationDefinitions
+from core.constants import MONK_ANIMATIONS
 
 class MonkVisualizer(QWidget):
     """A widget to display the monk's Lottie animations."""
 
+    # Other names accepted by set_emotion, mapped to the emotions of MONK_ANIMATIONS
+    EMOTION_ALIASES = {
+        "idle": "neutral",
+        "angry": "genervt",
+        "laugh": "lachend",
+        "sad": "urteilend",
+        "shocked": "schockiert",
+        "contemplative": "neutral",
+        "disappointed": "urteilend"
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("monkVisualizer")
@@ -30,18 +44,23 @@ class MonkVisualizer(QWidget):
         # Add glow effect
         self.setup_glow_effect()
         
-        # Define the paths to the Lottie animation files
+        # Resolve every emotion (and alias) to its animation file once, relative
+        # to the package rather than the working directory
         self.animation_paths = {
-            "idle": "beichtsthul_modern/assets/animations/monk_idle.json",
-            "neutral": "beichtsthul_modern/assets/animations/monk_idle.json",
-            "angry": "beichtsthul_modern/assets/animations/monk_angry.json",
-            "laugh": "beichtsthul_modern/assets/animations/monk_laughing.json",
-            "sad": "beichtsthul_modern/assets/animations/monk_sad.json",
-            "shocked": "beichtsthul_modern/assets/animations/monk_shocked.json"
+            emotion: resource_loader.get_animation_path(name)
+            for emotion, name in MONK_ANIMATIONS.items()
         }
+        for alias, emotion in self.EMOTION_ALIASES.items():
+            self.animation_paths[alias] = self.animation_paths[emotion]
+        # emotion -> LottieAnimation, filled as the registry parses the files
+        self.animations = {}
+        self._unknown_emotions = set()
         
         # Set the initial emotion
-        self.set_emotion("idle")
+        self.set_emotion("neutral")
+        
+        # Parse the other animations in idle time, so switching is instant
+        animation_registry.warm(dict.fromkeys(self.animation_paths.values()), self._animation_ready)
 
     def setup_glow_effect(self):
         """Setup the glow ring effect around the monk visualizer."""
@@ -59,18 +78,46 @@ class MonkVisualizer(QWidget):
         Lottie animation.
 
         Args:
-            emotion (str): The name of the emotion (e.g., "idle", "angry").
+            emotion (str): The name of the emotion (e.g., "neutral", "genervt").
         """
-        animation_path = self.animation_paths.get(emotion.lower())
+        emotion = emotion.lower()
+        animation = self.animations.get(emotion)
+        if animation is None and emotion not in self._unknown_emotions:
+            animation = self._load_animation(emotion)
+            if animation is None:
+                # Warn once; later switches go straight to the fallback
+                self._unknown_emotions.add(emotion)
+                print(f"Warning: Animation for '{emotion}' not found. Falling back to neutral.")
+        if animation is None:
+            # Fallback to neutral if the requested emotion is not found
+            animation = self.animations.get("neutral") or self._load_animation("neutral")
+            if animation is None:
+                return
         
-        if animation_path and os.path.exists(animation_path):
-            self.lottie_player.load_animation(animation_path)
-            self.lottie_player.play()
-        else:
-            # Fallback to idle if the requested emotion is not found
-            print(f"Warning: Animation for '{emotion}' not found. Falling back to idle.")
-            self.lottie_player.load_animation(self.animation_paths["idle"])
-            self.lottie_player.play()
+        # Cross-fade from the frame on screen; a burst of switches only
+        # fades towards the latest emotion
+        fade = AnimationDefinitions.monk_emotion_change()
+        self.lottie_player.set_animation(animation, fade["duration"], fade["easing_curve"])
+        self.lottie_player.play()
+
+    def _load_animation(self, emotion):
+        """Parse an animation on first use, before idle-time warming got to it"""
+        animation_path = self.animation_paths.get(emotion)
+        if animation_path is None:
+            return None
+        try:
+            animation = animation_registry.get(animation_path)
+        except Exception as e:
+            print(f"Failed to load Lottie animation: {e}")
+            return None
+        self._animation_ready(animation_path, animation)
+        return animation
+
+    def _animation_ready(self, animation_path, animation):
+        """Store the parsed animation for every emotion that uses the file"""
+        for emotion, path in self.animation_paths.items():
+            if path == animation_path:
+                self.animations[emotion] = animation
 
 if __name__ == "__main__":
     import sys
@@ -88,7 +135,7 @@ if __name__ == "__main__":
 
     # Buttons to test emotions
     button_layout = QHBoxLayout()
-    emotions = ["idle", "angry", "laugh", "sad", "shocked"]
+    emotions = ["neutral", "urteilend", "genervt", "lachend", "schockiert"]
     for e in emotions:
         btn = QPushButton(e.capitalize())
         btn.clicked.connect(lambda _, em=e: monk_visualizer.set_emotion(em))
@@ -13,6 +13,7 @@ from PyQt6.QtGui import QClipboard, QGuiApplication, QPainter, QColor, QPen, QFo
 from core.constants import COLOR_PRIMARY_TEXT, COLOR_SECONDARY_BG, COLOR_PRIMARY_ACCENT
 from design_tokens.design_tokens import ColorTokens, FontTokens
 from utils.resource_loader import resource_loader
+from utils.visibility_scheduler import VisibilityScheduler
 import random
 
 
@@ -34,6 +35,9 @@ class ResponseDisplay(QWidget):
         
         # Then initialize UI
         self.init_ui()
+        
+        # Type only while the text can be seen
+        VisibilityScheduler.instance().register(self, self.suspend_animations, self.resume_animations)
 
     def init_ui(self):
         """Initialize the user interface"""
@@ -80,6 +84,8 @@ class ResponseDisplay(QWidget):
     def setup_animations(self):
         """Setup animations for the response display"""
         # Text reveal animation
+        self._reveal_suspended = False
+        self._reveal_pending = False
         self.text_reveal_timer = QTimer()
         self.text_reveal_timer.timeout.connect(self.reveal_next_character)
         
@@ -95,9 +101,14 @@ class ResponseDisplay(QWidget):
         self.response_label.setText("")
         
         # Start text reveal animation
-        if text:
+        if text and self._reveal_suspended:
+            self.text_reveal_timer.stop()
+            self._reveal_pending = True
+        elif text:
             self.text_reveal_timer.start(25)  # Reveal one character every 25ms
         else:
+            self.text_reveal_timer.stop()
+            self._reveal_pending = False
             self.response_label.setText("Sprich, und ich werde urteilen...")
 
     def reveal_next_character(self):
@@ -108,6 +119,20 @@ class ResponseDisplay(QWidget):
         else:
             self.text_reveal_timer.stop()
 
+    def suspend_animations(self):
+        """Stop typing while the display cannot be seen (called by the scheduler)"""
+        self._reveal_suspended = True
+        if self.text_reveal_timer.isActive():
+            self.text_reveal_timer.stop()
+            self._reveal_pending = True
+
+    def resume_animations(self):
+        """Continue typing where suspend_animations() stopped"""
+        self._reveal_suspended = False
+        if self._reveal_pending:
+            self._reveal_pending = False
+            self.text_reveal_timer.start(25)
+
     def update_emotional_indicator(self):
         """Update the emotional indicator based on current emotion"""
         indicators = {
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Statistics Dialog for Beichtsthul Modern
+A Qt dialog with the pre-computed summary numbers and a virtualised,
+lazily loaded and sortable table over the confession history.
+"""
+
+import time
+from collections import OrderedDict
+from functools import partial
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton,
+    QGroupBox, QTableView, QHeaderView, QAbstractItemView, QLineEdit, QProgressBar
+)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from core.json_strom_leser import suenden_text
+from core.statistik_berichte import sortier_bericht, filter_bericht, keyword_bericht, neubewertung_bericht
+from utils.statistics_tasks import StatisticsTask
+from design_tokens.design_tokens import ColorTokens, FontTokens
+
+
+class HistorienModell(QAbstractTableModel):
+    """
+    Tabellenmodell über die Beicht-Historie
+
+    Die View sieht zunächst nur eine Seite; weitere Zeilen kommen über
+    canFetchMore/fetchMore beim Scrollen. Einträge werden seitenweise aus
+    der Historie gelesen und in einem begrenzten Cache gehalten, so dass
+    auch eine Million Zeilen nie vollständig im Speicher liegen.
+    """
+
+    SPALTEN = ["#", "Zeit", "Kategorie", "Karma", "Beichte"]
+    SPALTE_NUMMER, SPALTE_ZEIT, SPALTE_KATEGORIE, SPALTE_KARMA, SPALTE_TEXT = range(5)
+
+    def __init__(self, historie, seitengroesse=500, cache_seiten=8, runner=None, parent=None):
+        """
+        Args:
+            historie: Liste oder BeichtHistorie (len, Slicing und Indexzugriff)
+            seitengroesse: Zeilen pro fetchMore und pro Lesezugriff
+            cache_seiten: Anzahl Seiten, die im Speicher bleiben
+            runner: Optionaler StatisticsTaskRunner für Sortierungen im Hintergrund
+        """
+        super().__init__(parent)
+        self._historie = historie
+        self._runner = runner
+        self._sortier_task = None
+        # Zählt Sortierungen; nur das Ergebnis der neuesten wird übernommen
+        self._sortier_nummer = 0
+        self._gesamt = len(historie)
+        self._geladen = min(seitengroesse, self._gesamt)
+        self.seitengroesse = seitengroesse
+        self.cache_seiten = cache_seiten
+        # seitennummer -> Liste von Einträgen (LRU)
+        self._seiten = OrderedDict()
+        # position -> Eintrag (LRU) für sortierte Ansichten
+        self._einzeln = OrderedDict()
+        # Neueste zuerst, bis eine andere Sortierung gewählt wird
+        self._absteigend = True
+        # Zeile -> Position in der Historie, nur für Sortierung nach Inhalt
+        self._reihenfolge = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._geladen
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.SPALTEN)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.SPALTEN[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._geladen < self._gesamt
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        neu = min(self.seitengroesse, self._gesamt - self._geladen)
+        if neu <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._geladen, self._geladen + neu - 1)
+        self._geladen += neu
+        self.endInsertRows()
+
+    def _position(self, zeile):
+        """Position des Eintrags einer Zeile in der Historie"""
+        if self._reihenfolge is not None:
+            return self._reihenfolge[zeile]
+        return self._gesamt - 1 - zeile if self._absteigend else zeile
+
+    def _eintrag(self, position):
+        """Liest einen Eintrag über den Seiten-Cache"""
+        if self._reihenfolge is not None:
+            # Sortiert liegen benachbarte Zeilen verstreut: einzeln lesen statt ganze Seiten
+            eintrag = self._einzeln.get(position)
+            if eintrag is None:
+                eintrag = self._einzeln[position] = self._historie[position]
+                if len(self._einzeln) > self.seitengroesse:
+                    self._einzeln.popitem(last=False)
+            else:
+                self._einzeln.move_to_end(position)
+            return eintrag
+        nummer = position // self.seitengroesse
+        seite = self._seiten.get(nummer)
+        if seite is None:
+            start = nummer * self.seitengroesse
+            seite = self._historie[start:start + self.seitengroesse]
+            self._seiten[nummer] = seite
+            if len(self._seiten) > self.cache_seiten:
+                self._seiten.popitem(last=False)
+        else:
+            self._seiten.move_to_end(nummer)
+        return seite[position - nummer * self.seitengroesse]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._geladen:
+            return None
+        spalte = index.column()
+        if role == Qt.ItemDataRole.TextAlignmentRole and spalte in (self.SPALTE_NUMMER, self.SPALTE_KARMA):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        position = self._position(index.row())
+        if spalte == self.SPALTE_NUMMER:
+            return position + 1
+        eintrag = self._eintrag(position)
+        if spalte == self.SPALTE_ZEIT:
+            zeit = eintrag.get("zeit")
+            return time.strftime("%d.%m.%Y %H:%M", time.localtime(zeit)) if zeit is not None else ""
+        if spalte == self.SPALTE_KATEGORIE:
+            return eintrag.get("kategorie", "standard").title()
+        if spalte == self.SPALTE_KARMA:
+            return eintrag.get("karma", 0)
+        return suenden_text(eintrag)
+
+    def _schluessel(self, spalte):
+        """Sortierschlüssel-Funktion einer Inhaltsspalte"""
+        if spalte == self.SPALTE_KATEGORIE:
+            return lambda eintrag: eintrag.get("kategorie", "standard")
+        if spalte == self.SPALTE_KARMA:
+            return lambda eintrag: eintrag.get("karma", 0)
+        return lambda eintrag: suenden_text(eintrag).lower()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """
+        Sortiert die Tabelle
+
+        Nummer und Zeit folgen der Reihenfolge der Historie und kosten nichts;
+        für Kategorie, Karma und Text wird einmal über die Historie gelesen
+        und nur die Positionen sortiert, nicht die Einträge. Mit einem
+        StatisticsTaskRunner läuft das im Hintergrund und die Tabelle
+        springt um, sobald die Reihenfolge fertig ist.
+        """
+        absteigend = order == Qt.SortOrder.DescendingOrder
+        self.breche_sortierung_ab()
+        if column in (self.SPALTE_NUMMER, self.SPALTE_ZEIT):
+            self._setze_reihenfolge(None, absteigend)
+            return
+        bericht = partial(sortier_bericht, self._historie, self._schluessel(column), absteigend, self.seitengroesse)
+        if self._runner is None:
+            for stand in bericht():
+                pass
+            self._setze_reihenfolge(stand.ergebnis, absteigend)
+            return
+        task = StatisticsTask(bericht)
+        # Der Slot darf den Task nicht referenzieren: Ein Zyklus über den
+        # Slot kann von der GC abgeräumt werden, während das Signal noch
+        # in der Warteschlange steht (Absturz bei der Zustellung)
+        nummer = self._sortier_nummer
+        task.signals.finished.connect(lambda stand: self._sortierung_fertig(nummer, stand, absteigend))
+        self._sortier_task = self._runner.start(task)
+
+    def breche_sortierung_ab(self):
+        """Bricht eine laufende Hintergrund-Sortierung ab"""
+        self._sortier_nummer += 1
+        if self._sortier_task is not None:
+            self._sortier_task.cancel()
+            self._sortier_task = None
+
+    def _sortierung_fertig(self, nummer, stand, absteigend):
+        """Übernimmt eine fertige Sortierung (ersetzte oder abgebrochene werden verworfen)"""
+        if nummer != self._sortier_nummer or self._sortier_task is None:
+            return
+        self._sortier_task = None
+        self._setze_reihenfolge(stand.ergebnis, absteigend)
+
+    def _setze_reihenfolge(self, reihenfolge, absteigend):
+        """Übernimmt eine neue Zeilenreihenfolge (None = Historien-Reihenfolge)"""
+        self.layoutAboutToBeChanged.emit()
+        self._reihenfolge = reihenfolge
+        self._absteigend = absteigend
+        self.layoutChanged.emit()
+
+
+class StatistikDialog(QDialog):
+    """Statistik-Dialog mit Kennzahlen und virtualisierter Historien-Tabelle"""
+
+    def __init__(self, karma_schulden, beicht_historie, statistik, runner=None,
+                 analysator=None, karma_rechner=None, parent=None):
+        """
+        Args:
+            karma_schulden: Aktuelle Karma-Schulden
+            beicht_historie: Liste oder BeichtHistorie
+            statistik: StatistikMomentaufnahme des StatistikAggregator
+            runner: StatisticsTaskRunner; ohne ihn gibt es keine Berichte
+            analysator: BeichtAnalysator für Keyword-Bericht und Neubewertung
+            karma_rechner: KarmaRechner für die Neubewertung
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Deine Sünden-Statistiken")
+        self.setMinimumSize(720, 620)
+
+        self.karma_schulden = karma_schulden
+        self.beicht_historie = beicht_historie
+        self.statistik = statistik
+        self.runner = runner
+        self.analysator = analysator
+        self.karma_rechner = karma_rechner
+        self.bericht_task = None
+        # Counts started reports; results of replaced reports are ignored
+        self._bericht_nummer = 0
+        self.modell = HistorienModell(beicht_historie, runner=runner, parent=self)
+
+        # Setup UI
+        self.init_ui()
+
+        # Apply styles
+        self.apply_styles()
+
+    def init_ui(self):
+        """Initialize the user interface"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+
+        # Summary numbers come from the aggregator; nothing here scans the history
+        self.create_summary_group(layout)
+
+        # Reports that scan the history run on the task runner
+        if self.runner is not None:
+            self.create_reports_group(layout)
+
+        # History table
+        self.create_history_group(layout)
+
+        # Buttons
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        self.close_button = QPushButton("Schließen")
+        self.close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(self.close_button)
+        layout.addLayout(buttons_layout)
+
+        # Set accessible names and descriptions
+        self.set_accessible_info()
+
+    def create_summary_group(self, parent_layout):
+        """Create the summary numbers group"""
+        summary_group = QGroupBox("Kennzahlen")
+        summary_group.setProperty("type", "section")
+        summary_layout = QGridLayout(summary_group)
+
+        stand = self.statistik
+        zeilen = [
+            ("Gesamt Karma-Schulden:", str(self.karma_schulden)),
+            ("Anzahl Beichten:", str(stand.anzahl)),
+            ("Durchschnitt pro Beichte:", f"{stand.mittelwert:.1f}"),
+            ("Kleinste / größte Schuld:", f"{_formatiere(stand.minimum)} / {_formatiere(stand.maximum)}"),
+            ("Median / p95 / p99:", " / ".join(_formatiere(wert) for wert in stand.quantile)),
+        ]
+        for zeile, (titel, wert) in enumerate(zeilen):
+            titel_label = QLabel(titel)
+            titel_label.setProperty("type", "caption")
+            summary_layout.addWidget(titel_label, zeile, 0)
+            summary_layout.addWidget(QLabel(wert), zeile, 1)
+
+        # Per-category breakdown
+        kategorien = sorted(stand.kategorien.items(), key=lambda paar: -paar[1].anzahl)
+        for zeile, (kategorie, werte) in enumerate(kategorien, start=len(zeilen)):
+            prozent = werte.anzahl / stand.anzahl * 100 if stand.anzahl else 0.0
+            quantile = stand.kategorie_quantile.get(kategorie)
+            text = f"{werte.anzahl}x ({prozent:.1f}%), {werte.karma} Karma"
+            if quantile is not None:
+                text += f", Median {_formatiere(quantile.median)}"
+            summary_layout.addWidget(QLabel(f"• {kategorie.title()}:"), zeile, 0)
+            summary_layout.addWidget(QLabel(text), zeile, 1)
+
+        parent_layout.addWidget(summary_group)
+
+    def create_reports_group(self, parent_layout):
+        """Create the background reports group"""
+        reports_group = QGroupBox("Berichte")
+        reports_group.setProperty("type", "section")
+        reports_layout = QVBoxLayout(reports_group)
+
+        controls_layout = QHBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Text in Beichten suchen…")
+        self.filter_button = QPushButton("Filtern")
+        self.keyword_button = QPushButton("Keywords")
+        self.rescore_button = QPushButton("Neu bewerten")
+        controls_layout.addWidget(self.filter_input, 1)
+        controls_layout.addWidget(self.filter_button)
+        controls_layout.addWidget(self.keyword_button)
+        controls_layout.addWidget(self.rescore_button)
+        reports_layout.addLayout(controls_layout)
+
+        self.report_progress = QProgressBar()
+        self.report_progress.setRange(0, 100)
+        self.report_progress.setValue(0)
+        self.report_label = QLabel("")
+        self.report_label.setWordWrap(True)
+        reports_layout.addWidget(self.report_progress)
+        reports_layout.addWidget(self.report_label)
+
+        self.filter_button.clicked.connect(self.start_filter_report)
+        self.filter_input.returnPressed.connect(self.start_filter_report)
+        self.keyword_button.clicked.connect(self.start_keyword_report)
+        self.rescore_button.clicked.connect(self.start_rescore_report)
+        has_analysis = self.analysator is not None
+        self.keyword_button.setEnabled(has_analysis)
+        self.rescore_button.setEnabled(has_analysis and self.karma_rechner is not None)
+
+        parent_layout.addWidget(reports_group)
+
+    def start_report(self, bericht, formatierer):
+        """
+        Start a report on the task runner, replacing the running one
+
+        Args:
+            bericht: Callable returning a report generator
+            formatierer: Function BerichtStand.ergebnis -> display text
+        """
+        self.cancel_report()
+        task = StatisticsTask(bericht)
+        # Slots capture a number, not the task (see HistorienModell.sort)
+        nummer = self._bericht_nummer
+        task.signals.partial_result.connect(lambda stand: self.show_report(nummer, stand, formatierer))
+        task.signals.finished.connect(lambda stand: self.show_report(nummer, stand, formatierer))
+        task.signals.failed.connect(self.report_label.setText)
+        self.bericht_task = self.runner.start(task)
+        self.report_progress.setValue(0)
+        self.report_label.setText("Wird berechnet…")
+
+    def cancel_report(self):
+        """Cancel the running report; results still in flight are ignored"""
+        self._bericht_nummer += 1
+        if self.bericht_task is not None:
+            self.bericht_task.cancel()
+            self.bericht_task = None
+
+    def show_report(self, nummer, stand, formatierer):
+        """Show a partial or final report result (ignores replaced reports)"""
+        if nummer != self._bericht_nummer:
+            return
+        self.report_progress.setValue(100 * stand.verarbeitet // stand.gesamt if stand.gesamt else 100)
+        self.report_label.setText(formatierer(stand.ergebnis))
+
+    def start_filter_report(self):
+        """Count and karma per category for confessions containing the filter text"""
+        suchtext = self.filter_input.text().strip()
+        if not suchtext:
+            return
+        self.start_report(
+            lambda: filter_bericht(self.beicht_historie, suchtext),
+            lambda ergebnis: ", ".join(
+                f"{kategorie.title()}: {werte.anzahl}x / {werte.karma} Karma"
+                for kategorie, werte in sorted(ergebnis.items(), key=lambda paar: -paar[1].anzahl)
+            ) or "Keine Treffer"
+        )
+
+    def start_keyword_report(self):
+        """Hits per keyword over the whole history"""
+        self.start_report(
+            lambda: keyword_bericht(self.beicht_historie, self.analysator),
+            lambda ergebnis: ", ".join(
+                f"{wort}: {anzahl}x"
+                for wort, anzahl in sorted(ergebnis.items(), key=lambda paar: -paar[1])[:15]
+            ) or "Keine Keywords gefunden"
+        )
+
+    def start_rescore_report(self):
+        """Re-score the history under the current rules"""
+        self.start_report(
+            lambda: neubewertung_bericht(self.beicht_historie, self.analysator, self.karma_rechner),
+            lambda ergebnis: ", ".join(
+                f"{kategorie.title()}: {werte.karma_alt} → {werte.karma_neu} Karma"
+                for kategorie, werte in sorted(ergebnis.items(), key=lambda paar: -paar[1].anzahl)
+            ) or "Keine Beichten"
+        )
+
+    def done(self, result):
+        """Cancel this dialog's background work when it closes (the runner is shared)"""
+        self.cancel_report()
+        self.modell.breche_sortierung_ab()
+        super().done(result)
+
+    def create_history_group(self, parent_layout):
+        """Create the history table group"""
+        history_group = QGroupBox("Verlauf")
+        history_group.setProperty("type", "section")
+        history_layout = QVBoxLayout(history_group)
+
+        self.table = QTableView()
+        self.table.setModel(self.modell)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(HistorienModell.SPALTE_NUMMER, Qt.SortOrder.DescendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        # Fixed row height and column modes keep Qt from measuring every row
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        history_layout.addWidget(self.table)
+
+        parent_layout.addWidget(history_group, 1)
+
+    def set_accessible_info(self):
+        """Sets accessible names and descriptions for widgets."""
+        if self.runner is not None:
+            self.filter_input.setAccessibleName("Textfilter")
+            self.filter_input.setAccessibleDescription("Zählt Beichten, die diesen Text enthalten.")
+            self.keyword_button.setAccessibleName("Keywords")
+            self.keyword_button.setAccessibleDescription("Zählt die Treffer pro Keyword im Hintergrund.")
+            self.rescore_button.setAccessibleName("Neu bewerten")
+            self.rescore_button.setAccessibleDescription("Bewertet alle Beichten mit den aktuellen Regeln neu.")
+        self.table.setAccessibleName("Beicht-Verlauf")
+        self.table.setAccessibleDescription("Alle Beichten; Spaltenköpfe sortieren die Tabelle.")
+        self.close_button.setAccessibleName("Schließen")
+        self.close_button.setAccessibleDescription("Schließt die Statistiken.")
+
+    def apply_styles(self):
+        """Apply cyberpunk styling to the dialog"""
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {ColorTokens.BG_BASE.value};
+                color: {ColorTokens.TEXT_PRIMARY.value};
+                font-family: "{FontTokens.BODY_FAMILY.value}";
+            }}
+
+            QGroupBox {{
+                background-color: {ColorTokens.BG_PANEL.value};
+                border: 1px solid {ColorTokens.ACCENT_2.value};
+                border-radius: {8}px;
+                margin-top: 1ex;
+                padding-top: 10px;
+                font-family: "{FontTokens.HEADLINE_FAMILY.value}";
+                font-size: {FontTokens.HEADLINE_SIZE_H4.value}px;
+                color: {ColorTokens.ACCENT_1.value};
+            }}
+
+            QLabel {{
+                color: {ColorTokens.TEXT_PRIMARY.value};
+                font-family: "{FontTokens.BODY_FAMILY.value}";
+                font-size: {FontTokens.BODY_SIZE_BODY.value}px;
+            }}
+
+            QLineEdit {{
+                background-color: {ColorTokens.BG_BASE.value};
+                color: {ColorTokens.TEXT_PRIMARY.value};
+                border: 2px solid {ColorTokens.BG_PANEL.value};
+                border-radius: {4}px;
+                padding: {4}px;
+                font-family: "{FontTokens.BODY_FAMILY.value}";
+                font-size: {FontTokens.BODY_SIZE_BODY.value}px;
+            }}
+
+            QLineEdit:focus {{
+                border: 2px solid {ColorTokens.ACCENT_1.value};
+            }}
+
+            QTableView {{
+                background-color: {ColorTokens.BG_BASE.value};
+                alternate-background-color: {ColorTokens.BG_PANEL.value};
+                color: {ColorTokens.TEXT_PRIMARY.value};
+                gridline-color: {ColorTokens.BG_PANEL.value};
+                selection-background-color: {ColorTokens.ACCENT_2.value};
+                font-family: "{FontTokens.BODY_FAMILY.value}";
+                font-size: {FontTokens.BODY_SIZE_BODY.value}px;
+            }}
+
+            QHeaderView::section {{
+                background-color: {ColorTokens.BG_PANEL.value};
+                color: {ColorTokens.ACCENT_1.value};
+                border: none;
+                padding: {4}px;
+            }}
+
+            QPushButton {{
+                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1,
+                    stop: 0 {ColorTokens.ACCENT_1.value}, stop: 1 {ColorTokens.ACCENT_2.value});
+                color: {ColorTokens.BG_BASE.value};
+                border: none;
+                border-radius: {4}px;
+                padding: {8}px {16}px;
+                font-family: "{FontTokens.BODY_FAMILY.value}";
+                font-size: {FontTokens.BODY_SIZE_BODY.value}px;
+                font-weight: {FontTokens.BODY_WEIGHT_BOLD.value};
+                min-height: 30px;
+            }}
+        """)
+
+
+def _formatiere(wert):
+    """Kennzahl für die Anzeige ("-" ohne Wert)"""
+    return "-" if wert is None else f"{wert:.0f}"
@@ -12,6 +12,7 @@ from PyQt6.QtGui import QPainter, QColor
 from PyQt6.QtWidgets import QGraphicsView
 
 from .parallax_scene import ParallaxScene
+from utils.visibility_scheduler import VisibilityScheduler
 
 class ParallaxBackground(QGraphicsView):
     """
@@ -43,6 +44,10 @@ class ParallaxBackground(QGraphicsView):
         self._parallax_timer.timeout.connect(self._flush_parallax)
         self._parallax_pending = False
         self._last_mouse_pos = QPointF(self.viewport().width() / 2, self.viewport().height() / 2)
+        self._suspended = False
+
+        # No parallax updates while the window is hidden, minimised or covered
+        VisibilityScheduler.instance().register(self, self.suspend_parallax, self.resume_parallax)
 
     def mouseMoveEvent(self, event):
         """Handle mouse movement to update the parallax effect (throttled)."""
@@ -51,7 +56,8 @@ class ParallaxBackground(QGraphicsView):
         if not self._parallax_pending:
             self._parallax_pending = True
             # 16 ms ~ 60 Hz
-            self._parallax_timer.start(16)
+            if not self._suspended:
+                self._parallax_timer.start(16)
         super().mouseMoveEvent(event)
 
     def _flush_parallax(self):
@@ -60,6 +66,17 @@ class ParallaxBackground(QGraphicsView):
         view_center = QPointF(self.viewport().width() / 2, self.viewport().height() / 2)
         self.scene.update_parallax(self._last_mouse_pos, view_center)
 
+    def suspend_parallax(self):
+        """Hold the pending update while the view cannot be seen"""
+        self._suspended = True
+        self._parallax_timer.stop()
+
+    def resume_parallax(self):
+        """Apply an update that was held by suspend_parallax()"""
+        self._suspended = False
+        if self._parallax_pending:
+            self._parallax_timer.start(16)
+
     def resizeEvent(self, event):
         """Handle resize events to keep the scene centered."""
         self.fitInView(self.scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatioByExpanding)
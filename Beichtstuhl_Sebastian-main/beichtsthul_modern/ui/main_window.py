@@ -11,7 +11,7 @@ import random
 import time
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QStatusBar, QApplication, QGridLayout, QStackedLayout
+    QLabel, QStatusBar, QApplication, QGridLayout, QStackedLayout, QMessageBox
 )
 from PyQt6.QtCore import Qt, QRect, pyqtSignal, QSize, QTimer
 from PyQt6.QtGui import QFont, QColor
@@ -24,14 +24,20 @@ from ui.components.karma_display import KarmaDisplay
 from ui.components.monk_visualizer import MonkVisualizer
 from ui.effects.background_parallax import ParallaxBackground
 from ui.dialogs.settings_dialog import SettingsDialog
+from ui.dialogs.statistik_dialog import StatistikDialog
 from ui.resources.styles import get_main_window_style, get_label_style, get_status_bar_style
 from ui.resources.animations import AnimationDefinitions
 from utils.animation_utils import create_fade_animation
 from utils.resource_loader import resource_loader
+from utils.persistence_worker import PersistenceWorker
+from utils.statistics_tasks import StatisticsTaskRunner
+from utils.frame_prerenderer import FramePrerenderer
 from core.antwort_generator import AntwortGenerator
 from core.karma_rechner import KarmaRechner
+from core.beicht_analyse import BeichtAnalysator
 from core.datei_manager import DateiManager
-from core.statistik_manager import StatistikManager
+from core.statistik_aggregator import StatistikAggregator
+from core.constants import DATA_FILE_NAME, DATA_STORAGE_MODE
 from core.constants import APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT
 from design_tokens.design_tokens import ColorTokens, FontTokens
 
@@ -52,11 +58,20 @@ class MainWindow(QMainWindow):
         # Initialize core modules
         self.antwort_generator = AntwortGenerator()
         self.karma_rechner = KarmaRechner()
-        self.datei_manager = DateiManager()
-        self.statistik_manager = StatistikManager()
+        self.beicht_analysator = BeichtAnalysator(self.antwort_generator, self.karma_rechner)
+        self.datei_manager = DateiManager(DATA_FILE_NAME, modus=DATA_STORAGE_MODE)
         
         # Load saved data
-        self.karma_schulden, self.beicht_historie, self.suenden_kategorien = self.datei_manager.lade_daten()
+        self.karma_schulden, self.beicht_historie, self.suenden_kategorien = self.datei_manager.lade_historie()
+
+        # Running statistics: saved state plus the entries appended since it was written
+        self.statistik_aggregator = StatistikAggregator.lade(self.datei_manager.statistik, self.beicht_historie)
+
+        # Saving happens on a background thread; bursts are coalesced into one write
+        self.persistence_worker = PersistenceWorker(self.datei_manager, parent=self)
+
+        # Expensive statistics reports run on a thread pool and are cancelled with their dialog
+        self.statistics_tasks = StatisticsTaskRunner(parent=self)
         
         # Initialize UI components
         self.init_ui()
@@ -195,6 +210,21 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Bereit für etwas Selbsterkenntnis?")
 
+        # Report failed background saves
+        self.persistence_worker.save_finished.connect(self.on_save_finished)
+
+        # Report records dropped by the recovery scan on startup
+        bericht = self.datei_manager.bericht
+        if bericht and bericht.verworfen:
+            self.status_bar.showMessage(
+                f"Datenwiederherstellung: {len(bericht.verworfen)} beschädigte Einträge verworfen"
+            )
+
+    def on_save_finished(self, success, message):
+        """Show background save failures in the status bar"""
+        if not success:
+            self.status_bar.showMessage(message)
+
     def set_accessible_info(self):
         """Sets accessible names and descriptions for widgets."""
         self.confession_input.text_input.setAccessibleName("Beichteingabe")
@@ -287,11 +317,14 @@ class MainWindow(QMainWindow):
 
     def process_confession(self, confession_text):
         """Process a confession and generate response"""
+        # Analyse the text once; all core components consume the same result
+        analyse = self.beicht_analysator.analysiere(confession_text)
+
         # Categorize the sin
-        kategorie = self.antwort_generator.kategorisiere_suende(confession_text)
+        kategorie = self.antwort_generator.kategorisiere_suende(analyse)
         
         # Check for easter eggs
-        easter_antwort, easter_emotion = self.antwort_generator.prüfe_easter_eggs(confession_text)
+        easter_antwort, easter_emotion = self.antwort_generator.prüfe_easter_eggs(analyse)
         
         if easter_antwort:
             antwort = easter_antwort
@@ -301,27 +334,28 @@ class MainWindow(QMainWindow):
             emotion = self.antwort_generator.emotionen_mapping.get(kategorie, "neutral")
         
         # Calculate karma debt
-        neue_schulden = self.karma_rechner.berechne_karma_schulden(kategorie, confession_text)
+        neue_schulden = self.karma_rechner.berechne_karma_schulden(kategorie, analyse)
         self.karma_schulden += neue_schulden
         
         # Update history
+        zeit = time.time()
         self.beicht_historie.append({
             "suende": confession_text,
             "kategorie": kategorie,
-            "karma": neue_schulden
+            "karma": neue_schulden,
+            "zeit": zeit
         })
         
-        # Update category counts
-        if kategorie in self.suenden_kategorien:
-            self.suenden_kategorien[kategorie] += 1
-        else:
-            self.suenden_kategorien[kategorie] = 1
+        # Update running statistics (O(1)); category counts are derived from them
+        self.statistik_aggregator.erfasse(kategorie, neue_schulden, zeit)
+        self.suenden_kategorien = self.statistik_aggregator.kategorie_anzahlen()
         
-        # Save data
-        self.datei_manager.speichere_daten(
+        # Save data (non-blocking)
+        self.persistence_worker.submit(
             self.karma_schulden, 
             self.beicht_historie, 
-            self.suenden_kategorien
+            self.suenden_kategorien,
+            self.statistik_aggregator
         )
         
         # Update UI
@@ -335,26 +369,38 @@ class MainWindow(QMainWindow):
     def show_statistics(self):
         """Show statistics dialog"""
         try:
-            self.statistik_manager.zeige_statistiken(
+            if not self.beicht_historie:
+                QMessageBox.information(self, "Statistiken", "Noch keine Beichten vorhanden!")
+                return
+            # Summary numbers come from the aggregator; the table pages the history lazily
+            dialog = StatistikDialog(
                 self.karma_schulden,
                 self.beicht_historie,
-                self.suenden_kategorien
+                self.statistik_aggregator.momentaufnahme(),
+                runner=self.statistics_tasks,
+                analysator=self.beicht_analysator,
+                karma_rechner=self.karma_rechner,
+                parent=self
             )
+            dialog.exec()
         except Exception as e:
             self.status_bar.showMessage(f"Fehler beim Anzeigen der Statistiken: {str(e)}")
 
     def reset_statistics(self):
         """Reset all statistics"""
-        if self.statistik_manager.bestätige_reset():
+        antwort = QMessageBox.question(self, "Reset", "Wirklich alle Sünden vergeben?")
+        if antwort == QMessageBox.StandardButton.Yes:
             self.karma_schulden = 0
-            self.beicht_historie = []
+            self.beicht_historie = self.datei_manager.neue_historie()
             self.suenden_kategorien = {}
+            self.statistik_aggregator.zuruecksetzen()
             
-            # Save reset data
-            self.datei_manager.speichere_daten(
+            # Save reset data (non-blocking)
+            self.persistence_worker.submit(
                 self.karma_schulden, 
                 self.beicht_historie, 
-                self.suenden_kategorien
+                self.suenden_kategorien,
+                self.statistik_aggregator
             )
             
             # Update UI
@@ -448,6 +494,21 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event safely and avoid blocking shutdown"""
+        # Stop background statistics reports
+        self.statistics_tasks.cancel_all()
+        self.statistics_tasks.wait(1000)
+
+        # Stop pre-rendering animation frames
+        FramePrerenderer.instance().cancel_all()
+        FramePrerenderer.instance().wait(1000)
+
+        # Write pending state before the window goes away
+        try:
+            if not self.persistence_worker.stop(timeout=5.0):
+                print("Warnung: Daten konnten nicht vollständig gespeichert werden")
+        except Exception as e:
+            print(f"Fehler beim Speichern: {e}")
+
         # Immediate accept to prevent shutdown hang on interrupt or stalled animations
         event.accept()
         try:
@@ -8,11 +8,16 @@ Utilities Package for Beichtsthul Modern
 from .animation_utils import AnimationManager, create_fade_animation, create_geometry_animation
 from .resource_loader import resource_loader
 from .sound_manager import sound_manager
+from .persistence_worker import PersistenceWorker
+from .statistics_tasks import StatisticsTask, StatisticsTaskRunner
 
 __all__ = [
     "AnimationManager",
     "create_fade_animation",
     "create_geometry_animation",
     "resource_loader",
-    "sound_manager"
+    "sound_manager",
+    "PersistenceWorker",
+    "StatisticsTask",
+    "StatisticsTaskRunner"
 ]
\ No newline at end of file
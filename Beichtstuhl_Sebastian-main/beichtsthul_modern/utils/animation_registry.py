@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Animation Registry for Beichtsthul Modern
+Parses every Lottie file once per process and shares the parsed model and
+its compiled LottieRenderer between all LottiePlayers. Entries are keyed by
+resolved path and modification time, so an edited file is parsed again.
+If compile_animations.py has built an up-to-date sprite sheet for a file,
+the sheet is mapped instead and the lottie package is never imported.
+Only used from the GUI thread.
+"""
+
+import os
+from collections import namedtuple
+
+from PyQt6.QtCore import QTimer
+
+from utils.lottie_renderer import LottieRenderer
+from utils.sprite_sheet import SpriteSheet, sprite_sheet_path, source_hash
+
+
+# A parsed animation, ready to be played by any number of LottiePlayers
+LottieAnimation = namedtuple("LottieAnimation", [
+    "path",         # Resolved path of the JSON file
+    "mtime",        # Modification time the file was parsed at
+    "model",        # lottie.objects.Animation, or None for sprite sheets
+    "renderer",     # Compiled LottieRenderer or SpriteSheet
+])
+
+
+class AnimationRegistry:
+    """Process-wide cache of parsed Lottie animations"""
+
+    def __init__(self):
+        # resolved path -> LottieAnimation
+        self._animations = {}
+        # path as passed in -> resolved path
+        self._resolved = {}
+        self._warm_queue = []
+        self.parses = 0
+        self.sheet_loads = 0
+
+    def resolve(self, file_path):
+        """
+        Resolve a path once (symlinks, relative to the working directory)
+
+        Returns:
+            str: Absolute, resolved path
+        """
+        resolved = self._resolved.get(file_path)
+        if resolved is None:
+            resolved = self._resolved[file_path] = os.path.realpath(file_path)
+        return resolved
+
+    def get(self, file_path):
+        """
+        Get the parsed animation for a file, parsing it only if it is new or changed
+
+        Args:
+            file_path: Path to the Lottie JSON file
+
+        Returns:
+            LottieAnimation
+
+        Raises:
+            OSError: If the file does not exist
+        """
+        path = self.resolve(file_path)
+        mtime = os.stat(path).st_mtime_ns
+        animation = self._animations.get(path)
+        if animation is None or animation.mtime != mtime:
+            sheet = self._load_sprite_sheet(path)
+            if sheet is not None:
+                animation = LottieAnimation(path, mtime, None, sheet)
+                self.sheet_loads += 1
+            else:
+                from lottie.importers import importers
+                model = importers.get("lottie").process(path)
+                # Compile once: keyframe tables are precomputed for every frame
+                animation = LottieAnimation(path, mtime, model, LottieRenderer(model.to_dict()))
+                self.parses += 1
+            self._animations[path] = animation
+        return animation
+
+    def _load_sprite_sheet(self, path):
+        """
+        Map the compiled sheet of a Lottie file if it matches the file
+
+        Returns:
+            SpriteSheet or None if there is no usable sheet
+        """
+        sheet_path = sprite_sheet_path(path)
+        if not os.path.exists(sheet_path):
+            return None
+        try:
+            sheet = SpriteSheet(sheet_path)
+            if sheet.source_hash == source_hash(path):
+                return sheet
+            print(f"Sprite sheet {sheet_path} is out of date, run compile_animations.py")
+        except (OSError, ValueError) as e:
+            print(f"Failed to load sprite sheet: {e}")
+        return None
+
+    def is_loaded(self, file_path):
+        """Check whether a file has been parsed (without touching the disk)"""
+        return self.resolve(file_path) in self._animations
+
+    def peek(self, file_path):
+        """
+        Get an already parsed animation without touching the disk
+
+        Returns:
+            LottieAnimation or None if the file has not been parsed yet
+        """
+        return self._animations.get(self.resolve(file_path))
+
+    def warm(self, file_paths, callback=None):
+        """
+        Parse files in idle time, one per event loop pass
+
+        Missing or broken files are skipped; set_emotion reports them later.
+
+        Args:
+            file_paths: Paths to parse ahead of their first use
+            callback: Called with (file_path, LottieAnimation) for every file
+                that is available, including files parsed earlier
+        """
+        idle = not self._warm_queue
+        self._warm_queue.extend((file_path, callback) for file_path in file_paths)
+        if idle:
+            QTimer.singleShot(0, self._warm_next)
+
+    def _warm_next(self):
+        while self._warm_queue:
+            file_path, callback = self._warm_queue.pop(0)
+            parsed = self.is_loaded(file_path)
+            try:
+                animation = self.get(file_path) if not parsed else self.peek(file_path)
+            except Exception as e:
+                print(f"Failed to preload Lottie animation {file_path}: {e}")
+                break
+            if callback is not None:
+                callback(file_path, animation)
+            if not parsed:
+                break
+        if self._warm_queue:
+            QTimer.singleShot(0, self._warm_next)
+
+    def discard(self, file_path=None):
+        """Forget one parsed file, or all of them"""
+        if file_path is None:
+            self._animations.clear()
+        else:
+            self._animations.pop(self.resolve(file_path), None)
+
+
+# Global animation registry shared by all LottiePlayers
+animation_registry = AnimationRegistry()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Frame Cache for Beichtsthul Modern
+Keeps rendered Lottie frames as QPixmaps so looping animations are
+rasterised once and played back as plain blits. Frames are grouped per
+animation, size and device pixel ratio; whole groups are evicted in LRU
+order when the byte budget is exceeded.
+"""
+
+from collections import OrderedDict, namedtuple
+
+from core.constants import FRAME_CACHE_BUDGET_MB
+
+
+# Counters for monitoring the cache
+FrameCacheStats = namedtuple("FrameCacheStats", [
+    "hits",         # Frames served from the cache
+    "misses",       # Frames that had to be rendered
+    "evictions",    # Animations dropped to stay within the budget
+    "bytes_used",   # Current size of all cached frames
+    "budget",       # Byte budget
+    "entries",      # Number of cached animation/size/DPR groups
+])
+
+
+class FrameCache:
+    """LRU cache of rendered frames with a byte budget"""
+
+    def __init__(self, budget_bytes=FRAME_CACHE_BUDGET_MB * 1024 * 1024):
+        """
+        Args:
+            budget_bytes: Maximum bytes of pixel data kept in the cache
+        """
+        self.budget_bytes = budget_bytes
+        # (animation, width, height, dpr) -> {frame: QPixmap}, least recently used first
+        self._entries = OrderedDict()
+        self._bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(animation, width, height, device_pixel_ratio):
+        """Cache key for one animation at one size and DPR"""
+        return (animation, int(width), int(height), round(float(device_pixel_ratio), 2))
+
+    @staticmethod
+    def frame_bytes(width, height, device_pixel_ratio):
+        """Bytes of one 32-bit frame at the given size and DPR"""
+        return int(width * device_pixel_ratio) * int(height * device_pixel_ratio) * 4
+
+    def fits(self, width, height, device_pixel_ratio, frame_count):
+        """True if all frames of an animation at this size and DPR fit into the budget"""
+        return self.frame_bytes(width, height, device_pixel_ratio) * frame_count <= self.budget_bytes
+
+    def get(self, key, frame):
+        """
+        Look up a frame and count a hit or miss
+
+        Returns:
+            QPixmap or None
+        """
+        frames = self._entries.get(key)
+        pixmap = frames.get(frame) if frames is not None else None
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pixmap
+
+    def contains(self, key, frame):
+        """Check for a frame without counting it"""
+        frames = self._entries.get(key)
+        return frames is not None and frame in frames
+
+    def put(self, key, frame, pixmap):
+        """
+        Store a frame; evicts least recently used animations if needed
+
+        Frames of the animation being stored are never evicted for it. If
+        that animation alone exceeds the budget, the frame is not stored.
+
+        Returns:
+            bool: True if the frame was stored
+        """
+        frames = self._entries.get(key)
+        if frames is not None and frame in frames:
+            return True
+        size = self.frame_bytes(key[1], key[2], key[3])
+        while self._bytes_used + size > self.budget_bytes:
+            oldest = next((k for k in self._entries if k != key), None)
+            if oldest is None:
+                return False
+            self._evict(oldest)
+        if frames is None:
+            frames = self._entries[key] = {}
+        frames[frame] = pixmap
+        self._entries.move_to_end(key)
+        self._bytes_used += size
+        return True
+
+    def _evict(self, key):
+        frames = self._entries.pop(key)
+        self._bytes_used -= len(frames) * self.frame_bytes(key[1], key[2], key[3])
+        self.evictions += 1
+
+    def frame_count(self, key):
+        """Number of cached frames of one animation/size/DPR"""
+        return len(self._entries.get(key, ()))
+
+    def discard(self, animation=None):
+        """Drop all frames, or all frames of one animation"""
+        for key in [k for k in self._entries if animation is None or k[0] == animation]:
+            frames = self._entries.pop(key)
+            self._bytes_used -= len(frames) * self.frame_bytes(key[1], key[2], key[3])
+
+    def stats(self):
+        """
+        Returns:
+            FrameCacheStats: Hit/miss counters and memory use
+        """
+        return FrameCacheStats(self.hits, self.misses, self.evictions,
+                               self._bytes_used, self.budget_bytes, len(self._entries))
+
+
+# Global frame cache shared by all LottiePlayers
+frame_cache = FrameCache()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Frame Pre-renderer for Beichtsthul Modern
+Rasterises Lottie frames into QImages on a QThreadPool. Finished frames
+are handed to the GUI thread one by one, converted to QPixmaps and put
+into the frame cache, so playback can start as soon as the first frames
+exist and the GUI thread never waits for a whole animation.
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QThread, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QImage, QPixmap
+
+from utils.frame_cache import frame_cache
+
+
+class _RenderJob(QRunnable):
+    """Renders a run of frames of one animation into QImages"""
+
+    def __init__(self, renderer, key, frames, width, height, device_pixel_ratio, signals, cancelled):
+        super().__init__()
+        self.renderer = renderer
+        self.key = key
+        self.frames = frames
+        self.width = width
+        self.height = height
+        self.device_pixel_ratio = device_pixel_ratio
+        self.signals = signals
+        self.cancelled = cancelled
+
+    def run(self):
+        for frame in self.frames:
+            if self.cancelled.is_set():
+                return
+            try:
+                image = self.renderer.render_image(frame, self.width, self.height, self.device_pixel_ratio)
+            except Exception as e:
+                print(f"Failed to pre-render frame {frame}: {e}")
+                image = None
+            try:
+                if image is None:
+                    # Release the frame, or the player would wait for it forever
+                    self.signals.frame_failed.emit(self.key, frame)
+                else:
+                    self.signals.frame_rendered.emit(self.key, frame, image)
+            except RuntimeError:
+                # Pre-renderer already deleted (application shutting down)
+                return
+
+
+class FramePrerenderer(QObject):
+    """Schedules off-thread rendering and fills the frame cache progressively"""
+
+    # Internal: emitted from worker threads, delivered queued to the GUI thread
+    frame_rendered = pyqtSignal(object, int, QImage)
+    # Emitted on the GUI thread once a frame is in the cache: (cache key, frame)
+    frame_ready = pyqtSignal(object, int)
+    # Emitted from a worker thread when a frame could not be rendered; once
+    # delivered the frame is no longer pending and the player renders it on
+    # demand instead: (cache key, frame)
+    frame_failed = pyqtSignal(object, int)
+
+    _instance = None
+
+    def __init__(self, cache=None, max_threads=None, first_chunk=10, chunk_size=15, parent=None):
+        """
+        Args:
+            cache: FrameCache to fill (defaults to the shared frame_cache)
+            max_threads: Worker threads (default: one less than the CPU count, at most 2)
+            first_chunk: Frames rendered with top priority when an animation is requested
+            chunk_size: Frames per job for the rest of the animation
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.cache = cache if cache is not None else frame_cache
+        self.first_chunk = first_chunk
+        self.chunk_size = chunk_size
+        self.pool = QThreadPool(self)
+        if max_threads is None:
+            max_threads = max(1, min(2, QThread.idealThreadCount() - 1))
+        self.pool.setMaxThreadCount(max_threads)
+        # (key, frame) pairs queued or being rendered
+        self._pending = set()
+        # key -> cancellation event of its jobs
+        self._requests = {}
+        # Later requests get higher pool priority than earlier ones
+        self._priority = 0
+        self.frame_rendered.connect(self._on_frame_rendered)
+        self.frame_failed.connect(self._on_frame_failed)
+
+    @classmethod
+    def instance(cls):
+        """Shared pre-renderer, created on first use (after the QApplication exists)"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def request(self, renderer, key, width, height, device_pixel_ratio, start_frame=None):
+        """
+        Queue all uncached frames of an animation, starting at start_frame
+
+        The first frames from start_frame on get the highest priority of
+        all queued work, so the requested animation can start playing
+        almost immediately.
+
+        Args:
+            renderer: LottieRenderer of the animation
+            key: FrameCache key (animation, width, height, dpr)
+            start_frame: Frame to prioritise (defaults to the first frame)
+        """
+        first = renderer.in_point
+        start = first if start_frame is None else start_frame
+        # Frames in playback order from start_frame, wrapping around
+        order = [first + (start - first + offset) % renderer.frame_count for offset in range(renderer.frame_count)]
+        frames = [f for f in order if (key, f) not in self._pending and not self.cache.contains(key, f)]
+        if not frames:
+            return
+        cancelled = self._requests.setdefault(key, threading.Event())
+        self._priority += 2
+        chunks = [frames[:self.first_chunk]]
+        chunks += [frames[i:i + self.chunk_size] for i in range(self.first_chunk, len(frames), self.chunk_size)]
+        for index, chunk in enumerate(chunks):
+            self._pending.update((key, f) for f in chunk)
+            job = _RenderJob(renderer, key, chunk, width, height, device_pixel_ratio, self, cancelled)
+            self.pool.start(job, self._priority if index == 0 else self._priority - 1)
+
+    def is_pending(self, key, frame):
+        """True while a frame is queued or being rendered"""
+        return (key, frame) in self._pending
+
+    def cancel(self, key):
+        """Stop rendering the remaining frames of one animation"""
+        cancelled = self._requests.pop(key, None)
+        if cancelled is not None:
+            cancelled.set()
+        self._pending = {entry for entry in self._pending if entry[0] != key}
+
+    def cancel_all(self):
+        """Stop all queued and running jobs"""
+        for key in list(self._requests):
+            self.cancel(key)
+
+    def wait(self, timeout_ms=-1):
+        """Block until all jobs are done (for shutdown and tests)"""
+        return self.pool.waitForDone(timeout_ms)
+
+    @pyqtSlot(object, int, QImage)
+    def _on_frame_rendered(self, key, frame, image):
+        """GUI thread: convert to a pixmap and hand the frame to the cache"""
+        if (key, frame) not in self._pending:
+            return
+        self._pending.discard((key, frame))
+        self.cache.put(key, frame, QPixmap.fromImage(image))
+        self.frame_ready.emit(key, frame)
+
+    @pyqtSlot(object, int)
+    def _on_frame_failed(self, key, frame):
+        """GUI thread: forget a frame whose rendering failed"""
+        self._pending.discard((key, frame))
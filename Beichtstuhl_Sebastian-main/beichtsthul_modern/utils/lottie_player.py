@@ -4,29 +4,76 @@
 """
 Lottie Animation Player for Beichtsthul Modern
 Handles loading and playing Lottie animations.
-Renders animations to QPixmap for display in Qt widgets.
+Frames are drawn by LottieRenderer (QPainter) on the FramePrerenderer's
+worker threads and then played back from the shared FrameCache as QPixmaps.
+Frames of a compiled SpriteSheet are already in memory and are painted
+straight from the mapped file instead.
 """
 
 import os
 import sys
 import io
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import QTimer, Qt, QSize
-from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor
-import lottie
-from lottie.importers import importers
-from lottie.exporters import exporters
+from PyQt6.QtCore import QTimer, QElapsedTimer, QEasingCurve, QPointF, QRectF, Qt, QSize
+from PyQt6.QtGui import QPixmap, QPainter
+from utils.animation_registry import animation_registry
+from utils.frame_cache import frame_cache
+from utils.frame_prerenderer import FramePrerenderer
+from utils.sprite_sheet import SpriteSheet
+from utils.visibility_scheduler import VisibilityScheduler
+from core.constants import LOTTIE_MAX_RENDER_FPS
 
 
 class LottiePlayer(QWidget):
     """A widget for playing Lottie animations"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, cache=None, prerenderer=None, max_fps=LOTTIE_MAX_RENDER_FPS,
+                 scheduler=None):
+        """
+        Args:
+            parent: Parent widget
+            cache: FrameCache for rendered frames (defaults to the shared frame_cache)
+            prerenderer: FramePrerenderer filling the cache off the GUI thread
+                (defaults to the shared instance)
+            max_fps: Upper limit for redraws per second (0 = animation frame rate)
+            scheduler: VisibilityScheduler pausing playback while the player
+                cannot be seen (defaults to the shared instance)
+        """
         super().__init__(parent)
         self.animation = None
+        self.renderer = None
+        self.animation_key = None
+        self.cache = cache if cache is not None else frame_cache
+        self.prerenderer = prerenderer if prerenderer is not None else FramePrerenderer.instance()
+        self.prerenderer.frame_ready.connect(self._on_frame_ready)
+        self.prerenderer.frame_failed.connect(self._on_frame_ready)
+        # Cache key the prerenderer was last asked to fill
+        self._requested_key = None
         self.current_frame = 0
+        self.max_fps = max_fps
+        # Playback clock: the frame shown is derived from elapsed time, so a
+        # late tick skips frames instead of slowing the animation down
+        self.clock = QElapsedTimer()
+        self.fps = 0
+        # Playback position (in frames since in_point) when the clock started
+        self._clock_position = 0.0
+        self.frames_skipped = 0
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.next_frame)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._on_tick)
+        # Playback is held back while the player cannot be seen
+        self._suspended = False
+        self._resume_on_expose = False
+        # Cross-fade from the image shown before set_animation()
+        self._fade_from = None
+        self._fade_clock = QElapsedTimer()
+        self._fade_duration = 0
+        self._fade_easing = QEasingCurve(QEasingCurve.Type.OutCubic)
+        # Mapped sprite sheet crop painted by paintEvent (the label is empty then),
+        # its position in the frame and the logical frame size
+        self._image = None
+        self._image_offset = QPointF()
+        self._image_frame = QSize()
         self.label = QLabel(self)
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
@@ -36,6 +83,9 @@ class LottiePlayer(QWidget):
         
         self.setSizePolicy(self.label.sizePolicy())
         
+        scheduler = scheduler if scheduler is not None else VisibilityScheduler.instance()
+        scheduler.register(self, self.suspend, self.resume)
+        
     def load_animation(self, file_path):
         """
         Load a Lottie animation from file
@@ -44,72 +94,274 @@ class LottiePlayer(QWidget):
             file_path: Path to the Lottie JSON file
         """
         try:
-            # Try to load the animation
-            self.animation = importers.get("lottie").process(file_path)
-            self.current_frame = 0
-            self.render_frame()
+            # Parsed once per process and shared with other players
+            self.set_animation(animation_registry.get(file_path))
             return True
         except Exception as e:
             print(f"Failed to load Lottie animation: {e}")
             return False
     
+    def set_animation(self, animation, fade_duration=0, fade_easing=QEasingCurve.Type.OutCubic):
+        """
+        Show an animation that is already parsed
+        
+        With fade_duration the image on screen is blended into the first
+        frames of the new animation. Both come from pixmaps that already
+        exist, so nothing extra is rasterised. A new animation set during a
+        fade starts its fade from the blend currently shown.
+        
+        Args:
+            animation: LottieAnimation from the animation registry
+            fade_duration: Cross-fade time in milliseconds (0 = hard cut)
+            fade_easing: QEasingCurve.Type of the cross-fade
+        """
+        shown = self._shown_pixmap()
+        if fade_duration > 0 and shown is not None and not shown.isNull():
+            self._fade_from = shown
+            self._fade_duration = fade_duration
+            self._fade_easing = QEasingCurve(fade_easing)
+            self._fade_clock.start()
+            # Show the end of the fade even if no tick follows
+            QTimer.singleShot(fade_duration, self._finish_fade)
+        else:
+            self._fade_from = None
+        self.animation = animation.model
+        self.renderer = animation.renderer
+        # A changed file gets new cache entries
+        self.animation_key = (animation.path, animation.mtime)
+        self._requested_key = None
+        self.current_frame = self.renderer.in_point
+        self._clock_position = 0.0
+        if self.clock.isValid():
+            self.clock.restart()
+        self.render_frame()
+    
     def play(self, fps=None):
         """
-        Start playing the animation
+        Start or resume playing the animation
         
         Args:
             fps: Frames per second (defaults to animation's natural FPS)
         """
-        if not self.animation:
+        if not self.renderer:
             return
             
         if fps is None:
-            fps = self.animation.frame_rate
-            
-        self.timer.start(int(1000 // fps))
+            fps = self.renderer.frame_rate
+        # Keep the position reached so far when play() is called again
+        self._clock_position = self.position()
+        self.fps = fps
+        
+        # Redraw at most max_fps times per second; the timing stays that of fps
+        render_fps = min(fps, self.max_fps) if self.max_fps else fps
+        self.timer.setInterval(max(1, round(1000 / render_fps)))
+        if self._suspended:
+            # Starts once the player is visible
+            self._resume_on_expose = True
+            return
+        self.clock.start()
+        self.timer.start()
     
     def pause(self):
         """Pause the animation"""
+        self._resume_on_expose = False
+        self._clock_position = self.position()
+        self.clock.invalidate()
         self.timer.stop()
     
     def stop(self):
         """Stop the animation and reset to first frame"""
+        self._resume_on_expose = False
         self.timer.stop()
-        self.current_frame = 0
+        self.clock.invalidate()
+        self._clock_position = 0.0
+        self.current_frame = self.renderer.in_point if self.renderer else 0
+        self.render_frame()
+    
+    def is_playing(self):
+        """True while playing, including while suspended by visibility"""
+        return self.timer.isActive() or self._resume_on_expose
+    
+    def suspend(self):
+        """Hold playback while the player cannot be seen (called by the scheduler)"""
+        self._suspended = True
+        if self.timer.isActive():
+            self.pause()
+            self._resume_on_expose = True
+    
+    def resume(self):
+        """Continue playback held by suspend()"""
+        self._suspended = False
+        if self._resume_on_expose:
+            self._resume_on_expose = False
+            self.play(self.fps)
+    
+    def position(self):
+        """
+        Current playback position
+        
+        Returns:
+            float: Frames since the animation's in_point (not wrapped)
+        """
+        if not self.clock.isValid():
+            return self._clock_position
+        return self._clock_position + self.clock.nsecsElapsed() * self.fps / 1e9
+    
+    def _on_tick(self):
+        """Show the frame that belongs to the elapsed time"""
+        if not self.renderer:
+            return
+        
+        renderer = self.renderer
+        frame = renderer.in_point + int(self.position()) % renderer.frame_count
+        if frame == self.current_frame:
+            if self._fade_from is not None:
+                self.render_frame()
+            return
+        step = (frame - self.current_frame) % renderer.frame_count
+        self.frames_skipped += step - 1
+        self.current_frame = frame
         self.render_frame()
     
     def next_frame(self):
         """Advance to the next frame"""
-        if not self.animation:
+        if not self.renderer:
             return
             
-        self.current_frame = (self.current_frame + 1) % self.animation.out_point
+        renderer = self.renderer
+        self.current_frame = renderer.in_point + (self.current_frame + 1 - renderer.in_point) % renderer.frame_count
+        # Continue the playback clock from the stepped frame
+        self._clock_position = float(self.current_frame - renderer.in_point)
+        if self.clock.isValid():
+            self.clock.restart()
         self.render_frame()
     
     def render_frame(self):
         """Render the current frame"""
-        if not self.animation:
+        if not self.renderer:
             return
             
         try:
-            # Create a simple placeholder that shows the frame number
             width = self.width() or 200
             height = self.height() or 200
-            image = QImage(width, height, QImage.Format.Format_ARGB32)
-            image.fill(QColor(0, 0, 0, 0))  # Transparent background
-            
-            painter = QPainter(image)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            painter.setPen(QColor(255, 255, 255))
-            painter.drawText(image.rect(), Qt.AlignmentFlag.AlignCenter, f"Frame {self.current_frame}")
-            painter.end()
-            
-            pixmap = QPixmap.fromImage(image)
-            self.label.setPixmap(pixmap)
+            dpr = self.devicePixelRatioF()
+            if isinstance(self.renderer, SpriteSheet) and self.renderer.has_size(width, height, dpr):
+                # The frame is already in memory: paint the mapped image itself,
+                # without a pixmap copy, a cache entry or the prerenderer
+                if self._fade_from is None or self._fade_clock.elapsed() >= self._fade_duration:
+                    self._fade_from = None
+                    image, offset = self.renderer.sprite(self.current_frame, width, height, dpr)
+                    self._show_image(image, offset, QSize(width, height))
+                    return
+                # Only the frames of a cross-fade are copied for blending
+                pixmap = QPixmap.fromImage(self.renderer.render_image(self.current_frame, width, height, dpr))
+            else:
+                if dpr > 1.0 and not self.cache.fits(width, height, dpr, self.renderer.frame_count):
+                    # The loop would not fit at full resolution and the frames left
+                    # out would be rasterised on every pass: cache it at DPR 1 and
+                    # let Qt scale it up instead
+                    dpr = 1.0
+                key = self.cache.key(self.animation_key, width, height, dpr)
+                if key != self._requested_key:
+                    # New animation or size: render all frames in the background,
+                    # starting with the one about to be shown
+                    self._requested_key = key
+                    self.prerenderer.request(self.renderer, key, width, height, dpr, self.current_frame)
+                pixmap = self.cache.get(key, self.current_frame)
+                if pixmap is None:
+                    if self.prerenderer.is_pending(key, self.current_frame):
+                        # Keep showing the previous frame; _on_frame_ready follows up
+                        return
+                    # Rasterise once; later loops are plain blits of the cached pixmap
+                    image = self.renderer.render_image(self.current_frame, width, height, dpr)
+                    pixmap = QPixmap.fromImage(image)
+                    self.cache.put(key, self.current_frame, pixmap)
+            if self._fade_from is not None:
+                pixmap = self._blend(pixmap)
+            self._show_pixmap(pixmap)
             
         except Exception as e:
             print(f"Failed to render frame: {e}")
     
+    def _show_pixmap(self, pixmap):
+        """Show a frame through the label"""
+        if self._image is not None:
+            self._image = None
+            self.update()
+        self.label.setPixmap(pixmap)
+    
+    def _show_image(self, image, offset, frame_size):
+        """Paint a mapped sprite sheet crop at offset within a frame of frame_size in paintEvent"""
+        self._image = image
+        self._image_offset = offset
+        self._image_frame = frame_size
+        shown = self.label.pixmap()
+        if shown is not None and not shown.isNull():
+            self.label.clear()
+        self.update()
+    
+    def _shown_pixmap(self):
+        """
+        Returns:
+            QPixmap: Copy of the frame on screen, or None/null if there is none
+        """
+        if self._image is not None:
+            # Put the crop back into a whole frame
+            dpr = self._image.devicePixelRatio()
+            pixmap = QPixmap(max(int(self._image_frame.width() * dpr), 1),
+                             max(int(self._image_frame.height() * dpr), 1))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.drawImage(self._image_offset, self._image)
+            painter.end()
+            return pixmap
+        return self.label.pixmap()
+    
+    def paintEvent(self, event):
+        """Paint the mapped sprite sheet frame, if one is shown"""
+        if self._image is None:
+            return
+        size = self._image_frame
+        origin = QPointF((self.width() - size.width()) / 2, (self.height() - size.height()) / 2)
+        painter = QPainter(self)
+        painter.drawImage(origin + self._image_offset, self._image)
+        painter.end()
+    
+    def _blend(self, pixmap):
+        """
+        Blend the fade source over a frame of the new animation
+        
+        Returns:
+            QPixmap: The blend, or the frame itself once the fade is over
+        """
+        progress = self._fade_clock.elapsed() / self._fade_duration
+        if progress >= 1.0:
+            self._fade_from = None
+            return pixmap
+        weight = self._fade_easing.valueForProgress(progress)
+        blend = QPixmap(pixmap.size())
+        blend.setDevicePixelRatio(pixmap.devicePixelRatio())
+        blend.fill(Qt.GlobalColor.transparent)
+        target = QRectF(QPointF(0, 0), pixmap.deviceIndependentSize())
+        painter = QPainter(blend)
+        painter.setOpacity(1.0 - weight)
+        painter.drawPixmap(target, self._fade_from, QRectF(self._fade_from.rect()))
+        painter.setOpacity(weight)
+        painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        painter.end()
+        return blend
+    
+    def _finish_fade(self):
+        """Replace the last blend by the plain frame"""
+        if self._fade_from is not None and self._fade_clock.elapsed() >= self._fade_duration:
+            self.render_frame()
+    
+    def _on_frame_ready(self, key, frame):
+        """Show a frame the player is waiting for (pre-rendered, or rendered here if that failed)"""
+        if key == self._requested_key and frame == self.current_frame:
+            self.render_frame()
+    
     def set_size(self, width, height):
         """
         Set the size of the player
@@ -128,9 +380,9 @@ class LottiePlayer(QWidget):
         Returns:
             float: Duration in seconds
         """
-        if not self.animation:
+        if not self.renderer:
             return 0
-        return self.animation.duration
+        return self.renderer.frame_count / self.renderer.frame_rate
 
 
 # Example usage
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lottie Renderer for Beichtsthul Modern
+Rasterises Lottie animations with QPainter. Supports the shape subset used
+by the monk animations: shape layers with parenting, groups, ellipses,
+rectangles, paths, fills, strokes and transforms with keyframed anchor,
+position, scale, rotation and opacity.
+
+Every animated property is evaluated once per frame when the animation is
+compiled, so drawing a frame only looks values up in tables. With NumPy the
+whole timeline of a property, easing included, is evaluated in one go and
+every transform gets a dense table of per-frame matrices. Rendering into a
+QImage is safe off the GUI thread.
+"""
+
+import math
+
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QImage, QPainter, QPainterPath, QTransform, QColor, QPen, QBrush
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy the tables are filled frame by frame
+    np = None
+
+
+def _cubic_bezier_ease(x1, y1, x2, y2, x):
+    """Evaluate a CSS-style cubic-bezier easing curve at x (0..1)"""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    if x1 == y1 and x2 == y2:
+        return x
+
+    def bezier(a1, a2, t):
+        return ((1 - 3 * a2 + 3 * a1) * t + (3 * a2 - 6 * a1)) * t * t + 3 * a1 * t
+
+    def slope(a1, a2, t):
+        return 3 * (1 - 3 * a2 + 3 * a1) * t * t + 2 * (3 * a2 - 6 * a1) * t + 3 * a1
+
+    # Newton-Raphson, falling back to bisection when the slope is flat
+    t = x
+    for _ in range(8):
+        d = slope(x1, x2, t)
+        if abs(d) < 1e-6:
+            break
+        t -= (bezier(x1, x2, t) - x) / d
+    if not 0.0 <= t <= 1.0 or abs(bezier(x1, x2, t) - x) > 1e-5:
+        low, high = 0.0, 1.0
+        t = x
+        for _ in range(30):
+            value = bezier(x1, x2, t)
+            if abs(value - x) < 1e-6:
+                break
+            if value < x:
+                low = t
+            else:
+                high = t
+            t = (low + high) / 2
+    return bezier(y1, y2, t)
+
+
+def _cubic_bezier_ease_array(x1, y1, x2, y2, x):
+    """
+    _cubic_bezier_ease for arrays (NumPy)
+
+    Args:
+        x1, y1, x2, y2: Control points, one curve per element
+        x: Progress values (0..1), same shape
+
+    Returns:
+        numpy.ndarray: Eased values
+    """
+    def bezier(a1, a2, t):
+        return ((1 - 3 * a2 + 3 * a1) * t + (3 * a2 - 6 * a1)) * t * t + 3 * a1 * t
+
+    def slope(a1, a2, t):
+        return 3 * (1 - 3 * a2 + 3 * a1) * t * t + 2 * (3 * a2 - 6 * a1) * t + 3 * a1
+
+    with np.errstate(all="ignore"):
+        # Newton-Raphson; elements with a flat slope keep their value
+        t = x.copy()
+        for _ in range(8):
+            d = slope(x1, x2, t)
+            steep = np.abs(d) >= 1e-6
+            t = np.where(steep, t - (bezier(x1, x2, t) - x) / np.where(steep, d, 1.0), t)
+
+        # Bisection for the elements Newton did not solve
+        retry = ~((t >= 0.0) & (t <= 1.0)) | (np.abs(bezier(x1, x2, t) - x) > 1e-5)
+        if retry.any():
+            low, high = np.zeros_like(x), np.ones_like(x)
+            guess = x.copy()
+            done = ~retry
+            for _ in range(30):
+                value = bezier(x1, x2, guess)
+                done = done | (np.abs(value - x) < 1e-6)
+                if done.all():
+                    break
+                below = value < x
+                low = np.where(~done & below, guess, low)
+                high = np.where(~done & ~below, guess, high)
+                guess = np.where(done, guess, (low + high) / 2)
+            t = np.where(retry, guess, t)
+
+        eased = bezier(y1, y2, t)
+    eased = np.where((x1 == y1) & (x2 == y2), x, eased)
+    return np.where(x <= 0.0, 0.0, np.where(x >= 1.0, 1.0, eased))
+
+
+def _as_list(value):
+    """Keyframe values may be scalars or lists"""
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _easing_component(handle, axis, dimension):
+    """Easing handle component for one dimension (Lottie allows one value for all)"""
+    values = _as_list(handle.get(axis, 0)) if handle else [0]
+    return values[dimension] if dimension < len(values) else values[0]
+
+
+class AnimatedProperty:
+    """A Lottie property with its value precomputed for every frame"""
+
+    def __init__(self, data, first_frame, last_frame):
+        """
+        Args:
+            data: Lottie property dict ({"a": 0|1, "k": ...})
+            first_frame: First frame of the table (animation in point)
+            last_frame: Frame after the last entry (animation out point)
+        """
+        self.first_frame = int(first_frame)
+        # (frames, dimensions) array of the values, if NumPy computed them
+        self.table = None
+        data = data or {}
+        keyframes = data.get("k", 0)
+        if data.get("a") == 1 and isinstance(keyframes, list) and keyframes and isinstance(keyframes[0], dict):
+            self.static = None
+            if np is not None and int(last_frame) > self.first_frame:
+                self.table = self._evaluate_timeline(keyframes, self.first_frame, int(last_frame))
+            if self.table is not None:
+                self.values = list(map(tuple, self.table.tolist()))
+            else:
+                self.values = [
+                    self._evaluate(keyframes, frame) for frame in range(self.first_frame, int(last_frame))
+                ] or [tuple(_as_list(keyframes[0].get("s", 0)))]
+        else:
+            self.static = tuple(_as_list(keyframes))
+            self.values = None
+
+    @staticmethod
+    def _evaluate(keyframes, frame):
+        """Value of a keyframed property at one frame (only used while compiling)"""
+        if frame <= keyframes[0]["t"]:
+            return tuple(_as_list(keyframes[0].get("s", 0)))
+        for index, keyframe in enumerate(keyframes):
+            following = keyframes[index + 1] if index + 1 < len(keyframes) else None
+            if following is not None and frame >= following["t"]:
+                continue
+            start = _as_list(keyframe.get("s", 0))
+            if following is None:
+                # After the last keyframe: hold its end value
+                return tuple(_as_list(keyframe.get("e", keyframe.get("s", 0))))
+            end = _as_list(keyframe.get("e", following.get("s", keyframe.get("s", 0))))
+            if keyframe.get("h") == 1:
+                return tuple(start)
+            span = following["t"] - keyframe["t"]
+            progress = (frame - keyframe["t"]) / span if span else 1.0
+            out_handle, in_handle = keyframe.get("o"), keyframe.get("i")
+            value = []
+            for dimension, (a, b) in enumerate(zip(start, end)):
+                if out_handle and in_handle:
+                    eased = _cubic_bezier_ease(
+                        _easing_component(out_handle, "x", dimension), _easing_component(out_handle, "y", dimension),
+                        _easing_component(in_handle, "x", dimension), _easing_component(in_handle, "y", dimension),
+                        progress
+                    )
+                else:
+                    eased = progress
+                value.append(a + (b - a) * eased)
+            return tuple(value)
+        return tuple(_as_list(keyframes[-1].get("s", 0)))
+
+    @staticmethod
+    def _evaluate_timeline(keyframes, first_frame, last_frame):
+        """
+        Values of a keyframed property for all frames at once (NumPy)
+
+        Same results as _evaluate for every frame in first_frame..last_frame - 1.
+
+        Returns:
+            numpy.ndarray: One row per frame, or None if the keyframes do not
+                fit one table (values of differing dimension or not numeric)
+        """
+        count = len(keyframes)
+        starts, ends = [], []
+        for index, keyframe in enumerate(keyframes):
+            following = keyframes[index + 1] if index + 1 < count else keyframe
+            starts.append(_as_list(keyframe.get("s", 0)))
+            ends.append(_as_list(keyframe.get("e", following.get("s", keyframe.get("s", 0)))))
+        dimensions = len(starts[0])
+        if any(len(value) != dimensions for value in starts + ends):
+            return None
+        try:
+            starts = np.array(starts, dtype=np.float64)
+            ends = np.array(ends, dtype=np.float64)
+            times = np.array([keyframe["t"] for keyframe in keyframes], dtype=np.float64)
+        except (TypeError, ValueError):
+            return None
+
+        # Easing handles per keyframe and dimension
+        handles = np.zeros((4, count, dimensions))
+        eased = np.zeros(count, dtype=bool)
+        for index, keyframe in enumerate(keyframes[:-1]):
+            out_handle, in_handle = keyframe.get("o"), keyframe.get("i")
+            if out_handle and in_handle:
+                eased[index] = True
+                for dimension in range(dimensions):
+                    handles[:, index, dimension] = (
+                        _easing_component(out_handle, "x", dimension), _easing_component(out_handle, "y", dimension),
+                        _easing_component(in_handle, "x", dimension), _easing_component(in_handle, "y", dimension),
+                    )
+        hold = np.array([keyframe.get("h") == 1 for keyframe in keyframes])
+
+        # Segment of every frame: the last keyframe at or before it
+        frames = np.arange(first_frame, last_frame, dtype=np.float64)
+        segment = np.clip(np.searchsorted(times, frames, side="right") - 1, 0, count - 1)
+        spans = np.append(np.diff(times), 1.0)
+        spans[spans == 0] = 1.0
+        progress = np.clip((frames - times[segment]) / spans[segment], 0.0, 1.0)
+        progress = np.repeat(progress[:, None], dimensions, axis=1)
+        ease = eased[segment]
+        if ease.any():
+            x1, y1, x2, y2 = (handle[segment][ease] for handle in handles)
+            progress[ease] = _cubic_bezier_ease_array(x1, y1, x2, y2, progress[ease])
+
+        start, end = starts[segment], ends[segment]
+        values = start + (end - start) * progress
+        values = np.where(hold[segment][:, None], start, values)
+        # After the last keyframe its end value is held, before the first its start value
+        values = np.where((segment == count - 1)[:, None], end, values)
+        return np.where((frames <= times[0])[:, None], starts[0], values)
+
+    def __call__(self, frame):
+        """Value at an integer frame (clamped to the table)"""
+        if self.static is not None:
+            return self.static
+        index = int(frame) - self.first_frame
+        return self.values[min(max(index, 0), len(self.values) - 1)]
+
+    @property
+    def is_animated(self):
+        return self.values is not None
+
+
+class _Transform:
+    """Lottie transform (layer "ks" or group "tr")"""
+
+    def __init__(self, data, first_frame, last_frame):
+        data = data or {}
+        self.anchor = AnimatedProperty(data.get("a", {"k": [0, 0]}), first_frame, last_frame)
+        self.position = AnimatedProperty(data.get("p", {"k": [0, 0]}), first_frame, last_frame)
+        self.scale = AnimatedProperty(data.get("s", {"k": [100, 100]}), first_frame, last_frame)
+        self.rotation = AnimatedProperty(data.get("r", {"k": 0}), first_frame, last_frame)
+        self.opacity = AnimatedProperty(data.get("o", {"k": 100}), first_frame, last_frame)
+        self.first_frame = int(first_frame)
+        # Dense per-frame matrices (a single one if nothing moves)
+        count = max(int(last_frame) - self.first_frame, 1)
+        if not any(p.is_animated for p in (self.anchor, self.position, self.scale, self.rotation)):
+            self._matrices = [self._compose(self.first_frame)]
+        elif np is not None:
+            self._matrices = self._matrix_table(count)
+        else:
+            self._matrices = [self._compose(self.first_frame + offset) for offset in range(count)]
+
+    def matrix(self, frame):
+        """
+        QTransform mapping local coordinates to the parent
+
+        Returns:
+            QTransform: Shared table entry, must not be modified
+        """
+        index = int(frame) - self.first_frame
+        return self._matrices[min(max(index, 0), len(self._matrices) - 1)]
+
+    def _compose(self, frame):
+        """QTransform of one frame, built from Qt operations"""
+        anchor = self.anchor(frame)
+        position = self.position(frame)
+        scale = self.scale(frame)
+        transform = QTransform()
+        transform.translate(position[0], position[1] if len(position) > 1 else 0)
+        transform.rotate(self.rotation(frame)[0])
+        transform.scale(scale[0] / 100.0, (scale[1] if len(scale) > 1 else scale[0]) / 100.0)
+        transform.translate(-anchor[0], -(anchor[1] if len(anchor) > 1 else 0))
+        return transform
+
+    def _components(self, prop, count):
+        """First and second component of a property for every frame; the second is None if missing"""
+        table = prop.table
+        if table is None:
+            rows = [prop(self.first_frame + offset) for offset in range(count)]
+            width = min(len(row) for row in rows)
+            table = np.array([row[:width] for row in rows], dtype=np.float64)
+        return table[:, 0], (table[:, 1] if table.shape[1] > 1 else None)
+
+    def _matrix_table(self, count):
+        """
+        QTransforms for all frames at once (NumPy)
+
+        Equivalent to _compose: translate(position), rotate(rotation),
+        scale(scale / 100), translate(-anchor).
+        """
+        anchor_x, anchor_y = self._components(self.anchor, count)
+        position_x, position_y = self._components(self.position, count)
+        scale_x, scale_y = self._components(self.scale, count)
+        rotation, _ = self._components(self.rotation, count)
+        zero = np.zeros(count)
+        anchor_y = zero if anchor_y is None else anchor_y
+        position_y = zero if position_y is None else position_y
+        scale_x = scale_x / 100.0
+        scale_y = scale_x if scale_y is None else scale_y / 100.0
+
+        angle = np.radians(rotation)
+        cos, sin = np.cos(angle), np.sin(angle)
+        m11, m12 = cos * scale_x, sin * scale_x
+        m21, m22 = -sin * scale_y, cos * scale_y
+        dx = position_x - (m11 * anchor_x + m21 * anchor_y)
+        dy = position_y - (m12 * anchor_x + m22 * anchor_y)
+        rows = np.column_stack((m11, m12, m21, m22, dx, dy)).tolist()
+        return [QTransform(*row) for row in rows]
+
+    def alpha(self, frame):
+        return self.opacity(frame)[0] / 100.0
+
+
+class _Shape:
+    """Geometry item: ellipse ("el"), rectangle ("rc") or path ("sh")"""
+
+    def __init__(self, data, first_frame, last_frame):
+        self.kind = data["ty"]
+        if self.kind == "sh":
+            # Path vertices are kept as given; animated paths use their first keyframe
+            path = data.get("ks", {}).get("k", {})
+            if isinstance(path, list):
+                path = path[0].get("s", [{}])[0] if path else {}
+            self.path = self._bezier_path(path)
+        else:
+            self.position = AnimatedProperty(data.get("p", {"k": [0, 0]}), first_frame, last_frame)
+            self.size = AnimatedProperty(data.get("s", {"k": [0, 0]}), first_frame, last_frame)
+            self.roundness = AnimatedProperty(data.get("r", {"k": 0}), first_frame, last_frame)
+
+    @staticmethod
+    def _bezier_path(data):
+        path = QPainterPath()
+        vertices = data.get("v", [])
+        if not vertices:
+            return path
+        ins, outs = data.get("i", [[0, 0]] * len(vertices)), data.get("o", [[0, 0]] * len(vertices))
+        path.moveTo(QPointF(*vertices[0][:2]))
+        segments = len(vertices) if data.get("c") else len(vertices) - 1
+        for index in range(segments):
+            following = (index + 1) % len(vertices)
+            start, end = vertices[index], vertices[following]
+            path.cubicTo(
+                QPointF(start[0] + outs[index][0], start[1] + outs[index][1]),
+                QPointF(end[0] + ins[following][0], end[1] + ins[following][1]),
+                QPointF(end[0], end[1])
+            )
+        if data.get("c"):
+            path.closeSubpath()
+        return path
+
+    def path_at(self, frame):
+        """QPainterPath in group coordinates"""
+        if self.kind == "sh":
+            return self.path
+        x, y = self.position(frame)[:2]
+        width, height = self.size(frame)[:2]
+        rect = QRectF(x - width / 2, y - height / 2, width, height)
+        path = QPainterPath()
+        if self.kind == "el":
+            path.addEllipse(rect)
+        else:
+            radius = min(self.roundness(frame)[0], width / 2, height / 2)
+            path.addRoundedRect(rect, radius, radius)
+        return path
+
+
+class _Style:
+    """Paint item: fill ("fl") or stroke ("st")"""
+
+    _CAPS = {1: Qt.PenCapStyle.FlatCap, 2: Qt.PenCapStyle.RoundCap, 3: Qt.PenCapStyle.SquareCap}
+    _JOINS = {1: Qt.PenJoinStyle.MiterJoin, 2: Qt.PenJoinStyle.RoundJoin, 3: Qt.PenJoinStyle.BevelJoin}
+
+    def __init__(self, data, first_frame, last_frame):
+        self.kind = data["ty"]
+        self.color = AnimatedProperty(data.get("c", {"k": [0, 0, 0, 1]}), first_frame, last_frame)
+        self.opacity = AnimatedProperty(data.get("o", {"k": 100}), first_frame, last_frame)
+        self.width = AnimatedProperty(data.get("w", {"k": 1}), first_frame, last_frame)
+        self.cap = self._CAPS.get(data.get("lc", 2), Qt.PenCapStyle.RoundCap)
+        self.join = self._JOINS.get(data.get("lj", 2), Qt.PenJoinStyle.RoundJoin)
+        self.miter = data.get("ml", 4)
+        self.even_odd = data.get("r") == 2
+
+    def paint(self, painter, path, frame, alpha):
+        color_value = self.color(frame)
+        color = QColor.fromRgbF(*[min(max(c, 0.0), 1.0) for c in color_value[:3]])
+        color.setAlphaF(min(max(alpha * self.opacity(frame)[0] / 100.0, 0.0), 1.0))
+        if self.kind == "fl":
+            if self.even_odd:
+                path = QPainterPath(path)
+                path.setFillRule(Qt.FillRule.OddEvenFill)
+            painter.fillPath(path, QBrush(color))
+        else:
+            pen = QPen(color, self.width(frame)[0])
+            pen.setCapStyle(self.cap)
+            pen.setJoinStyle(self.join)
+            pen.setMiterLimit(self.miter)
+            painter.strokePath(path, pen)
+
+
+class _Group:
+    """Shape group ("gr") or the shape list of a layer"""
+
+    def __init__(self, items, first_frame, last_frame, transform_data=None):
+        self.transform = None
+        # Items in Lottie order; styles apply to the geometry listed before them
+        self.items = []
+        for item in items:
+            if item.get("hd"):
+                continue
+            kind = item.get("ty")
+            if kind == "tr":
+                transform_data = item
+            elif kind == "gr":
+                self.items.append(_Group(item.get("it", []), first_frame, last_frame))
+            elif kind in ("el", "rc", "sh"):
+                self.items.append(_Shape(item, first_frame, last_frame))
+            elif kind in ("fl", "st"):
+                self.items.append(_Style(item, first_frame, last_frame))
+        if transform_data is not None:
+            self.transform = _Transform(transform_data, first_frame, last_frame)
+
+    def geometry(self, frame):
+        """All geometry of the group in parent coordinates (for styles of enclosing groups)"""
+        path = QPainterPath()
+        for item in self.items:
+            if isinstance(item, _Shape):
+                path.addPath(item.path_at(frame))
+            elif isinstance(item, _Group):
+                path.addPath(item.geometry(frame))
+        if self.transform is not None:
+            path = self.transform.matrix(frame).map(path)
+        return path
+
+    def paint(self, painter, frame, alpha):
+        if self.transform is not None:
+            alpha *= self.transform.alpha(frame)
+            if alpha <= 0.0:
+                return
+            painter.save()
+            painter.setTransform(self.transform.matrix(frame), True)
+
+        # Collect operations in list order, then paint back to front
+        operations = []
+        path = QPainterPath()
+        for item in self.items:
+            if isinstance(item, _Shape):
+                path.addPath(item.path_at(frame))
+            elif isinstance(item, _Group):
+                operations.append(item)
+                path.addPath(item.geometry(frame))
+            else:
+                operations.append((item, QPainterPath(path)))
+        for operation in reversed(operations):
+            if isinstance(operation, _Group):
+                operation.paint(painter, frame, alpha)
+            else:
+                style, style_path = operation
+                style.paint(painter, style_path, frame, alpha)
+
+        if self.transform is not None:
+            painter.restore()
+
+
+class _Layer:
+    """Shape layer ("ty": 4) with transform, parenting and in/out points"""
+
+    def __init__(self, data, first_frame, last_frame):
+        self.index = data.get("ind")
+        self.parent = data.get("parent")
+        self.in_point = data.get("ip", first_frame)
+        self.out_point = data.get("op", last_frame)
+        self.hidden = bool(data.get("hd"))
+        self.transform = _Transform(data.get("ks", {}), first_frame, last_frame)
+        self.content = _Group(data.get("shapes", []), first_frame, last_frame)
+
+
+class LottieRenderer:
+    """Compiled Lottie animation that paints frames with QPainter"""
+
+    def __init__(self, data):
+        """
+        Args:
+            data: Lottie JSON as dict (e.g. lottie Animation.to_dict() or json.load)
+        """
+        self.width = data.get("w", 0)
+        self.height = data.get("h", 0)
+        self.frame_rate = data.get("fr", 30)
+        self.in_point = int(data.get("ip", 0))
+        self.out_point = int(math.ceil(data.get("op", self.in_point + 1)))
+        self.layers = [
+            _Layer(layer, self.in_point, self.out_point)
+            for layer in data.get("layers", []) if layer.get("ty") == 4
+        ]
+        self._by_index = {layer.index: layer for layer in self.layers if layer.index is not None}
+
+    @property
+    def frame_count(self):
+        return max(self.out_point - self.in_point, 1)
+
+    def _layer_matrix(self, layer, frame):
+        """Layer transform including its parent chain"""
+        matrix = layer.transform.matrix(frame)
+        parent = self._by_index.get(layer.parent)
+        seen = {layer.index}
+        while parent is not None and parent.index not in seen:
+            seen.add(parent.index)
+            matrix = matrix * parent.transform.matrix(frame)
+            parent = self._by_index.get(parent.parent)
+        return matrix
+
+    def paint(self, painter, frame, target):
+        """
+        Paint one frame, scaled to fit and centred in target
+
+        Args:
+            painter: Active QPainter
+            frame: Frame number (clamped to the animation)
+            target: QRectF to draw into
+        """
+        if not self.width or not self.height:
+            return
+        frame = min(max(int(frame), self.in_point), self.out_point - 1)
+        factor = min(target.width() / self.width, target.height() / self.height)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.translate(target.x() + (target.width() - self.width * factor) / 2,
+                          target.y() + (target.height() - self.height * factor) / 2)
+        painter.scale(factor, factor)
+        base = painter.transform()
+        # The first layer is on top: paint the list back to front
+        for layer in reversed(self.layers):
+            if layer.hidden or not layer.in_point <= frame < layer.out_point:
+                continue
+            alpha = layer.transform.alpha(frame)
+            if alpha <= 0.0:
+                continue
+            painter.setTransform(self._layer_matrix(layer, frame) * base)
+            layer.content.paint(painter, frame, alpha)
+        painter.restore()
+
+    def render_image(self, frame, width, height, device_pixel_ratio=1.0):
+        """
+        Render one frame into a transparent QImage (safe off the GUI thread)
+
+        Args:
+            frame: Frame number
+            width: Logical width in pixels
+            height: Logical height in pixels
+            device_pixel_ratio: Scale for high-DPI screens
+
+        Returns:
+            QImage: ARGB32 premultiplied image of width x height logical pixels
+        """
+        image = QImage(max(int(width * device_pixel_ratio), 1), max(int(height * device_pixel_ratio), 1),
+                       QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(device_pixel_ratio)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        self.paint(painter, frame, QRectF(0, 0, width, height))
+        painter.end()
+        return image
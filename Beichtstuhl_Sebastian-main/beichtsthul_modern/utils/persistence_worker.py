@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Persistence Worker for Beichtsthul Modern
+Writes application state through the DateiManager on a background thread.
+Bursts of updates are coalesced into a single write, so disk latency never
+reaches the Qt main thread.
+"""
+
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class PersistenceWorker(QObject):
+    """Owns the data file and persists the latest submitted state off the UI thread"""
+
+    # Emitted after every write: (success, message)
+    save_finished = pyqtSignal(bool, str)
+
+    def __init__(self, datei_manager, coalesce_ms=200, parent=None):
+        """
+        Args:
+            datei_manager: DateiManager that owns the data file
+            coalesce_ms: Time window in which further updates are merged into one write
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.datei_manager = datei_manager
+        self.coalesce_ms = coalesce_ms
+
+        self._condition = threading.Condition()
+        self._pending = None
+        self._writing = False
+        self._flush_requested = False
+        self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="PersistenceWorker", daemon=True)
+        self._thread.start()
+
+    def submit(self, karma_schulden, beicht_historie, suenden_kategorien, statistik=None):
+        """
+        Queue a state update; only the latest one is written
+
+        The history is treated as append-only: the worker reads the first
+        len(beicht_historie) entries at write time. A lazy BeichtHistorie is
+        passed as a prefix view, so saving never loads the whole history.
+        statistik is the StatistikAggregator or an already serialised dict.
+        An aggregator is snapshotted here, together with the history length,
+        so the saved statistics cover exactly the saved entries; the
+        snapshot is serialised on the worker thread at write time.
+        """
+        if hasattr(statistik, "schnappschuss"):
+            statistik = statistik.schnappschuss()
+        with self._condition:
+            self._pending = (
+                karma_schulden, beicht_historie, len(beicht_historie), dict(suenden_kategorien), statistik
+            )
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Block until all submitted updates are written
+
+        Returns:
+            bool: True if everything was written within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending is not None or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self._flush_requested = False
+        return True
+
+    def stop(self, timeout=5.0):
+        """Flush pending updates and stop the worker thread"""
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def _run(self):
+        """Worker loop: wait for an update, let the burst settle, write once"""
+        while True:
+            with self._condition:
+                while self._pending is None and self._running:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+
+                # Coalescing window; flush() and stop() cut it short
+                deadline = time.monotonic() + self.coalesce_ms / 1000.0
+                while not self._flush_requested and self._running:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                karma_schulden, beicht_historie, anzahl, suenden_kategorien, statistik = self._pending
+                self._pending = None
+                self._writing = True
+
+            try:
+                if hasattr(beicht_historie, "ansicht"):
+                    snapshot = beicht_historie.ansicht(anzahl)
+                else:
+                    snapshot = beicht_historie[:anzahl]
+                if hasattr(statistik, "als_dict"):
+                    # Serialised here; the UI thread only took a flat snapshot
+                    statistik = statistik.als_dict()
+                success = self.datei_manager.speichere_daten(
+                    karma_schulden, snapshot, suenden_kategorien, statistik
+                )
+                if success and hasattr(beicht_historie, "markiere_persistiert"):
+                    beicht_historie.markiere_persistiert(anzahl)
+                message = "Gespeichert" if success else "Fehler beim Speichern"
+            except Exception as e:
+                success = False
+                message = f"Fehler beim Speichern: {e}"
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+            self.save_finished.emit(success, message)
@@ -60,6 +60,18 @@ class ResourceLoader:
         """
         return os.path.join(self.base_path, "assets", "fonts", font_name)
 
+    def get_animation_path(self, animation_name):
+        """
+        Gets the full path for a Lottie animation
+        
+        Args:
+            animation_name: Name of the animation file
+            
+        Returns:
+            str: Full path to the animation file
+        """
+        return os.path.join(self.base_path, "assets", "animations", animation_name)
+
     def load_image(self, image_name):
         """
         Loads and caches an image
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sprite Sheets for Beichtsthul Modern
+Pre-rasterised Lottie animations. compile_sprite_sheet() renders every
+frame of an animation at fixed sizes and DPRs into one file; SpriteSheet
+maps that file into memory and hands out QImages that point straight into
+the mapping, so loading an animation neither parses JSON nor copies pixels.
+
+File layout (little endian):
+    header   magic, version, entry count, frame rate, in point, frame count,
+             composition size, SHA-1 of the source JSON
+    entries  per size/DPR: logical size, DPR, slot count, offsets, crop
+             rectangle in device pixels
+    maps     per entry: one uint32 slot number per frame (identical frames
+             share a slot)
+    slots    ARGB32 premultiplied pixels of the crop rectangle, 64-byte
+             aligned
+
+The crop rectangle is the bounding box of all non-transparent pixels of
+an entry, so the empty canvas around a figure is not stored.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+
+from PyQt6.QtCore import Qt, QPoint, QPointF
+from PyQt6.QtGui import QImage, QPainter
+
+from core.constants import SPRITE_SHEET_SIZES, SPRITE_SHEET_DPRS
+
+
+MAGIC = b"BSSHEET\0"
+VERSION = 2
+_HEADER = struct.Struct("<8sHHfiIII20s")
+_ENTRY = struct.Struct("<HHfIQQHHHH")
+_ALIGN = 64
+
+
+def sprite_sheet_path(animation_path):
+    """
+    Where the compiled sheet of a Lottie file lives
+
+    Returns:
+        str: assets/animations/compiled/<name>.sheet next to the JSON file
+    """
+    directory, name = os.path.split(animation_path)
+    return os.path.join(directory, "compiled", os.path.splitext(name)[0] + ".sheet")
+
+
+def source_hash(animation_path):
+    """SHA-1 of a Lottie file, used to detect stale sheets"""
+    with open(animation_path, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _crop_rect(rows, columns):
+    """
+    Bounding box of the rows and columns that hold visible pixels
+
+    Returns:
+        tuple: (x, y, width, height); one pixel at the origin if nothing is visible
+    """
+    import numpy as np
+
+    ys, xs = np.flatnonzero(rows), np.flatnonzero(columns)
+    if not len(ys):
+        return 0, 0, 1, 1
+    return int(xs[0]), int(ys[0]), int(xs[-1] - xs[0] + 1), int(ys[-1] - ys[0] + 1)
+
+
+def compile_sprite_sheet(animation_path, sheet_path=None, sizes=SPRITE_SHEET_SIZES, dprs=SPRITE_SHEET_DPRS):
+    """
+    Rasterise a Lottie file into a sprite sheet (build step)
+
+    Args:
+        animation_path: Path to the Lottie JSON file
+        sheet_path: Output file (defaults to sprite_sheet_path())
+        sizes: Logical (width, height) sizes to render
+        dprs: Device pixel ratios to render every size at
+
+    Returns:
+        tuple: (sheet path, bytes written)
+    """
+    import json
+    import numpy as np
+    from utils.lottie_renderer import LottieRenderer
+
+    if sheet_path is None:
+        sheet_path = sprite_sheet_path(animation_path)
+    with open(animation_path, "r", encoding="utf-8") as f:
+        renderer = LottieRenderer(json.load(f))
+    frames = range(renderer.in_point, renderer.in_point + renderer.frame_count)
+
+    # Render every size/DPR, keeping one slot per distinct image, then crop
+    # the slots to the area any frame of the entry draws to
+    entries = []
+    for width, height in sizes:
+        for dpr in dprs:
+            slots, slot_map, seen = [], array("I"), {}
+            rows = columns = None
+            for frame in frames:
+                image = renderer.render_image(frame, width, height, dpr)
+                pixels = image.constBits().asstring(image.sizeInBytes())
+                slot = seen.get(pixels)
+                if slot is None:
+                    slot = seen[pixels] = len(slots)
+                    argb = np.frombuffer(pixels, dtype=np.uint32).reshape(image.height(), image.width())
+                    slots.append(argb)
+                    visible = (argb >> 24) != 0
+                    if rows is None:
+                        rows, columns = visible.any(axis=1), visible.any(axis=0)
+                    else:
+                        rows |= visible.any(axis=1)
+                        columns |= visible.any(axis=0)
+                slot_map.append(slot)
+            crop = x, y, crop_width, crop_height = _crop_rect(rows, columns)
+            slots = [argb[y:y + crop_height, x:x + crop_width].tobytes() for argb in slots]
+            entries.append((width, height, dpr, slots, slot_map, crop))
+
+    offset = _HEADER.size + _ENTRY.size * len(entries)
+    table = []
+    for width, height, dpr, slots, slot_map, _ in entries:
+        map_offset = offset
+        data_offset = _aligned(map_offset + slot_map.itemsize * len(slot_map))
+        offset = data_offset + sum(len(slot) for slot in slots)
+        table.append((map_offset, data_offset))
+
+    os.makedirs(os.path.dirname(os.path.abspath(sheet_path)), exist_ok=True)
+    temp_path = sheet_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(entries), renderer.frame_rate, renderer.in_point,
+                             renderer.frame_count, int(renderer.width), int(renderer.height),
+                             source_hash(animation_path)))
+        for (width, height, dpr, slots, _, crop), (map_offset, data_offset) in zip(entries, table):
+            f.write(_ENTRY.pack(width, height, dpr, len(slots), map_offset, data_offset, *crop))
+        for (_, _, _, slots, slot_map, _), (map_offset, data_offset) in zip(entries, table):
+            f.seek(map_offset)
+            f.write(slot_map.tobytes())
+            f.seek(data_offset)
+            for slot in slots:
+                f.write(slot)
+    os.replace(temp_path, sheet_path)
+    return sheet_path, offset
+
+
+class SpriteSheet:
+    """
+    Memory-mapped sprite sheet with the interface of LottieRenderer
+
+    Can be used wherever LottiePlayer and FramePrerenderer expect a
+    renderer. Sizes that are not in the sheet are scaled from the closest
+    one. render_image() returns whole frames; sprite() returns the stored
+    crop without copying it. The mapping stays open for the lifetime of the
+    sheet because the QImages from sprite() point into it.
+    """
+
+    def __init__(self, sheet_path):
+        """
+        Args:
+            sheet_path: Path to a compiled .sheet file
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If the file is not a sprite sheet of this version,
+                or is truncated or damaged
+        """
+        with open(sheet_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"Not a sprite sheet: {sheet_path}")
+        (magic, version, entry_count, self.frame_rate, self.in_point, self.frame_count,
+         self.width, self.height, self.source_hash) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a sprite sheet (version {VERSION}): {sheet_path}")
+        if not entry_count or not self.frame_count:
+            raise ValueError(f"Sprite sheet without frames: {sheet_path}")
+        self.out_point = self.in_point + self.frame_count
+        self.path = sheet_path
+
+        # (width, height, dpr) -> (pixel width, pixel height, slot map, data offset, crop)
+        # Every offset is checked against the file, so a truncated or damaged
+        # sheet is rejected here instead of handing out images past its end
+        self._entries = {}
+        size = len(self._map)
+        if _HEADER.size + entry_count * _ENTRY.size > size:
+            raise ValueError(f"Sprite sheet is truncated: {sheet_path}")
+        for index in range(entry_count):
+            width, height, dpr, slot_count, map_offset, data_offset, *crop = _ENTRY.unpack_from(
+                self._map, _HEADER.size + index * _ENTRY.size)
+            dpr = round(dpr, 2)
+            pixel_width, pixel_height = max(int(width * dpr), 1), max(int(height * dpr), 1)
+            x, y, crop_width, crop_height = crop
+            if not crop_width or not crop_height or x + crop_width > pixel_width or y + crop_height > pixel_height:
+                raise ValueError(f"Sprite sheet has an invalid crop rectangle: {sheet_path}")
+            map_end = map_offset + 4 * self.frame_count
+            data_end = data_offset + slot_count * crop_width * 4 * crop_height
+            if map_offset % 4 or map_end > size or data_end > size:
+                raise ValueError(f"Sprite sheet is truncated: {sheet_path}")
+            slot_map = self._view[map_offset:map_end].cast("I")
+            if max(slot_map) >= slot_count:
+                raise ValueError(f"Sprite sheet refers to missing frames: {sheet_path}")
+            self._entries[(width, height, dpr)] = (pixel_width, pixel_height, slot_map, data_offset, tuple(crop))
+
+    def sizes(self):
+        """
+        Returns:
+            list: (width, height, dpr) entries in the sheet
+        """
+        return list(self._entries)
+
+    def has_size(self, width, height, device_pixel_ratio=1.0):
+        """True if frames of this size are stored as is (render_image does not scale)"""
+        return (int(width), int(height), round(float(device_pixel_ratio), 2)) in self._entries
+
+    def _crop(self, entry, frame):
+        """QImage over the mapped crop of one frame (no copy)"""
+        _, _, slot_map, data_offset, (_, _, crop_width, crop_height) = entry
+        stride = crop_width * 4
+        start = data_offset + slot_map[frame - self.in_point] * stride * crop_height
+        return QImage(self._view[start:start + stride * crop_height], crop_width, crop_height,
+                      stride, QImage.Format.Format_ARGB32_Premultiplied)
+
+    def _image(self, entry, frame):
+        """Whole frame with the crop copied into a transparent canvas"""
+        pixel_width, pixel_height, _, _, (x, y, _, _) = entry
+        image = QImage(pixel_width, pixel_height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.drawImage(QPoint(x, y), self._crop(entry, frame))
+        painter.end()
+        return image
+
+    def _frame(self, frame):
+        """Frame number wrapped into the animation"""
+        return self.in_point + (frame - self.in_point) % self.frame_count
+
+    def sprite(self, frame, width, height, device_pixel_ratio=1.0):
+        """
+        Get the stored part of one frame without copying it (for painting)
+
+        Args:
+            frame: Frame number
+            width: Logical width in pixels
+            height: Logical height in pixels
+            device_pixel_ratio: Scale for high-DPI screens
+
+        Returns:
+            tuple: (read-only QImage over the sheet, QPointF of its top left
+                corner in the frame in logical pixels), or None if the size
+                is not in the sheet
+        """
+        dpr = round(float(device_pixel_ratio), 2)
+        entry = self._entries.get((int(width), int(height), dpr))
+        if entry is None:
+            return None
+        image = self._crop(entry, self._frame(frame))
+        image.setDevicePixelRatio(dpr)
+        x, y, _, _ = entry[4]
+        return image, QPointF(x / dpr, y / dpr)
+
+    def render_image(self, frame, width, height, device_pixel_ratio=1.0):
+        """
+        Get one frame (safe off the GUI thread)
+
+        Args:
+            frame: Frame number
+            width: Logical width in pixels
+            height: Logical height in pixels
+            device_pixel_ratio: Scale for high-DPI screens
+
+        Returns:
+            QImage: The whole frame (a copy; scaled for sizes the sheet
+                does not contain)
+        """
+        frame = self._frame(frame)
+        dpr = round(float(device_pixel_ratio), 2)
+        entry = self._entries.get((int(width), int(height), dpr))
+        if entry is not None:
+            image = self._image(entry, frame)
+        else:
+            # Scale from the sheet entry with the closest pixel width
+            pixel_width = max(int(width * dpr), 1)
+            pixel_height = max(int(height * dpr), 1)
+            closest = min(self._entries.values(), key=lambda e: abs(e[0] - pixel_width))
+            image = self._image(closest, frame).scaled(
+                pixel_width, pixel_height,
+                Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        image.setDevicePixelRatio(dpr)
+        return image
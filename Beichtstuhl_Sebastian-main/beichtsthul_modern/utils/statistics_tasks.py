@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Statistics Tasks for Beichtsthul Modern
+Runs expensive statistics reports on a QThreadPool. Partial results are
+streamed to the UI thread through signals, throttled so the UI only ever
+handles a few small updates per second, and tasks can be cancelled
+between two pages (e.g. when the statistics dialog closes).
+"""
+
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class StatisticsTaskSignals(QObject):
+    """Signals of a StatisticsTask; delivered queued to the UI thread"""
+
+    # Latest partial BerichtStand
+    partial_result = pyqtSignal(object)
+    # Final BerichtStand
+    finished = pyqtSignal(object)
+    # Error message
+    failed = pyqtSignal(str)
+    # Emitted instead of finished after cancel()
+    cancelled = pyqtSignal()
+
+
+class StatisticsTask(QRunnable):
+    """Consumes a report generator off the UI thread"""
+
+    def __init__(self, report, interval_ms=100):
+        """
+        Args:
+            report: Callable returning a report generator (see core.statistik_berichte)
+            interval_ms: Minimum time between two partial_result signals
+        """
+        super().__init__()
+        self.report = report
+        self.interval_ms = interval_ms
+        self.signals = StatisticsTaskSignals()
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+
+    def cancel(self):
+        """Request cancellation; the task stops before reading the next page"""
+        self._cancelled.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def is_done(self):
+        return self._done.is_set()
+
+    def run(self):
+        """Worker thread: advance the generator page by page"""
+        last = None
+        next_emit = 0.0
+        try:
+            if self._cancelled.is_set():
+                self.signals.cancelled.emit()
+                return
+            generator = self.report()
+            for state in generator:
+                if self._cancelled.is_set():
+                    generator.close()
+                    self.signals.cancelled.emit()
+                    return
+                last = state
+                now = time.monotonic()
+                if now >= next_emit:
+                    self.signals.partial_result.emit(state)
+                    next_emit = now + self.interval_ms / 1000.0
+            self.signals.finished.emit(last)
+        except Exception as e:
+            self.signals.failed.emit(f"Fehler bei der Statistik-Berechnung: {e}")
+        finally:
+            self._done.set()
+
+
+class StatisticsTaskRunner(QObject):
+    """Starts StatisticsTasks on a dedicated QThreadPool and cancels them together"""
+
+    def __init__(self, max_threads=2, parent=None):
+        """
+        Args:
+            max_threads: Maximum number of reports computed at the same time
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks = []
+
+    def start(self, task):
+        """
+        Start a task in the background
+
+        Connect to task.signals before calling this, otherwise early
+        signals from the worker thread are lost.
+
+        Returns:
+            StatisticsTask: The started task
+        """
+        self._tasks = [running for running in self._tasks if not running.is_done]
+        # The runner keeps the Python wrapper alive until the task is done
+        task.setAutoDelete(False)
+        self._tasks.append(task)
+        self.pool.start(task)
+        return task
+
+    def cancel_all(self):
+        """Cancel every running or queued task"""
+        for task in self._tasks:
+            task.cancel()
+
+    def wait(self, timeout_ms=-1):
+        """Block until all tasks have stopped (for shutdown and tests)"""
+        return self.pool.waitForDone(timeout_ms)
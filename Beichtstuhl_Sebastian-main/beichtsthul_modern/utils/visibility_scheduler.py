@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Visibility Scheduler for Beichtsthul Modern
+Suspends the timers of animated widgets while nobody can see them: the
+widget is hidden, its window is minimised, or the window is not exposed
+(fully covered or on another virtual desktop, as far as the platform
+reports it through QWindow exposure). Widgets are resumed on expose.
+"""
+
+from PyQt6.QtCore import QObject, QEvent, Qt
+
+
+class VisibilityScheduler(QObject):
+    """Calls suspend/resume callbacks when registered widgets become (in)visible"""
+
+    _instance = None
+
+    # Events after which visibility is checked again
+    _WIDGET_EVENTS = (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # widget -> [suspend, resume, suspended]
+        self._clients = {}
+        # Top-level widgets and their QWindows already filtered
+        self._watched = set()
+
+    @classmethod
+    def instance(cls):
+        """Shared scheduler, created on first use"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register(self, widget, suspend, resume):
+        """
+        Have a widget's animations follow its visibility
+
+        The widget is suspended right away if it is not visible yet, so
+        animations started in a constructor only run once it is shown.
+
+        Args:
+            widget: Animated widget
+            suspend: Called when the widget can no longer be seen
+            resume: Called when it can be seen again
+        """
+        self._clients[widget] = [suspend, resume, False]
+        widget.installEventFilter(self)
+        widget.destroyed.connect(lambda _=None, w=widget: self._clients.pop(w, None))
+        self._update(widget)
+
+    def is_suspended(self, widget):
+        """True while a registered widget is suspended"""
+        client = self._clients.get(widget)
+        return client is not None and client[2]
+
+    @staticmethod
+    def is_visible(widget):
+        """
+        Check whether a widget can currently be seen
+
+        Returns:
+            bool: Shown, window not minimised and exposed
+        """
+        if not widget.isVisible():
+            return False
+        window = widget.window()
+        if window.windowState() & Qt.WindowState.WindowMinimized:
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def _update(self, widget):
+        client = self._clients.get(widget)
+        if client is None:
+            return
+        self._watch(widget.window())
+        visible = self.is_visible(widget)
+        if visible and client[2]:
+            client[2] = False
+            client[1]()
+        elif not visible and not client[2]:
+            client[2] = True
+            client[0]()
+
+    def _watch(self, window):
+        """Filter a top-level widget and, once it exists, its QWindow"""
+        if window not in self._watched:
+            self._watched.add(window)
+            window.installEventFilter(self)
+            window.destroyed.connect(lambda _=None, w=window: self._watched.discard(w))
+        handle = window.windowHandle()
+        if handle is not None and handle not in self._watched:
+            self._watched.add(handle)
+            handle.installEventFilter(self)
+            handle.destroyed.connect(lambda _=None, h=handle: self._watched.discard(h))
+
+    def _update_all(self):
+        for widget in list(self._clients):
+            self._update(widget)
+
+    def eventFilter(self, obj, event):
+        if event.type() in self._WIDGET_EVENTS:
+            if obj in self._clients and event.type() != QEvent.Type.WindowStateChange:
+                self._update(obj)
+            else:
+                self._update_all()
+        elif event.type() == QEvent.Type.Expose:
+            self._update_all()
+        return False
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Build step that pre-renders the Lottie animations in
+beichtsthul_modern/assets/animations into sprite sheets
+(assets/animations/compiled/*.sheet). With the sheets in place the app
+maps the frames from disk and does not import the lottie package.
+Sizes and DPRs come from SPRITE_SHEET_SIZES / SPRITE_SHEET_DPRS in
+core/constants.py. Run again whenever an animation changes; stale sheets
+are ignored at runtime.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PACKAGE = os.path.join(ROOT, "beichtsthul_modern")
+ANIMATIONS = os.path.join(PACKAGE, "assets", "animations")
+
+def main():
+    sys.path.insert(0, PACKAGE)
+    from PyQt6.QtGui import QGuiApplication
+    from utils.sprite_sheet import compile_sprite_sheet
+
+    # QPainter text and path rendering needs a GUI application, but no screen
+    _app = QGuiApplication.instance() or QGuiApplication([sys.argv[0], "-platform", "offscreen"])
+    names = sorted(name for name in os.listdir(ANIMATIONS) if name.endswith(".json"))
+    if not names:
+        print(f"No animations found in {ANIMATIONS}")
+        sys.exit(1)
+    for name in names:
+        sheet_path, size = compile_sprite_sheet(os.path.join(ANIMATIONS, name))
+        print(f"{name} -> {os.path.relpath(sheet_path, ROOT)} ({size / 1024 / 1024:.1f} MB)")
+
+if __name__ == "__main__":
+    main()